@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+import time
+from datetime import date, timedelta
+import numpy as np
+import pandas as pd
+from src.utils.lead_archive import LeadArchive
+from src.utils.logger import setup_logger
+
+logger = setup_logger("bench_archive")
+
+NUM_ROWS = 1_000_000
+NUM_DAYS = 365
+REPEATS = 3
+
+
+def synthetic_leads(num_rows: int, num_days: int) -> pd.DataFrame:
+    """Leads shaped like the scraper's output, spread over num_days of timestamps"""
+    rng = np.random.default_rng(42)
+    ids = np.arange(num_rows)
+    start = pd.Timestamp.now().normalize() - pd.Timedelta(days=num_days - 1)
+    return pd.DataFrame({
+        'name': [f"Company {i}" for i in ids],
+        'email': [f"info@company{i}.com" for i in ids],
+        'platform': 'google',
+        'category': rng.choice(['business', 'developer', 'agency'], num_rows),
+        'website': [f"https://company{i}.com" for i in ids],
+        'description': "Company builds things for other companies. Contact us for more.",
+        'location': None,
+        'timestamp': start + pd.to_timedelta(rng.integers(0, num_days * 86400, num_rows), unit='s')
+    })
+
+
+def timed(read, repeats: int = REPEATS) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.time()
+        read()
+        best = min(best, time.time() - start)
+    return best
+
+
+def run_benchmark():
+    workdir = tempfile.mkdtemp(prefix='bench_archive_')
+    csv_path = os.path.join(workdir, 'google_leads.csv')
+    archive = LeadArchive(os.path.join(workdir, 'archive'))
+
+    try:
+        df = synthetic_leads(NUM_ROWS, NUM_DAYS)
+        df.assign(timestamp=df['timestamp'].map(pd.Timestamp.isoformat)).to_csv(csv_path, index=False)
+
+        start = time.time()
+        archive.convert_csv(csv_path)
+        logger.info(
+            f"Converted {NUM_ROWS} rows in {time.time() - start:.1f}s: "
+            f"CSV {os.path.getsize(csv_path) / 1e6:.0f} MB, "
+            f"archive {sum(os.path.getsize(os.path.join(d, f)) for d, _, fs in os.walk(archive.root) for f in fs) / 1e6:.0f} MB"
+        )
+
+        last_week = date.today() - timedelta(days=6)
+        cases = [
+            ("full CSV, all columns", lambda: pd.read_csv(csv_path)),
+            ("archive, all columns", lambda: archive.read(latest_only=False)),
+            ("CSV, 2 columns", lambda: pd.read_csv(csv_path, usecols=['platform', 'timestamp'])),
+            ("archive, 2 columns", lambda: archive.read(columns=['platform', 'timestamp'], latest_only=False)),
+            ("CSV, last 7 days", lambda: (lambda d: d[pd.to_datetime(d['timestamp']).dt.date >= last_week])(
+                pd.read_csv(csv_path))),
+            ("archive, last 7 days", lambda: archive.read(start=last_week, latest_only=False)),
+        ]
+        for name, read in cases:
+            logger.info(f"{name}: {timed(read) * 1000:.0f} ms")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,141 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+import requests
+from src.models.lead import Lead
+from src.utils.logger import setup_logger
+
+logger = setup_logger("bench_dashboard")
+
+NUM_LEADS = 20000
+USERS = 20  # Concurrent dashboard users, each refreshing as fast as it is served
+DURATION = 10  # Seconds per scenario
+PORT = 8765
+DASHBOARD_PATHS = ('/', '/api/leads?limit=100', '/status', '/progress')
+
+# Stand-in for the scraper's own work: parsing company pages holds the GIL
+FIXTURE_PAGE = '<html><body>' + '<div><p>We build software. <a href="/contact">Contact</a></p></div>' * 500 + '</body></html>'
+
+
+def seed_store(directory: str) -> str:
+    from src.utils.lead_store import LeadStore
+    url = f"sqlite:///{os.path.join(directory, 'leads.db')}"
+    store = LeadStore(url=url)
+    start = datetime.now() - timedelta(days=30)
+    store.upsert(
+        Lead(name=f"Company {i}", email=f"info@company{i}.example.com", platform='google',
+             category='business', website=f"https://company{i}.example.com",
+             description="Builds things", timestamp=start + timedelta(minutes=i))
+        for i in range(NUM_LEADS)
+    )
+    store.close()
+    return url
+
+
+def busy_scraper():
+    """Parse pages forever on a thread, as the in-process scraper would"""
+    from src.utils.http_fetcher import parse_html
+    while True:
+        parse_html(FIXTURE_PAGE)
+
+
+def serve(workers: int, busy: bool):
+    if busy:
+        threading.Thread(target=busy_scraper, daemon=True).start()
+    from src.main import run_web
+    run_web(workers)
+
+
+def start_dashboard(directory: str, url: str, workers: int, busy: bool) -> subprocess.Popen:
+    env = dict(
+        os.environ, DATABASE_URL=url, WEB_HOST='127.0.0.1', WEB_PORT=str(PORT),
+        LEADS_CSV_FILE=os.path.join(directory, 'google_leads.csv'),
+        PROGRESS_FILE=os.path.join(directory, 'scraping_progress.json'),
+        ACTIVITY_COUNTERS_FILE=os.path.join(directory, 'activity_counters.npz')
+    )
+    command = [sys.executable, '-m', 'src.bench_dashboard', '--serve', '--workers', str(workers)]
+    if busy:
+        command.append('--busy')
+    server = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    # Ready once every path answers, which also loads each worker's lead index
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            if all(requests.get(f"http://127.0.0.1:{PORT}{path}", timeout=30).ok for path in DASHBOARD_PATHS):
+                return server
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    server.kill()
+    raise RuntimeError("Dashboard did not start")
+
+
+def run_users() -> list:
+    latencies = []
+    lock = threading.Lock()
+    stop = time.time() + DURATION
+
+    def user():
+        session = requests.Session()
+        session.trust_env = False  # Keep local traffic off any configured proxy
+        mine = []
+        while time.time() < stop:
+            for path in DASHBOARD_PATHS:
+                start = time.perf_counter()
+                session.get(f"http://127.0.0.1:{PORT}{path}", timeout=60).raise_for_status()
+                mine.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=user) for _ in range(USERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sorted(latencies)
+
+
+def run_benchmark():
+    scenarios = [
+        ('scraper in process, 1 worker', 1, True),
+        ('web only, 1 worker', 1, False),
+    ]
+    # Extra workers only pay off with a core each
+    if (os.cpu_count() or 1) > 1:
+        scenarios.append((f'web only, {os.cpu_count()} workers', os.cpu_count(), False))
+    with tempfile.TemporaryDirectory() as directory:
+        url = seed_store(directory)
+        for name, workers, busy in scenarios:
+            server = start_dashboard(directory, url, workers, busy)
+            try:
+                latencies = run_users()
+            finally:
+                server.terminate()
+                server.wait()
+
+            def percentile(p):
+                return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+            logger.info(
+                f"{name}: {len(latencies) / DURATION:.0f} requests/s, "
+                f"p50 {percentile(0.5):.0f} ms, p95 {percentile(0.95):.0f} ms, p99 {percentile(0.99):.0f} ms "
+                f"({USERS} users, {NUM_LEADS} leads)"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the dashboard with concurrent users")
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--workers', type=int, default=1, help=argparse.SUPPRESS)
+    parser.add_argument('--busy', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        serve(args.workers, args.busy)
+    else:
+        run_benchmark()
@@ -0,0 +1,97 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.utils.async_enricher import AsyncEnricher
+from src.utils.http_fetcher import HttpFetcher, parse_html, extract_email, find_page_links
+from src.utils.logger import setup_logger
+
+logger = setup_logger("bench_enrichment")
+
+PAGE_DELAY = 0.2  # Simulated server latency per page, in seconds
+NUM_COMPANIES = 10
+FILLER = '<p>' + 'We build software for businesses around the world. ' * 10 + '</p>'
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves a homepage linking to contact/about pages; only the last site has an email"""
+
+    def do_GET(self):
+        time.sleep(PAGE_DELAY)
+        has_email = self.server.server_port == self.server.email_port
+
+        if self.path.startswith('/contact') and has_email:
+            body = FILLER + '<a href="mailto:hello@example.com">Email us</a>'
+        elif self.path.startswith('/contact') or self.path.startswith('/about'):
+            body = FILLER
+        else:
+            body = FILLER + '<a href="/about">About</a><a href="/contact">Contact</a>'
+
+        payload = f'<html><body>{body}</body></html>'.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fixture_sites(count: int = 3):
+    """Start one local server per fake company site"""
+    servers = [ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler) for _ in range(count)]
+    email_port = servers[-1].server_port
+    for server in servers:
+        server.email_port = email_port
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    return servers
+
+
+def sequential_find_email(fetcher: HttpFetcher, urls):
+    """Mirror of the sequential HTTP path: each site, then its sub-pages, one at a time"""
+    for url in urls:
+        page = fetcher.fetch(url)
+        if not page:
+            continue
+        soup = parse_html(page.html)
+        email = extract_email(soup)
+        if email:
+            return email
+        for link in find_page_links(soup, page.final_url)[:2]:
+            sub_page = fetcher.fetch(link)
+            if sub_page:
+                email = extract_email(parse_html(sub_page.html))
+                if email:
+                    return email
+    return None
+
+
+def run_benchmark():
+    servers = start_fixture_sites()
+    urls = [f'http://127.0.0.1:{server.server_port}/' for server in servers]
+    fetcher = HttpFetcher()
+    fetcher.session.trust_env = False  # Keep local traffic off any configured proxy
+    enricher = AsyncEnricher(fetcher=fetcher)
+
+    try:
+        start = time.time()
+        for _ in range(NUM_COMPANIES):
+            assert sequential_find_email(fetcher, urls) == 'hello@example.com'
+        sequential_elapsed = time.time() - start
+
+        start = time.time()
+        for _ in range(NUM_COMPANIES):
+            assert enricher.find_email(urls).email == 'hello@example.com'
+        async_elapsed = time.time() - start
+    finally:
+        enricher.close()
+        for server in servers:
+            server.shutdown()
+
+    logger.info(f"Sequential: {sequential_elapsed:.2f}s ({NUM_COMPANIES / sequential_elapsed * 3600:.0f} companies/hour)")
+    logger.info(f"Async:      {async_elapsed:.2f}s ({NUM_COMPANIES / async_elapsed * 3600:.0f} companies/hour)")
+    logger.info(f"Speedup:    {sequential_elapsed / async_elapsed:.1f}x")
+
+
+if __name__ == "__main__":
+    run_benchmark()
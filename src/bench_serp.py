@@ -0,0 +1,98 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from src.scrapers.google_company_scraper import read_serp_snapshot, BLOCK_INDICATORS
+from src.utils.logger import setup_logger
+
+logger = setup_logger("bench_serp")
+
+NUM_QUERIES = 20
+TOP_N = 3
+
+# Stand-in result page with the same structure the scraper reads from Google
+FIXTURE_SERP = '<html><body>' + ''.join(
+    f'<div class="g"><a href="https://company{i}.example.com/"><h3>Company {i}</h3></a>'
+    f'<div class="VwiC3b">Company {i} builds things. Contact us for more.</div></div>'
+    for i in range(10)
+) + '</body></html>'
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        payload = FIXTURE_SERP.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class RoundTripCounter:
+    """Counts WebDriver commands by wrapping driver.execute"""
+
+    def __init__(self, driver):
+        self.count = 0
+        original = driver.execute
+
+        def counting_execute(*args, **kwargs):
+            self.count += 1
+            return original(*args, **kwargs)
+
+        driver.execute = counting_execute
+
+
+def legacy_read(driver):
+    """The previous per-element extraction: page_source scan plus finds per result"""
+    page_source = driver.page_source.lower()
+    blocked = [text for text in BLOCK_INDICATORS if text in page_source]
+    results = []
+    for result in driver.find_elements(By.CSS_SELECTOR, "div.g")[:TOP_N]:
+        link = result.find_element(By.CSS_SELECTOR, "a").get_attribute('href')
+        snippet = result.find_element(By.CSS_SELECTOR, "div.VwiC3b").text
+        results.append({'link': link, 'snippet': snippet})
+    return blocked, results
+
+
+def batched_read(driver):
+    snapshot = read_serp_snapshot(driver, TOP_N)
+    return snapshot['blocked'], snapshot['results']
+
+
+def run_benchmark():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_port}/search'
+
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless=new')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    driver = webdriver.Chrome(options=options)
+    counter = RoundTripCounter(driver)
+
+    try:
+        driver.get(url)
+        assert legacy_read(driver)[1] == batched_read(driver)[1], "Extraction results differ"
+
+        for name, read in (('per-element', legacy_read), ('batched script', batched_read)):
+            counter.count = 0
+            start = time.time()
+            for _ in range(NUM_QUERIES):
+                read(driver)
+            elapsed = time.time() - start
+            logger.info(
+                f"{name}: {counter.count / NUM_QUERIES:.0f} round trips/query, "
+                f"{elapsed / NUM_QUERIES * 1000:.1f} ms/query"
+            )
+    finally:
+        driver.quit()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -10,9 +10,95 @@ class Config:
     
     # Database
     DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///data/leads.db')
+    LEAD_BATCH_SIZE = int(os.getenv('LEAD_BATCH_SIZE', 500))  # Rows per upsert statement
+    LEADS_CSV_FILE = os.getenv('LEADS_CSV_FILE', 'data/google_leads.csv')  # CSV export kept for compatibility
+    
+    # Dashboard
+    WEB_HOST = os.getenv('WEB_HOST', '0.0.0.0')
+    WEB_PORT = int(os.getenv('WEB_PORT', 8000))
+    WEB_WORKERS = int(os.getenv('WEB_WORKERS', 1))  # Above 1 the dashboard runs in its own worker processes
+    LEAD_INDEX_REFRESH = float(os.getenv('LEAD_INDEX_REFRESH', 2))  # Min seconds between lead index refreshes
+    DASHBOARD_PAGE_SIZE = int(os.getenv('DASHBOARD_PAGE_SIZE', 100))  # Leads rendered on the home page
+    LEAD_FSYNC_POLICY = os.getenv('LEAD_FSYNC_POLICY', 'checkpoint')  # commit, checkpoint or off
+    LEAD_WRITER_BATCH = int(os.getenv('LEAD_WRITER_BATCH', 50))  # Leads per group commit
+    LEAD_WRITER_INTERVAL = float(os.getenv('LEAD_WRITER_INTERVAL', 2))  # Max seconds a lead waits to be committed
+    LEAD_WRITER_ATTEMPTS = int(os.getenv('LEAD_WRITER_ATTEMPTS', 5))  # Commits of a batch before it is split up
+    LEAD_DEAD_LETTER_FILE = os.getenv('LEAD_DEAD_LETTER_FILE', 'data/failed_leads.jsonl')  # Leads no commit accepted
+    
+    # Progress
+    PROGRESS_FILE = os.getenv('PROGRESS_FILE', 'data/scraping_progress.json')
+    PROGRESS_FLUSH_INTERVAL = float(os.getenv('PROGRESS_FLUSH_INTERVAL', 5))  # Seconds between snapshots
+    
+    # Activity Counters
+    ACTIVITY_COUNTERS_FILE = os.getenv('ACTIVITY_COUNTERS_FILE', 'data/activity_counters.npz')  # Per-minute/hour event counts
+    ACTIVITY_FLUSH_INTERVAL = float(os.getenv('ACTIVITY_FLUSH_INTERVAL', 5))  # Seconds between snapshots
+    
+    # Run Journal
+    RUN_DIR = os.getenv('RUN_DIR', 'data/run')  # Manifest and journal of the current scrape run
+    JOURNAL_FSYNC = os.getenv('JOURNAL_FSYNC', 'false').lower() == 'true'  # fsync each record, survives power loss
+    
+    # Company Sources
+    COMPANY_QUEUE_SIZE = int(os.getenv('COMPANY_QUEUE_SIZE', 1000))  # Names collected ahead of the scraper
+    
+    # Parquet Archive
+    ARCHIVE_DIR = os.getenv('ARCHIVE_DIR', 'data/archive')  # Date-partitioned Parquet copy of the leads
+    USE_LEAD_ARCHIVE = os.getenv('USE_LEAD_ARCHIVE', 'true').lower() == 'true'  # Compact leads into it every cycle
+    
+    # Dedup Index
+    DEDUP_INDEX_FILE = os.getenv('DEDUP_INDEX_FILE', 'data/dedup_index.bloom')
+    DEDUP_USE_BLOOM = os.getenv('DEDUP_USE_BLOOM', 'false').lower() == 'true'  # Bloom filter instead of exact sets
+    DEDUP_BLOOM_CAPACITY = int(os.getenv('DEDUP_BLOOM_CAPACITY', 5_000_000))  # Keys the filter is sized for
+    DEDUP_BLOOM_ERROR_RATE = float(os.getenv('DEDUP_BLOOM_ERROR_RATE', 0.001))
     
     # Scraping Settings
     SCRAPE_INTERVAL = int(os.getenv('SCRAPE_INTERVAL', 14400))  # 4 hours in seconds
+    CYCLE_INTERVAL = int(os.getenv('CYCLE_INTERVAL', 300))  # Pause between scrape cycles, in seconds
+    CHUNK_DELAY = int(os.getenv('CHUNK_DELAY', 0))  # Extra pause between chunks; pacing comes from the rate limiter
+    
+    # Rate Limiting
+    GOOGLE_RATE_PER_MIN = float(os.getenv('GOOGLE_RATE_PER_MIN', 6))  # Requests per minute to Google
+    SITE_RATE_PER_MIN = float(os.getenv('SITE_RATE_PER_MIN', 30))  # Requests per minute to each company site
+    RATE_LIMIT_BURST = float(os.getenv('RATE_LIMIT_BURST', 2))
+    BLOCK_BACKOFF = int(os.getenv('BLOCK_BACKOFF', 30))  # First pause after a block, doubled per further block
+    MAX_BLOCK_BACKOFF = int(os.getenv('MAX_BLOCK_BACKOFF', 600))
+    ERROR_BACKOFF = int(os.getenv('ERROR_BACKOFF', 5))  # Pause after a failed request that was not a block
+    PAGE_READY_TIMEOUT = int(os.getenv('PAGE_READY_TIMEOUT', 10))  # Max wait for a page to finish loading
+    
+    # Site Fetching
+    USE_HTTP_FETCH = os.getenv('USE_HTTP_FETCH', 'true').lower() == 'true'  # Try plain HTTP before Selenium
+    HTTP_FETCH_TIMEOUT = int(os.getenv('HTTP_FETCH_TIMEOUT', 10))
+    
+    # Response Cache
+    USE_RESPONSE_CACHE = os.getenv('USE_RESPONSE_CACHE', 'true').lower() == 'true'
+    RESPONSE_CACHE_DIR = os.getenv('RESPONSE_CACHE_DIR', 'data/cache')
+    RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', 86400))  # Company pages, in seconds
+    SERP_CACHE_TTL = int(os.getenv('SERP_CACHE_TTL', 21600))  # Google result pages, in seconds
+    RESPONSE_CACHE_MAX_MB = int(os.getenv('RESPONSE_CACHE_MAX_MB', 256))
+    
+    # Incremental Scheduling
+    SCRAPE_HISTORY_FILE = os.getenv('SCRAPE_HISTORY_FILE', 'data/scrape_history.json')
+    FRESH_LEAD_TTL = int(os.getenv('FRESH_LEAD_TTL', 7 * 86400))  # Skip leads younger than this, in seconds
+    MISS_BACKOFF = int(os.getenv('MISS_BACKOFF', 86400))  # Wait after a miss, doubled per further miss
+    MAX_MISS_BACKOFF = int(os.getenv('MAX_MISS_BACKOFF', 30 * 86400))
+    
+    # Driver Pool
+    DRIVER_POOL_SIZE = int(os.getenv('DRIVER_POOL_SIZE', 3))  # Max Chrome instances kept alive
+    DRIVER_MAX_USES = int(os.getenv('DRIVER_MAX_USES', 20))  # Checkouts before a driver is recycled
+    DRIVER_MAX_AGE = int(os.getenv('DRIVER_MAX_AGE', 3600))  # Seconds before a driver is recycled
+    HOT_SPARE_DRIVER = os.getenv('HOT_SPARE_DRIVER', 'true').lower() == 'true'  # Pre-warm a browser on the next proxy
+    
+    # Enrichment: 'sequential' visits result sites one by one, 'async' crawls them concurrently
+    ENRICHMENT_MODE = os.getenv('ENRICHMENT_MODE', 'sequential')
+    ENRICHMENT_TOP_N = int(os.getenv('ENRICHMENT_TOP_N', 3))  # Search results to visit per company
+    ENRICHMENT_MAX_IN_FLIGHT = int(os.getenv('ENRICHMENT_MAX_IN_FLIGHT', 10))
+    ENRICHMENT_MAX_PER_HOST = int(os.getenv('ENRICHMENT_MAX_PER_HOST', 2))
+    ENRICHMENT_TIMEOUT = int(os.getenv('ENRICHMENT_TIMEOUT', 30))  # Seconds per company
+    
+    # Metrics
+    METRICS_DIR = os.getenv('METRICS_DIR', 'data/metrics')  # Per-process snapshots merged by /metrics
+    METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', 5))  # Seconds between snapshots
+    METRICS_STALE_AFTER = float(os.getenv('METRICS_STALE_AFTER', 60))  # Gauges of quieter processes are dropped
+    METRICS_RETENTION = int(os.getenv('METRICS_RETENTION', 86400))  # Snapshots of exited processes kept this long
     
     # Logging
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
@@ -0,0 +1,142 @@
+"""Fakes and fixtures shared by the src/test_*.py modules"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.models.lead import Lead
+
+PROXY_A = {'http': 'http://10.0.0.1:8080', 'https': 'http://10.0.0.1:8080'}
+PROXY_B = {'http': 'http://10.0.0.2:8080', 'https': 'http://10.0.0.2:8080'}
+
+
+def make_lead(name='Acme', email='info@acme.example.com', website=None, **fields):
+    return Lead(name=name, email=email, platform='google', category='business', website=website, **fields)
+
+
+class Nothing:
+    """Accepts any call, for collaborators a test does not look at"""
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+class FakeDriver:
+    """Chrome stand-in: answers the pool's health check and records quit()"""
+
+    def __init__(self, proxy=None):
+        self.proxy = proxy
+        self.quit_called = False
+        self.alive = True
+
+    def execute_script(self, script):
+        return 1 if self.alive else None
+
+    def quit(self):
+        self.quit_called = True
+
+
+class FakeDriverPool:
+    """Hands out fresh fake drivers and records the proxy of each checkout"""
+
+    accept_spares = True
+
+    def __init__(self):
+        self.checked_out = []
+
+    def checkout(self, proxy=None):
+        self.checked_out.append(proxy)
+        return FakeDriver(proxy)
+
+    def checkin(self, driver, healthy=True):
+        pass
+
+    def adopt(self, driver, proxy=None):
+        return self.accept_spares
+
+
+class FakeProxyManager:
+    """Returns the given proxies in order"""
+
+    def __init__(self, *proxies):
+        self.proxies = list(proxies)
+
+    def get_next_proxy(self):
+        return self.proxies.pop(0)
+
+
+class FakeLeadWriter:
+    """Keeps submitted leads in memory"""
+
+    lead_store = None
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, lead):
+        self.submitted.append(lead)
+
+    def submit_many(self, leads):
+        self.submitted.extend(leads)
+
+    def flush(self, timeout=None):
+        return True
+
+
+def make_scraper(proxy_manager=None, **collaborators):
+    """GoogleCompanyScraper on fakes, so no browser, store or shared file is touched"""
+    from src.scrapers.google_company_scraper import GoogleCompanyScraper
+    options = dict(driver_pool=FakeDriverPool(), lead_writer=FakeLeadWriter(),
+                   dedup_index=Nothing(), progress=Nothing(), counters=Nothing())
+    options.update(collaborators)
+    return GoogleCompanyScraper(proxy_manager=proxy_manager, **options)
+
+
+class FixtureServer:
+    """Local HTTP server answering from a table of path to (status, body, headers)
+
+    delay holds seconds to sleep before answering a path, so a test can stand in
+    for a slow site. Each request's path and headers are kept in requests.
+    """
+
+    def __init__(self, pages=None, delay=None):
+        self.pages = dict(pages or {})
+        self.delay = dict(delay or {})
+        self.requests = []
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                fixture.requests.append((self.path, dict(self.headers)))
+                time.sleep(fixture.delay.get(self.path, 0))
+                status, body, headers = fixture.pages.get(self.path, (404, '', {}))
+                if callable(body):
+                    status, body, headers = body(self.headers)
+                payload = body.encode()
+                try:
+                    self.send_response(status)
+                    self.send_header('Content-Type', headers.get('Content-Type', 'text/html; charset=utf-8'))
+                    self.send_header('Content-Length', str(len(payload)))
+                    for name, value in headers.items():
+                        if name != 'Content-Type':
+                            self.send_header(name, value)
+                    self.end_headers()
+                    self.wfile.write(payload)
+                except OSError:
+                    pass  # The client gave up waiting
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.base_url = f'http://127.0.0.1:{self.server.server_address[1]}'
+
+    def url(self, path):
+        return self.base_url + path
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
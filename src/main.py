@@ -1,3 +1,4 @@
+import argparse
 import threading
 import time
 from src.utils.logger import setup_logger
@@ -6,95 +7,217 @@ from src.web.app import app
 import uvicorn
 from src.utils.proxy_manager import ProxyManager
 import pandas as pd
-from typing import List
-import random
-from src.utils.company_collector import CompanyCollector
+from itertools import chain, islice
+from typing import Iterable, Iterator, List
+from src.utils.company_sources import CompanyStream, FALLBACK_COMPANIES, default_sources
+from src.utils.driver_pool import DriverPool, HotSpareDriver
+from src.utils.process_scraper import process_scrape
+from src.utils.scrape_history import ScrapeHistory, FreshnessScheduler
+from src.utils.lead_writer import get_lead_writer
+from src.utils.dedup_index import get_dedup_index
+from src.utils.lead_archive import LeadArchive, archive_available
+from src.utils.metrics import export_metrics
+from src.utils.progress_tracker import get_progress_tracker
+from src.utils.run_journal import RunJournal, ScrapeRun
+from src.utils.scrape_history import OUTCOME_LEAD
+from src.config import Config
 
 logger = setup_logger("main")
 
-def load_target_companies() -> List[str]:
-    """Load target companies from various sources"""
-    companies = []
-    
-    try:
-        # Use company collector to get companies
-        collector = CompanyCollector()
-        companies_by_industry = collector.collect_companies()
-        
-        # Flatten the dictionary into a list
-        for industry_companies in companies_by_industry.values():
-            companies.extend(industry_companies)
-        
-        # Remove duplicates and shuffle
-        companies = list(set(companies))
-        random.shuffle(companies)
-        
-        logger.info(f"Loaded {len(companies)} companies across {len(companies_by_industry)} industries")
-        return companies
-        
-    except Exception as e:
-        logger.error(f"Error loading companies: {e}")
-        
-        # Fallback to basic company list if collection fails
-        return [
-            "OpenAI", "Anthropic", "Scale AI", "Stability AI", "Cohere",
-            "Microsoft", "Google", "Amazon", "Meta", "Apple", "Netflix", "Tesla",
-            # ... add more fallback companies
-        ]
+def stream_target_companies(run: ScrapeRun, scheduler: FreshnessScheduler, progress,
+                            exclude: Iterable[str] = ()) -> Iterator[str]:
+    """Companies due for scraping, admitted to the run as the sources produce them"""
+    stream = CompanyStream(default_sources(), maxsize=Config.COMPANY_QUEUE_SIZE,
+                           exclude=exclude, fallback=FALLBACK_COMPANIES)
+    admitted = 0
+    for company in scheduler.select_iter(stream):
+        company = run.admit(company)
+        progress.add_total(1)
+        admitted += 1
+        yield company
+    run.mark_input_complete()
+    logger.info(f"Company sources finished: {admitted} companies due for scraping, {stream.stats}")
 
-def chunk_companies(companies: List[str], chunk_size: int = 50) -> List[List[str]]:
-    """Split companies into smaller chunks"""
-    return [companies[i:i + chunk_size] for i in range(0, len(companies), chunk_size)]
+def chunk_companies(companies: Iterable[str], chunk_size: int = 50) -> Iterator[List[str]]:
+    """Split companies into smaller chunks, pulling each chunk only when it is needed"""
+    companies = iter(companies)
+    while True:
+        chunk = list(islice(companies, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def scrape_in_chunks(companies: Iterable[str], proxy_manager: ProxyManager, driver_pool: DriverPool,
+                     history: ScrapeHistory = None, hot_spare: HotSpareDriver = None, journal=None):
+    """Scrape companies chunk by chunk on this thread"""
+    company_chunks = chunk_companies(companies, chunk_size=20)  # Smaller chunks
+    
+    for chunk in company_chunks:
+        scraper = None
+        try:
+            scraper = GoogleCompanyScraper(proxy_manager=proxy_manager, driver_pool=driver_pool,
+                                           history=history, hot_spare=hot_spare, journal=journal)
+            # Leads are handed to the lead writer as they are found, so the chunk is not saved again
+            leads = scraper.scrape(chunk)
+            logger.info(f"Scraped {len(leads)} leads")
+            
+            # Requests are paced by the shared rate limiter; this is only an optional extra pause
+            if Config.CHUNK_DELAY:
+                time.sleep(Config.CHUNK_DELAY)
+            
+        except Exception as e:
+            logger.error(f"Error processing chunk: {str(e)}")
+            time.sleep(10)  # Short delay on error
+            continue
+        finally:
+            # Hand the browser back to the pool for the next chunk
+            if scraper:
+                scraper.close()
 
-def run_scraper():
+def run_scraper(processes: int = 0):
+    # The dashboard may run in another process, so scraper metrics are shared through snapshots
+    export_metrics()
+    
+    # Browsers outlive chunks and cycles so Chrome startup is paid once
+    driver_pool = DriverPool(
+        max_size=Config.DRIVER_POOL_SIZE,
+        max_uses=Config.DRIVER_MAX_USES,
+        max_age=Config.DRIVER_MAX_AGE
+    )
+    
+    # Skip fresh leads and back off on repeated misses instead of re-scraping everything
+    history = ScrapeHistory(path=Config.SCRAPE_HISTORY_FILE)
+    scheduler = FreshnessScheduler(
+        history,
+        fresh_ttl=Config.FRESH_LEAD_TTL,
+        miss_backoff=Config.MISS_BACKOFF,
+        max_backoff=Config.MAX_MISS_BACKOFF
+    )
+    
+    lead_writer = get_lead_writer()
+    progress = get_progress_tracker()
+    dedup_index = get_dedup_index()
+    journal = RunJournal(Config.RUN_DIR, fsync=Config.JOURNAL_FSYNC)
+    
+    # Columnar copy of the leads for analysis, compacted once per cycle
+    archive = None
+    if Config.USE_LEAD_ARCHIVE:
+        if archive_available():
+            archive = LeadArchive(Config.ARCHIVE_DIR)
+        else:
+            logger.warning("pyarrow not installed, skipping the Parquet lead archive")
+    
+    # A browser kept ready on the next proxy so rotation is a swap, not a cold start
+    hot_spare = None
+    if Config.HOT_SPARE_DRIVER and not processes:
+        hot_spare = HotSpareDriver(proxy_manager=None, max_age=Config.DRIVER_MAX_AGE)
+    
     while True:
         try:
             # Initialize proxy manager
             proxy_manager = ProxyManager()
+            if hot_spare:
+                hot_spare.proxy_manager = proxy_manager
+                hot_spare.start()
+            
+            # Revalidations of stale leads go out through the proxy pool like the scraper's requests
+            try:
+                scheduler.set_proxy(proxy_manager.get_next_proxy())
+            except Exception as e:
+                logger.warning(f"Revalidating stale leads without a proxy: {e}")
+                scheduler.set_proxy(None)
             
-            # Load and chunk companies
-            all_companies = load_target_companies()
-            company_chunks = chunk_companies(all_companies, chunk_size=20)  # Smaller chunks
+            # Pick up a run a previous process did not finish before planning a new one
+            run = journal.resume()
+            if run:
+                # A lead journaled just before a crash may never have reached the store
+                pending = run.pending(
+                    retry=lambda company, outcome: outcome == OUTCOME_LEAD and not dedup_index.has_company(company)
+                )
+                logger.info(f"Resuming run {run.run_id} with {len(pending)} companies left")
+            else:
+                pending = []
+                run = journal.start()
             
-            logger.info(f"Loaded {len(all_companies)} companies to scrape")
+            # One progress run per cycle, across every chunk or process; the total grows as companies arrive
+            progress.start_run(len(pending))
+            companies = pending
+            if not run.input_complete:
+                # Scraping starts on the first names while the sources are still being read
+                companies = chain(pending, stream_target_companies(run, scheduler, progress, exclude=run.companies))
+            if processes:
+                # Worker processes each own a browser; this thread writes their results
+                leads = process_scrape(companies, processes, history=history, journal=run)
+                logger.info(f"Scraped and saved {len(leads)} leads across {processes} processes")
+            else:
+                scrape_in_chunks(companies, proxy_manager, driver_pool, history, hot_spare, run)
+            progress.finish_run()
+            history.save()
+            lead_writer.flush()
+            run.complete()
             
-            for chunk in company_chunks:
+            # Keep the CSV for tools that still read it; the database is the source of truth
+            logger.info(f"Lead writer: {lead_writer.stats()}")
+            dedup_index.save()
+            exported = lead_writer.lead_store.export_csv(Config.LEADS_CSV_FILE)
+            logger.info(f"Exported {exported} leads to {Config.LEADS_CSV_FILE}")
+            if archive:
                 try:
-                    scraper = GoogleCompanyScraper(proxy_manager=proxy_manager)
-                    leads = scraper.scrape(chunk)
-                    
-                    if leads:
-                        cleaned_leads = scraper.clean_data(leads)
-                        scraper.save_data(cleaned_leads)
-                        logger.info(f"Scraped and saved {len(cleaned_leads)} leads")
-                    
-                    # Shorter delay between chunks
-                    time.sleep(random.uniform(30, 60))  # 30-60 seconds delay
-                    
+                    archive.compact(lead_writer.lead_store)
                 except Exception as e:
-                    logger.error(f"Error processing chunk: {str(e)}")
-                    time.sleep(10)  # Short delay on error
-                    continue
-                finally:
-                    # Clean up resources
-                    if scraper and scraper.driver:
-                        try:
-                            scraper.driver.quit()
-                        except:
-                            pass
+                    logger.error(f"Error compacting lead archive: {e}")
             
-            # Shorter interval between cycles
-            time.sleep(300)  # 5 minutes between cycles
+            time.sleep(Config.CYCLE_INTERVAL)
             
         except Exception as e:
             logger.error(f"Error in scraper: {str(e)}")
             time.sleep(60)
 
+def run_web(workers: int = 1):
+    """Serve the dashboard; it reads leads, progress, counters and metrics from the shared store and files"""
+    if workers > 1:
+        # Each worker is its own process, so request handling never competes with the scraper for the GIL
+        uvicorn.run("src.web.app:app", host=Config.WEB_HOST, port=Config.WEB_PORT, workers=workers)
+    else:
+        uvicorn.run(app, host=Config.WEB_HOST, port=Config.WEB_PORT)
+
 if __name__ == "__main__":
-    # Start scraper in background thread
-    scraper_thread = threading.Thread(target=run_scraper)
-    scraper_thread.daemon = True
-    scraper_thread.start()
+    parser = argparse.ArgumentParser(
+        description="Run the lead scraper and dashboard",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=(
+            "roles:\n"
+            "  all      scraper on a background thread, dashboard in the foreground (default)\n"
+            "  scraper  only the scraper; start the dashboard separately with --role web\n"
+            "  web      only the dashboard; /status, /progress and /metrics read what a scraper\n"
+            "           process left in the lead store, PROGRESS_FILE, ACTIVITY_COUNTERS_FILE\n"
+            "           and METRICS_DIR, so run both roles from the same working directory\n"
+            "           or point them at the same paths"
+        )
+    )
+    parser.add_argument(
+        '--processes', type=int, default=0,
+        help="Scrape with N worker processes (e.g. $(nproc)); 0 scrapes on a thread of this process"
+    )
+    parser.add_argument(
+        '--role', choices=('all', 'scraper', 'web'), default='all',
+        help="Run the scraper and dashboard together, or only one of them (start each in its own process)"
+    )
+    parser.add_argument(
+        '--web-workers', type=int, default=Config.WEB_WORKERS,
+        help="Dashboard worker processes; above 1 the dashboard leaves this process to the scraper"
+    )
+    args = parser.parse_args()
     
-    # Run web server
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    if args.role == 'scraper':
+        run_scraper(args.processes)
+    elif args.role == 'web':
+        run_web(args.web_workers)
+    else:
+        # Start scraper in background thread
+        scraper_thread = threading.Thread(target=run_scraper, args=(args.processes,))
+        scraper_thread.daemon = True
+        scraper_thread.start()
+        
+        # Run web server
+        run_web(args.web_workers)
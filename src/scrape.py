@@ -7,6 +7,7 @@ logger = setup_logger("scraper")
 
 def start_scraping():
     """Start the scraping process"""
+    scraper = None
     try:
         # Initialize
         proxy_manager = ProxyManager()
@@ -30,8 +31,8 @@ def start_scraping():
     except Exception as e:
         logger.error(f"Error in scraping: {e}")
     finally:
-        if scraper and scraper.driver:
-            scraper.driver.quit()
+        if scraper:
+            scraper.close()
 
 if __name__ == "__main__":
     start_scraping() 
\ No newline at end of file
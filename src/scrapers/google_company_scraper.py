@@ -1,4 +1,3 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -6,17 +5,123 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from datetime import datetime
 from src.scrapers.base_scraper import BaseScraper
 from src.models.lead import Lead
+from src.config import Config
+from src.utils.http_fetcher import HttpFetcher, parse_html, extract_email, find_contact_link, needs_javascript
+from src.utils.async_enricher import AsyncEnricher
+from src.utils.driver_pool import create_driver
+from src.utils.response_cache import get_response_cache
+from src.utils.rate_limiter import get_rate_limiter
+from src.utils.lead_writer import get_lead_writer
+from src.utils.dedup_index import get_dedup_index, lead_already_held
+from src.utils.progress_tracker import get_progress_tracker
+from src.utils.activity_counters import get_activity_counters
+from src.utils.metrics import (
+    BLOCKS_TOTAL, EMAIL_EXTRACTION_SECONDS, PROXY_ROTATIONS_TOTAL, SERP_LOAD_SECONDS, SITE_VISIT_SECONDS
+)
+from src.utils.run_journal import OUTCOME_SKIPPED
+from src.utils.scrape_history import OUTCOME_LEAD, OUTCOME_NO_EMAIL, OUTCOME_FAILED
 import pandas as pd
 import time
-import random
 import urllib.parse
-import os
-from typing import List
-import json
+from typing import List, Optional
+
+ENRICHMENT_MODES = ('sequential', 'async')
+
+# Cache namespace for browser-rendered page sources
+RENDERED = 'rendered'
+
+
+# Page text that means Google served a block or captcha page
+BLOCK_INDICATORS = [
+    'unusual traffic',
+    'please try your request again',
+    'automated requests',
+    'blocked',
+    'captcha'
+]
+
+# Runs in the page so a whole result page costs a single WebDriver round trip
+SERP_SNAPSHOT_SCRIPT = """
+const blockIndicators = arguments[0];
+const limit = arguments[1];
+const includeHtml = arguments[2];
+
+const html = document.documentElement.outerHTML;
+const lowered = html.toLowerCase();
+const blocked = blockIndicators.filter(text => lowered.includes(text));
+
+const results = [];
+for (const result of document.querySelectorAll('div.g')) {
+    if (results.length >= limit) {
+        break;
+    }
+    const anchor = result.querySelector('a[href]');
+    if (!anchor) {
+        continue;
+    }
+    const snippet = result.querySelector('div.VwiC3b');
+    results.push({link: anchor.href, snippet: snippet ? snippet.innerText : null});
+}
+
+return {
+    blocked: blocked,
+    results: results,
+    url: window.location.href,
+    html: includeHtml && results.length ? html : null
+};
+"""
+
+
+def read_serp_snapshot(driver, limit, include_html=False):
+    """Read block indicators and the top results of the loaded result page in one call"""
+    return driver.execute_script(SERP_SNAPSHOT_SCRIPT, BLOCK_INDICATORS, limit, include_html)
+
+
+def parse_serp_html(html, base_url=None):
+    """Extract link and snippet of each organic result from a result page snapshot
+
+    Links are resolved against base_url, the page the snapshot was taken on,
+    so they match the absolute anchor.href a live page load returns.
+    """
+    serp_results = []
+    for result in parse_html(html).select('div.g'):
+        anchor = result.find('a', href=True)
+        if not anchor:
+            continue
+        snippet = result.select_one('div.VwiC3b')
+        serp_results.append({
+            'link': urllib.parse.urljoin(base_url, anchor['href']) if base_url else anchor['href'],
+            'snippet': snippet.get_text() if snippet else None
+        })
+    return serp_results
+
 
 class GoogleCompanyScraper(BaseScraper):
-    def __init__(self, proxy_manager=None):
+    def __init__(self, proxy_manager=None, driver_pool=None, history=None, hot_spare=None, lead_writer=None,
+                 dedup_index=None, progress=None, journal=None, counters=None):
         super().__init__(proxy_manager)
+        self.journal = journal
+        self.progress = progress or get_progress_tracker()
+        self.counters = counters or get_activity_counters()
+        self.blocks = 0  # Block or captcha pages served to this scraper
+        self.lead_writer = lead_writer or get_lead_writer()
+        self.lead_store = self.lead_writer.lead_store
+        self.dedup_index = dedup_index or get_dedup_index()
+        self.skip_held_leads = True
+        self.skipped_held = 0  # Companies not searched because their lead is already held
+        self.driver_pool = driver_pool
+        self.hot_spare = hot_spare
+        self.history = history
+        self.driver = None
+        self.response_cache = get_response_cache()
+        self.rate_limiter = get_rate_limiter()
+        self.http_fetcher = HttpFetcher(
+            timeout=Config.HTTP_FETCH_TIMEOUT, cache=self.response_cache, rate_limiter=self.rate_limiter
+        ) if Config.USE_HTTP_FETCH else None
+        self.fetch_stats = {'http': 0, 'selenium': 0}
+        self.enrichment_mode = Config.ENRICHMENT_MODE
+        self.enricher = None
+        self.email_source = None  # Page the last email was found on, with its validators
         self.setup_driver()
         self.base_url = "https://www.google.com"
         
@@ -26,47 +131,17 @@ class GoogleCompanyScraper(BaseScraper):
         
         while retry_count < max_retries:
             try:
-                chrome_options = webdriver.ChromeOptions()
-                chrome_options.add_argument('--no-sandbox')
-                chrome_options.add_argument('--disable-dev-shm-usage')
-                chrome_options.add_argument('--window-size=1920,1080')
+                self._apply_proxy()
                 
-                # Add proxy if configured
-                if self.current_proxy:
-                    proxy_str = self.current_proxy['http'].replace('http://', '')
-                    chrome_options.add_argument(f'--proxy-server={proxy_str}')
-                    self.logger.info(f"Using proxy: {proxy_str}")
-                
-                # Add stealth options
-                chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-                chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-                chrome_options.add_experimental_option('useAutomationExtension', False)
-                chrome_options.add_argument('--disable-notifications')
-                
-                # Additional options to handle proxy issues
-                chrome_options.add_argument('--ignore-certificate-errors')
-                chrome_options.add_argument('--ignore-ssl-errors')
-                chrome_options.add_argument('--disable-web-security')
-                
-                # Rotate user agents
-                user_agents = [
-                    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0'
-                ]
-                chrome_options.add_argument(f'--user-agent={random.choice(user_agents)}')
-                
-                self.driver = webdriver.Chrome(options=chrome_options)
-                self.driver.set_page_load_timeout(30)
-                
-                # Test the connection
-                self.driver.get("https://www.google.com")
-                if "google" in self.driver.current_url.lower():
-                    self.wait = WebDriverWait(self.driver, 20)
-                    self.logger.info("Chrome driver initialized successfully")
-                    return
+                # Reuse a warm browser from the pool when one is available
+                if self.driver_pool:
+                    self.driver = self.driver_pool.checkout(self.current_proxy)
                 else:
-                    raise Exception("Failed to connect to Google")
+                    self.driver = create_driver(self.current_proxy)
+                
+                self.wait = WebDriverWait(self.driver, 20)
+                self.logger.info("Chrome driver initialized successfully")
+                return
                     
             except Exception as e:
                 self.logger.error(f"Failed to initialize Chrome driver: {str(e)}")
@@ -77,6 +152,34 @@ class GoogleCompanyScraper(BaseScraper):
         
         raise Exception("Failed to initialize Chrome driver after maximum retries")
 
+    def _apply_proxy(self):
+        """Route the plain HTTP fetchers through the current proxy"""
+        if self.http_fetcher:
+            self.http_fetcher.set_proxy(self.current_proxy)
+        if self.enricher and self.enricher.fetcher is not self.http_fetcher:
+            self.enricher.fetcher.set_proxy(self.current_proxy)
+
+    def close(self):
+        """Release the driver and stop the enricher's fetch threads"""
+        self.release_driver()
+        if self.enricher:
+            self.enricher.close()
+            self.enricher = None
+
+    def release_driver(self, healthy: bool = True):
+        """Return the driver to the pool, or quit it when running without one"""
+        if not self.driver:
+            return
+        
+        driver, self.driver = self.driver, None
+        if self.driver_pool:
+            self.driver_pool.checkin(driver, healthy=healthy)
+        else:
+            try:
+                driver.quit()
+            except:
+                pass
+
     def handle_proxy_error(self):
         """Handle proxy-related errors"""
         self.proxy_failures += 1
@@ -84,16 +187,34 @@ class GoogleCompanyScraper(BaseScraper):
         
         if self.proxy_failures >= self.max_proxy_failures:
             self.logger.info("Rotating proxy due to failures...")
-            if self.driver:
+            PROXY_ROTATIONS_TOTAL.inc()
+            start = time.time()
+            self.release_driver(healthy=False)
+            self.proxy_failures = 0
+            
+            # Swap in the pre-warmed spare when one is ready
+            spare = self.hot_spare.take() if self.hot_spare else None
+            if spare and self.driver_pool and not self.driver_pool.adopt(*spare):
+                # Every pool slot is busy; a cold start waits for one instead of exceeding the cap
+                self.logger.info("Driver pool is full, discarding the spare")
                 try:
-                    self.driver.quit()
+                    spare[0].quit()
                 except:
                     pass
-            
-            if self.proxy_manager:
-                self.current_proxy = self.proxy_manager.get_next_proxy()
-                self.proxy_failures = 0
+                spare = None
+            if spare:
+                self.driver, self.current_proxy = spare
+                self._apply_proxy()
+                self.wait = WebDriverWait(self.driver, 20)
+            else:
+                if self.proxy_manager:
+                    self.current_proxy = self.proxy_manager.get_next_proxy()
                 self.setup_driver()
+            
+            self.logger.info(
+                f"Proxy rotation took {time.time() - start:.2f}s "
+                f"({'hot spare' if spare else 'cold start'})"
+            )
 
     def search_company(self, query):
         """Search for company information on Google"""
@@ -106,34 +227,50 @@ class GoogleCompanyScraper(BaseScraper):
                 search_query = f"{query} company contact email"
                 encoded_query = urllib.parse.quote(search_query)
                 
-                # Add error checking for the request
-                try:
-                    self.driver.get(f"{self.base_url}/search?q={encoded_query}")
-                except Exception as e:
-                    if any(error in str(e).lower() for error in ['timeout', 'connection reset', 'empty response']):
+                search_url = f"{self.base_url}/search?q={encoded_query}"
+                
+                # Reuse a recent result page instead of querying Google again
+                cached = None
+                if self.response_cache:
+                    cached = self.response_cache.get(search_url, max_age=Config.SERP_CACHE_TTL, namespace=RENDERED)
+                
+                if cached:
+                    self.logger.info(f"Using cached search results for {query}")
+                    serp_results = parse_serp_html(cached.body, cached.final_url)[:Config.ENRICHMENT_TOP_N]
+                else:
+                    # Add error checking for the request
+                    self.rate_limiter.acquire(search_url)
+                    serp_start = time.perf_counter()
+                    try:
+                        self.driver.get(search_url)
+                    except Exception as e:
+                        if any(error in str(e).lower() for error in ['timeout', 'connection reset', 'empty response']):
+                            self.rate_limiter.report_error(search_url)
+                            self.handle_proxy_error()
+                            retry_count += 1
+                            continue
+                        raise
+                    
+                    # One script call returns block indicators, results and the snapshot to cache
+                    snapshot = read_serp_snapshot(self.driver, Config.ENRICHMENT_TOP_N, bool(self.response_cache))
+                    if not snapshot['blocked'] and not snapshot['results']:
+                        snapshot = self.wait.until(self._serp_ready)
+                    SERP_LOAD_SECONDS.observe(time.perf_counter() - serp_start)
+                    
+                    if snapshot['blocked']:
+                        self.logger.warning(f"Detected blocking/captcha: {', '.join(snapshot['blocked'])}")
+                        BLOCKS_TOTAL.inc(kind='captcha' if 'captcha' in snapshot['blocked'] else 'block')
+                        self.rate_limiter.report_block(search_url)
+                        self.blocks += 1
+                        self.counters.record('blocks')
                         self.handle_proxy_error()
                         retry_count += 1
                         continue
-                    raise
-                
-                # Check for various blocking conditions
-                page_source = self.driver.page_source.lower()
-                if any(text in page_source for text in [
-                    'unusual traffic',
-                    'please try your request again',
-                    'automated requests',
-                    'blocked',
-                    'captcha'
-                ]):
-                    self.logger.warning("Detected blocking/captcha")
-                    self.handle_proxy_error()
-                    retry_count += 1
-                    continue
-                
-                # Get search results
-                results = self.wait.until(EC.presence_of_all_elements_located(
-                    (By.CSS_SELECTOR, "div.g")
-                ))
+                    
+                    serp_results = snapshot['results']
+                    self.rate_limiter.report_success(search_url)
+                    if self.response_cache and snapshot['html']:
+                        self.response_cache.put(search_url, snapshot['html'], final_url=snapshot['url'], namespace=RENDERED)
                 
                 company_info = {
                     'name': query,
@@ -142,31 +279,33 @@ class GoogleCompanyScraper(BaseScraper):
                     'description': None,
                     'location': None
                 }
+                self.email_source = None
                 
                 # Process first few results
-                for result in results[:3]:
-                    try:
-                        link = result.find_element(By.CSS_SELECTOR, "a").get_attribute('href')
-                        if not company_info['website'] and self._is_company_website(link):
-                            company_info['website'] = link
-                            
-                        # Try to get description
-                        if not company_info['description']:
-                            try:
-                                snippet = result.find_element(By.CSS_SELECTOR, "div.VwiC3b").text
-                                company_info['description'] = snippet
-                            except:
-                                pass
-                                
-                        # Visit the page to look for email
-                        if not company_info['email']:
-                            email = self._extract_email_from_website(link)
-                            if email:
-                                company_info['email'] = email
-                                
-                    except Exception as e:
-                        self.logger.error(f"Error processing search result: {str(e)}")
+                candidate_links = []
+                for result in serp_results:
+                    link = result['link']
+                    if not link:
                         continue
+                    if not company_info['website'] and self._is_company_website(link):
+                        company_info['website'] = link
+                        
+                    # Try to get description
+                    if not company_info['description'] and result['snippet']:
+                        company_info['description'] = result['snippet']
+                            
+                    # Visit the page to look for email
+                    if self.enrichment_mode == 'async':
+                        candidate_links.append(link)
+                    elif not company_info['email']:
+                        email = self._extract_email_from_website(link)
+                        if email:
+                            company_info['email'] = email
+                
+                if candidate_links:
+                    company_info['email'] = self._enrich_async(candidate_links)
+                if company_info['email']:
+                    company_info['email_source'] = self.email_source
                     
                 return company_info
                 
@@ -178,10 +317,26 @@ class GoogleCompanyScraper(BaseScraper):
                     'empty response', 'connection refused'
                 ]):
                     self.handle_proxy_error()
-                time.sleep(random.uniform(5, 10))
+                # The next attempt waits out this pause in rate_limiter.acquire
+                self.rate_limiter.report_error(self.base_url)
         
         return None
 
+    def _serp_ready(self, driver):
+        """Wait condition: a snapshot once results or a block page have rendered"""
+        snapshot = read_serp_snapshot(driver, Config.ENRICHMENT_TOP_N, bool(self.response_cache))
+        if snapshot['blocked'] or snapshot['results']:
+            return snapshot
+        return False
+
+    def _found_email_on(self, url, page=None):
+        """Remember where the email came from; only plain HTTP responses carry validators"""
+        self.email_source = {
+            'source_url': url,
+            'etag': page.etag if page else None,
+            'last_modified': page.last_modified if page else None
+        }
+
     def _is_company_website(self, url):
         """Check if URL likely belongs to company website"""
         low_quality_domains = ['facebook.com', 'linkedin.com', 'twitter.com', 'instagram.com', 
@@ -189,14 +344,109 @@ class GoogleCompanyScraper(BaseScraper):
         return not any(domain in url.lower() for domain in low_quality_domains)
 
     def _extract_email_from_website(self, website):
-        """Extract email from website"""
+        """Extract email from website, preferring plain HTTP over the browser"""
+        with EMAIL_EXTRACTION_SECONDS.time():
+            return self._extract_email(website)
+
+    def _extract_email(self, website):
+        if self.http_fetcher:
+            served, email = self._extract_email_via_http(website)
+            if served:
+                self.fetch_stats['http'] += 1
+                self.logger.info(f"Visited {website} via http")
+                return email
+        
+        self.fetch_stats['selenium'] += 1
+        self.logger.info(f"Visited {website} via selenium")
+        return self._extract_email_via_driver(website)
+
+    def _extract_email_via_http(self, website):
+        """Try the lightweight HTTP path, returns (served, email)"""
+        with SITE_VISIT_SECONDS.time(via='http'):
+            page = self.http_fetcher.fetch(website)
+        if not page or page.status_code >= 400:
+            return False, None
+        
+        soup = parse_html(page.html)
+        if needs_javascript(page.html, soup):
+            return False, None
+        
+        email = extract_email(soup)
+        if email:
+            self._found_email_on(page.final_url, page)
+            return True, email
+        
+        # Look for contact page
+        contact_url = find_contact_link(soup, page.final_url)
+        if not contact_url:
+            return True, None
+        
+        with SITE_VISIT_SECONDS.time(via='http'):
+            contact_page = self.http_fetcher.fetch(contact_url)
+        if not contact_page or contact_page.status_code >= 400:
+            return True, None
+        
+        contact_soup = parse_html(contact_page.html)
+        if needs_javascript(contact_page.html, contact_soup):
+            return False, None
+        
+        email = extract_email(contact_soup)
+        if email:
+            self._found_email_on(contact_page.final_url, contact_page)
+        return True, email
+
+    def _enrich_async(self, links):
+        """Look for an email on all candidate sites concurrently"""
+        if not self.enricher:
+            self.enricher = AsyncEnricher(
+                fetcher=self.http_fetcher or HttpFetcher(
+                    proxy=self.current_proxy, timeout=Config.HTTP_FETCH_TIMEOUT,
+                    cache=self.response_cache, rate_limiter=self.rate_limiter
+                ),
+                max_in_flight=Config.ENRICHMENT_MAX_IN_FLIGHT,
+                max_per_host=Config.ENRICHMENT_MAX_PER_HOST,
+                page_timeout=Config.HTTP_FETCH_TIMEOUT,
+                total_timeout=Config.ENRICHMENT_TIMEOUT
+            )
+        
+        result = self.enricher.find_email(links)
+        self.fetch_stats['http'] += result.pages_fetched
+        if result.email:
+            self.logger.info(f"Found email on {result.source_url} after {result.pages_fetched} pages")
+            self.email_source = {
+                'source_url': result.source_url, 'etag': result.etag, 'last_modified': result.last_modified
+            }
+            return result.email
+        
+        # Sites that need JavaScript still go through the browser, one at a time
+        for link in result.js_sites:
+            self.fetch_stats['selenium'] += 1
+            self.logger.info(f"Visited {link} via selenium")
+            email = self._extract_email_via_driver(link)
+            if email:
+                return email
+        return None
+
+    def _extract_email_via_driver(self, website):
+        """Extract email by loading the website in Chrome"""
+        if self.response_cache:
+            cached = self.response_cache.get(website, namespace=RENDERED)
+            if cached:
+                found, email = self._extract_email_from_cache(cached)
+                if found:
+                    return email
+        
         try:
-            self.driver.get(website)
-            time.sleep(random.uniform(2, 3))
+            self.rate_limiter.acquire(website)
+            with SITE_VISIT_SECONDS.time(via='selenium'):
+                self.driver.get(website)
+                self._wait_for_page_ready()
+            self._cache_rendered_page(website)
             
             # Look for email patterns
             email_elements = self.driver.find_elements(By.XPATH, "//a[contains(@href, 'mailto:')]")
             if email_elements:
+                self._found_email_on(self.driver.current_url)
                 return email_elements[0].get_attribute('href').replace('mailto:', '')
             
             # Look for contact page
@@ -205,94 +455,176 @@ class GoogleCompanyScraper(BaseScraper):
                 "//a[contains(translate(text(), 'CONTACT', 'contact'), 'contact')]"
             )
             if contact_links:
+                self.rate_limiter.acquire(website)
                 contact_links[0].click()
-                time.sleep(random.uniform(1, 2))
+                self._wait_for_page_ready(previous_element=contact_links[0])
+                self._cache_rendered_page(self.driver.current_url)
                 email_elements = self.driver.find_elements(By.XPATH, "//a[contains(@href, 'mailto:')]")
                 if email_elements:
+                    self._found_email_on(self.driver.current_url)
                     return email_elements[0].get_attribute('href').replace('mailto:', '')
             
             return None
         except:
             return None
 
-    def scrape(self, companies: List[str]) -> List[Lead]:
-        """Scrape company information"""
+    def _wait_for_page_ready(self, previous_element=None):
+        """Wait until the page has navigated away from previous_element and finished loading"""
+        try:
+            if previous_element is not None:
+                # Clicks that do not navigate (in-page routing) only get a short grace period
+                WebDriverWait(self.driver, min(3, Config.PAGE_READY_TIMEOUT)).until(EC.staleness_of(previous_element))
+        except TimeoutException:
+            pass
+        
+        try:
+            WebDriverWait(self.driver, Config.PAGE_READY_TIMEOUT).until(
+                lambda driver: driver.execute_script("return document.readyState") == "complete"
+            )
+        except TimeoutException:
+            self.logger.warning(f"Timed out waiting for {self.driver.current_url} to load")
+
+    def _extract_email_from_cache(self, cached):
+        """Replay a cached browser visit, returns (found, email)
+
+        found is False when the visit cannot be answered from the cache alone.
+        """
+        soup = parse_html(cached.body)
+        email = extract_email(soup)
+        if email:
+            self._found_email_on(cached.final_url)
+            return True, email
+        
+        contact_url = find_contact_link(soup, cached.final_url)
+        if not contact_url:
+            return True, None
+        
+        contact = self.response_cache.get(contact_url, namespace=RENDERED)
+        if not contact:
+            return False, None
+        email = extract_email(parse_html(contact.body))
+        if email:
+            self._found_email_on(contact.final_url)
+        return True, email
+
+    def _cache_rendered_page(self, url):
+        """Store the browser's current page source"""
+        if not self.response_cache:
+            return
+        try:
+            self.response_cache.put(url, self.driver.page_source, final_url=self.driver.current_url, namespace=RENDERED)
+        except Exception as e:
+            self.logger.error(f"Error caching page: {e}")
+
+    def scrape(self, companies: List[str], mode: str = None) -> List[Lead]:
+        """Scrape company information
+        
+        mode selects how result sites are enriched: 'sequential' visits them one
+        by one, 'async' crawls them concurrently. Defaults to Config.ENRICHMENT_MODE.
+        """
+        if mode:
+            if mode not in ENRICHMENT_MODES:
+                raise ValueError(f"Unknown enrichment mode: {mode}")
+            self.enrichment_mode = mode
+        
         leads = []
         total = len(companies)
         start_time = time.time()
         
         self.logger.info(f"Starting scrape of {total} companies")
         
-        # Create progress file
-        with open('data/scraping_progress.json', 'w') as f:
-            json.dump({
-                'total': total,
-                'completed': 0,
-                'successful': 0,
-                'failed': 0,
-                'start_time': start_time,
-                'current_company': ''
-            }, f)
+        # A caller running several chunks owns the run; otherwise this call does
+        owns_run = not self.progress.active
+        if owns_run:
+            self.progress.start_run(total)
         
         for idx, company in enumerate(companies, 1):
+            lead = None
+            skipped_before = self.skipped_held
             try:
-                # Update progress
-                self._update_progress(idx, total, company)
+                self.progress.started(company)
                 
                 # Search for company info
-                company_info = self.search_company(company)
-                if company_info and company_info.get('email'):
-                    lead = Lead(
-                        name=company_info['name'],
-                        email=company_info['email'],
-                        platform='google',
-                        category='business',
-                        website=company_info['website'],
-                        description=company_info['description'],
-                        location=company_info['location'],
-                        timestamp=datetime.now()
-                    )
+                lead = self.scrape_company(company)
+                if lead:
                     leads.append(lead)
                     
                     # Save leads in real-time
                     self._save_lead(lead)
                     
-                # Calculate and log progress
-                elapsed = time.time() - start_time
-                rate = idx / (elapsed / 3600)
-                self._log_progress(idx, total, rate, len(leads))
-                
             except Exception as e:
                 self.logger.error(f"Error processing {company}: {str(e)}")
-                continue
+            finally:
+                if self.skipped_held > skipped_before:
+                    self.progress.skipped(company)
+                else:
+                    self.progress.finished(company, lead is not None)
+                
+            # Calculate and log progress
+            elapsed = time.time() - start_time
+            rate = idx / (elapsed / 3600)
+            self._log_progress(idx, total, rate, len(leads))
         
+        if owns_run:
+            self.progress.finish_run()
+        
+        self.logger.info(
+            f"Site visits served - http: {self.fetch_stats['http']}, "
+            f"selenium: {self.fetch_stats['selenium']}"
+        )
+        if self.response_cache:
+            self.logger.info(f"Response cache: {self.response_cache.stats()}")
+        if self.skipped_held:
+            self.logger.info(f"Skipped {self.skipped_held} companies whose lead is already held")
         return leads
 
-    def _update_progress(self, current: int, total: int, company: str):
-        """Update progress file"""
-        try:
-            with open('data/scraping_progress.json', 'r') as f:
-                progress = json.load(f)
-                
-            progress.update({
-                'completed': current,
-                'current_company': company,
-                'last_update': time.time()
-            })
-            
-            with open('data/scraping_progress.json', 'w') as f:
-                json.dump(progress, f)
-                
-        except Exception as e:
-            self.logger.error(f"Error updating progress: {e}")
+    def scrape_company(self, company: str) -> Optional[Lead]:
+        """Search a single company and build a lead if an email was found"""
+        if self.journal:
+            self.journal.started(company)
+        
+        if self.skip_held_leads and lead_already_held(self.dedup_index, company, self.history, Config.FRESH_LEAD_TTL):
+            self.skipped_held += 1
+            self.logger.info(f"Skipping {company}: lead already held")
+            if self.journal:
+                self.journal.finished(company, OUTCOME_SKIPPED)
+            return None
+        
+        company_info = self.search_company(company)
+        if not company_info:
+            outcome = OUTCOME_FAILED
+        else:
+            outcome = OUTCOME_LEAD if company_info.get('email') else OUTCOME_NO_EMAIL
+        
+        if self.history:
+            if company_info:
+                self.history.record(company, outcome, email=company_info['email'], website=company_info['website'],
+                                    **(company_info.get('email_source') or {}))
+            else:
+                self.history.record(company, outcome)
+        if self.journal:
+            self.journal.finished(company, outcome)
+        
+        if not company_info or not company_info.get('email'):
+            return None
+        
+        return Lead(
+            name=company_info['name'],
+            email=company_info['email'],
+            platform='google',
+            category='business',
+            website=company_info['website'],
+            description=company_info['description'],
+            location=company_info['location'],
+            timestamp=datetime.now()
+        )
 
     def _save_lead(self, lead: Lead):
-        """Save a single lead to CSV"""
+        """Queue a single lead for the lead writer"""
         try:
-            df = pd.DataFrame([lead.to_dict()])
-            output_file = 'data/google_leads.csv'
-            df.to_csv(output_file, mode='a', header=not os.path.exists(output_file), index=False)
-            self.logger.info(f"Saved lead for {lead.name}")
+            self.lead_writer.submit(lead)
+            self.dedup_index.add_lead(lead)
+            self.logger.info(f"Queued lead for {lead.name}")
         except Exception as e:
             self.logger.error(f"Error saving lead: {e}")
 
@@ -305,33 +637,17 @@ class GoogleCompanyScraper(BaseScraper):
         return [Lead(**row) for row in df.to_dict('records')]
         
     def save_data(self, leads):
-        """Save leads to CSV file"""
+        """Save leads to the lead store and wait for them to be committed"""
         if not leads:
             return
         
         try:
-            # Create data directory if it doesn't exist
-            os.makedirs('data', exist_ok=True)
-            
-            # Convert leads to DataFrame
-            df = pd.DataFrame([
-                {
-                    'name': lead.name,
-                    'email': lead.email,
-                    'platform': lead.platform,
-                    'category': lead.category,
-                    'website': lead.website,
-                    'description': lead.description,
-                    'location': lead.location,
-                    'timestamp': lead.timestamp
-                }
-                for lead in leads
-            ])
-            
-            # Save to CSV
-            output_file = 'data/google_leads.csv'
-            df.to_csv(output_file, mode='a', header=not os.path.exists(output_file), index=False)
-            self.logger.info(f"Saved {len(leads)} leads to {output_file}")
+            # Upserts on (name, email), so a lead already saved in real time is refreshed, not duplicated
+            self.lead_writer.submit_many(leads)
+            for lead in leads:
+                self.dedup_index.add_lead(lead)
+            self.lead_writer.flush()
+            self.logger.info(f"Saved {len(leads)} leads to {self.lead_store.url}")
             
         except Exception as e:
             self.logger.error(f"Error saving data: {str(e)}")
@@ -339,21 +655,6 @@ class GoogleCompanyScraper(BaseScraper):
     def _log_progress(self, current: int, total: int, rate: float, leads_found: int):
         """Log scraping progress"""
         try:
-            # Update progress file
-            with open('data/scraping_progress.json', 'r') as f:
-                progress = json.load(f)
-                
-            progress.update({
-                'completed': current,
-                'successful': leads_found,
-                'failed': current - leads_found,
-                'rate': round(rate, 2),
-                'last_update': time.time()
-            })
-            
-            with open('data/scraping_progress.json', 'w') as f:
-                json.dump(progress, f)
-                
             # Log progress
             percent_complete = (current / total) * 100
             self.logger.info(
@@ -0,0 +1,54 @@
+from src.utils.activity_counters import EVENTS, HOUR, MINUTE, ActivityCounters, _Ring
+
+LEADS = EVENTS.index('leads')
+START = 1_800_000_000 // MINUTE * MINUTE  # A minute boundary
+
+
+def test_ring_wraps_around_and_overwrites_the_oldest_bucket():
+    ring = _Ring(MINUTE, 4)
+    for minute in range(4):
+        ring.add(LEADS, minute + 1, START + minute * MINUTE)
+
+    ring.add(LEADS, 10, START + 4 * MINUTE)  # Reuses the slot of the first minute
+
+    now = START + 4 * MINUTE
+    assert ring.series(LEADS, 5, now).tolist() == [0, 2, 3, 4, 10]
+    assert ring.window(4 * MINUTE, now)[LEADS] == 2 + 3 + 4 + 10
+
+
+def test_ring_drops_events_older_than_it_reaches_back():
+    ring = _Ring(MINUTE, 4)
+    ring.add(LEADS, 5, START + 4 * MINUTE)
+
+    ring.add(LEADS, 1, START)  # Same slot, four minutes older
+
+    assert ring.window(5 * MINUTE, START + 4 * MINUTE)[LEADS] == 5
+
+
+def test_window_skips_slots_left_from_earlier_laps():
+    ring = _Ring(MINUTE, 4)
+    ring.add(LEADS, 7, START)
+    ring.add(LEADS, 1, START + 5 * MINUTE)
+
+    # The first minute's slot was never reused, but it is out of the window
+    assert ring.window(4 * MINUTE, START + 5 * MINUTE)[LEADS] == 1
+    assert ring.series(LEADS, 3, START + 5 * MINUTE).tolist() == [0, 0, 1]
+
+
+def test_long_windows_read_the_hour_ring():
+    counters = ActivityCounters(path=None, minutes=60, hours=48)
+    counters.record('leads', 3, at=START)
+    counters.record('leads', 2, at=START + 5 * HOUR)
+
+    now = START + 5 * HOUR
+    assert counters.totals(30 * MINUTE, now)['leads'] == 2
+    assert counters.totals(6 * HOUR, now)['leads'] == 5
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / 'counters.npz')
+    counters = ActivityCounters(path=path)
+    counters.record('blocks', 4, at=START)
+    counters.close()
+
+    assert ActivityCounters(path=path).totals(MINUTE, START)['blocks'] == 4
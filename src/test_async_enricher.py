@@ -0,0 +1,142 @@
+import threading
+import time
+from urllib.parse import urlparse
+from src.fakes import FixtureServer
+from src.utils.async_enricher import AsyncEnricher
+from src.utils.http_fetcher import FetchedPage, HttpFetcher
+
+FILLER = '<p>' + 'We build software for businesses around the world. ' * 10 + '</p>'
+
+
+class FakeFetcher:
+    """Serves canned pages after a delay and tracks how many fetches run at once, per host"""
+
+    def __init__(self, pages=None, delay=0.0):
+        self.pages = pages or {}
+        self.delay = delay
+        self.fetched = []
+        self.active = {}
+        self.max_active = {}
+        self.max_total = 0
+        self._lock = threading.Lock()
+
+    def fetch(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            self.active[host] = self.active.get(host, 0) + 1
+            self.max_active[host] = max(self.max_active.get(host, 0), self.active[host])
+            self.max_total = max(self.max_total, sum(self.active.values()))
+        try:
+            delay = self.delay(url) if callable(self.delay) else self.delay
+            time.sleep(delay)
+            self.fetched.append(url)
+            body = self.pages.get(url, FILLER)
+            return FetchedPage(url=url, final_url=url, status_code=200,
+                               html=f'<html><body>{body}</body></html>', fetched_at=time.time())
+        finally:
+            with self._lock:
+                self.active[host] -= 1
+
+    def set_proxy(self, proxy):
+        pass
+
+
+def test_per_host_cap_holds_through_page_timeouts():
+    fetcher = FakeFetcher(delay=0.2)
+    enricher = AsyncEnricher(fetcher=fetcher, max_in_flight=10, max_per_host=2, page_timeout=0.05)
+    try:
+        urls = [f'http://slow.example.com/{i}' for i in range(6)]
+        result = enricher.find_email(urls)
+    finally:
+        enricher.close()
+
+    assert result.email is None
+    assert fetcher.max_active['slow.example.com'] == 2
+
+
+def test_global_cap_across_hosts():
+    fetcher = FakeFetcher(delay=0.05)
+    enricher = AsyncEnricher(fetcher=fetcher, max_in_flight=2, max_per_host=2)
+    try:
+        enricher.find_email([f'http://site{i}.example.com/' for i in range(6)])
+    finally:
+        enricher.close()
+
+    assert fetcher.max_total <= 2
+
+
+def test_first_email_does_not_wait_for_slower_sites():
+    pages = {'http://fast.example.com/': FILLER + '<a href="mailto:hello@fast.example.com">Mail</a>'}
+    fetcher = FakeFetcher(pages, delay=lambda url: 2.0 if 'slow' in url else 0.0)
+    enricher = AsyncEnricher(fetcher=fetcher, max_in_flight=10, max_per_host=2)
+    try:
+        start = time.monotonic()
+        result = enricher.find_email(['http://fast.example.com/', 'http://slow.example.com/'])
+        elapsed = time.monotonic() - start
+    finally:
+        enricher.close()
+
+    assert result.email == 'hello@fast.example.com'
+    assert result.source_url == 'http://fast.example.com/'
+    assert elapsed < 1.0
+    assert fetcher.active['slow.example.com'] == 1  # Left to finish in the background
+
+
+SLOW_SITE = {'/': (200, FILLER + '<a href="/contact">Contact</a>', {}), '/slow': (200, FILLER, {})}
+
+
+def test_returns_within_total_timeout_from_a_slow_server():
+    with FixtureServer(SLOW_SITE, delay={'/slow': 3.0}) as server:
+        enricher = AsyncEnricher(fetcher=HttpFetcher(timeout=10), page_timeout=10, total_timeout=0.5)
+        try:
+            start = time.monotonic()
+            result = enricher.find_email([server.url('/slow')])
+            elapsed = time.monotonic() - start
+        finally:
+            enricher.close()
+
+    assert result.email is None
+    assert elapsed < 1.5
+
+
+def test_page_timeout_frees_the_caller_while_the_request_runs_on():
+    with FixtureServer(SLOW_SITE, delay={'/slow': 3.0}) as server:
+        enricher = AsyncEnricher(fetcher=HttpFetcher(timeout=10), page_timeout=0.3, total_timeout=10)
+        try:
+            start = time.monotonic()
+            result = enricher.find_email([server.url('/slow'), server.url('/')])
+            elapsed = time.monotonic() - start
+        finally:
+            enricher.close()
+
+    # The home page was scanned and its contact page (a 404 here) tried, without waiting out /slow
+    assert result.pages_fetched == 1
+    assert elapsed < 1.5
+
+
+def test_follows_subpages_and_counts_them():
+    pages = {
+        'http://acme.example.com/': FILLER + '<a href="/about">About</a><a href="/contact">Contact us</a>',
+        'http://acme.example.com/contact': FILLER + '<a href="mailto:sales@acme.example.com">Mail</a>',
+    }
+    enricher = AsyncEnricher(fetcher=FakeFetcher(pages))
+    try:
+        result = enricher.find_email(['http://acme.example.com/'])
+    finally:
+        enricher.close()
+
+    assert result.email == 'sales@acme.example.com'
+    assert result.source_url == 'http://acme.example.com/contact'
+    assert result.pages_fetched >= 2
+
+
+def test_reports_sites_that_need_javascript():
+    pages = {'http://app.example.com/': '<div id="root"></div>'}
+    enricher = AsyncEnricher(fetcher=FakeFetcher(pages))
+    try:
+        result = enricher.find_email(['http://app.example.com/'])
+    finally:
+        enricher.close()
+
+    assert result.email is None
+    assert result.js_sites == ['http://app.example.com/']
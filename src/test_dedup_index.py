@@ -0,0 +1,121 @@
+from datetime import datetime, timedelta
+import pytest
+from src.fakes import make_lead
+from src.utils.dedup_index import BloomFilter, DedupIndex, lead_already_held, normalize_company
+from src.utils.lead_store import LeadStore, leads_table
+from src.utils.scrape_history import OUTCOME_LEAD, ScrapeHistory
+
+DAY = 86400
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LeadStore(url=f"sqlite:///{tmp_path / 'leads.db'}")
+    store.upsert([make_lead('Acme Inc.', 'Sales@Acme.com', 'https://www.acme.com/about')])
+    yield store
+    store.close()
+
+
+def make_index(store, tmp_path, use_bloom=False):
+    return DedupIndex(store, path=str(tmp_path / 'dedup.bloom'), use_bloom=use_bloom, capacity=1000)
+
+
+def age_lead(store, name, seconds):
+    with store.engine.begin() as conn:
+        conn.execute(leads_table.update().where(leads_table.c.name == name).values(
+            updated_at=datetime.now() - timedelta(seconds=seconds)
+        ))
+
+
+def test_company_names_ignore_case_punctuation_and_legal_suffix():
+    assert normalize_company('ACME, Inc.') == normalize_company('acme') == 'acme'
+    assert normalize_company('Company') == 'company'  # A suffix alone is still a name
+
+
+@pytest.mark.parametrize('use_bloom', [False, True])
+def test_index_answers_for_stored_and_added_leads(store, tmp_path, use_bloom):
+    index = make_index(store, tmp_path, use_bloom)
+
+    assert index.has_email('sales@acme.com')
+    assert index.has_company('ACME')
+    assert index.has_domain('http://acme.com')
+    assert not index.has_company('Globex')
+
+    index.add_lead(make_lead('Globex LLC', 'info@globex.com', 'https://globex.com'))
+    assert index.has_company('globex')
+    assert index.has_email('INFO@globex.com')
+
+
+def test_bloom_snapshot_reads_only_newer_leads(store, tmp_path):
+    index = make_index(store, tmp_path, use_bloom=True)
+    index.save()
+    store.upsert([make_lead('Globex', 'info@globex.com')])
+
+    reloaded = make_index(store, tmp_path, use_bloom=True)
+
+    assert reloaded.has_company('Acme') and reloaded.has_company('Globex')
+    assert len(reloaded) == len(index) + 2  # Globex's email and company, no website
+
+
+def test_corrupt_bloom_snapshot_is_rebuilt_from_the_store(store, tmp_path):
+    (tmp_path / 'dedup.bloom').write_bytes(b'not a snapshot')
+
+    index = make_index(store, tmp_path, use_bloom=True)
+
+    assert index.has_company('Acme')
+
+
+def test_bloom_filter_holds_its_error_rate():
+    bloom = BloomFilter(capacity=2000, error_rate=0.01)
+    for i in range(2000):
+        bloom.add(f'company:held {i}')
+
+    assert all(f'company:held {i}' in bloom for i in range(2000))
+    false_positives = sum(f'company:new {i}' in bloom for i in range(2000))
+    assert false_positives < 2000 * 0.03
+
+
+def test_held_lead_follows_history_when_there_is_a_record(store, tmp_path):
+    index = make_index(store, tmp_path)
+    history = ScrapeHistory(path=str(tmp_path / 'history.json'), leads_file=str(tmp_path / 'missing.csv'))
+    history.record('Acme Inc.', OUTCOME_LEAD, email='sales@acme.com')
+
+    assert lead_already_held(index, 'Acme Inc.', history, fresh_ttl=7 * DAY)
+
+    history.get('Acme Inc.').last_success -= 8 * DAY
+    assert not lead_already_held(index, 'Acme Inc.', history, fresh_ttl=7 * DAY)
+
+
+@pytest.mark.parametrize('use_bloom', [False, True])
+def test_held_lead_without_history_uses_the_last_refresh(store, tmp_path, use_bloom):
+    assert lead_already_held(make_index(store, tmp_path, use_bloom), 'Acme Inc.', None, fresh_ttl=7 * DAY)
+
+    age_lead(store, 'Acme Inc.', 8 * DAY)
+    assert not lead_already_held(make_index(store, tmp_path, use_bloom), 'Acme Inc.', None, fresh_ttl=7 * DAY)
+
+
+@pytest.mark.parametrize('use_bloom', [False, True])
+def test_held_lead_matches_other_spellings_of_the_company(store, tmp_path, use_bloom):
+    index = make_index(store, tmp_path, use_bloom)
+
+    assert lead_already_held(index, 'ACME', None, fresh_ttl=7 * DAY)
+
+    index.add_lead(make_lead('Globex LLC', 'info@globex.com'))
+    assert lead_already_held(index, 'globex', None, fresh_ttl=7 * DAY)
+
+
+def test_bloom_snapshot_falls_back_to_the_store_for_refresh_times(store, tmp_path):
+    make_index(store, tmp_path, use_bloom=True).save()
+
+    reloaded = make_index(store, tmp_path, use_bloom=True)  # Acme comes from the snapshot, without a time
+
+    assert reloaded.last_refreshed('Acme Inc.') is None
+    assert lead_already_held(reloaded, 'Acme Inc.', None, fresh_ttl=7 * DAY)
+
+
+def test_index_hit_without_a_stored_lead_is_not_held(store, tmp_path):
+    index = make_index(store, tmp_path, use_bloom=True)
+    index._bloom.add('company:initech')  # Stands in for a Bloom false positive
+
+    assert index.has_company('Initech')
+    assert not lead_already_held(index, 'Initech', None, fresh_ttl=7 * DAY)
@@ -0,0 +1,96 @@
+import pytest
+from src.fakes import PROXY_A as PROXY, FakeDriver
+from src.utils import driver_pool
+from src.utils.driver_pool import DriverPool
+
+
+@pytest.fixture(autouse=True)
+def fake_chrome(monkeypatch):
+    monkeypatch.setattr(driver_pool, 'create_driver', FakeDriver)
+
+
+def live(pool):
+    return pool._size()
+
+
+def test_checkin_then_checkout_reuses_the_driver():
+    pool = DriverPool(max_size=2)
+    driver = pool.checkout(PROXY)
+    pool.checkin(driver)
+
+    assert pool.checkout(PROXY) is driver
+    assert pool.stats == {'created': 1, 'reused': 1, 'recycled': 0}
+
+
+def test_unhealthy_and_worn_out_drivers_are_recycled():
+    pool = DriverPool(max_size=2, max_uses=2)
+    driver = pool.checkout()
+    pool.checkin(driver, healthy=False)
+    assert driver.quit_called
+
+    driver = pool.checkout()
+    pool.checkin(driver)
+    driver.alive = False
+    replacement = pool.checkout()
+    assert replacement is not driver and driver.quit_called
+
+    pool.checkin(replacement)
+    pool.checkin(pool.checkout())  # Second use wears it out
+    assert replacement.quit_called
+
+
+def test_checkout_waits_for_a_free_slot():
+    pool = DriverPool(max_size=1)
+    pool.checkout()
+    with pytest.raises(TimeoutError):
+        pool.checkout(PROXY, timeout=0.1)
+
+
+def test_adopt_retires_an_idle_driver_to_stay_within_max_size():
+    pool = DriverPool(max_size=2)
+    busy = pool.checkout()
+    idle = pool.checkout()
+    pool.checkin(idle)
+
+    spare = FakeDriver(PROXY)
+    assert pool.adopt(spare, PROXY)
+
+    assert idle.quit_called
+    assert live(pool) == 2
+    pool.checkin(spare)
+    pool.checkin(busy)
+    assert live(pool) == 2
+
+
+def test_adopt_is_refused_when_every_slot_is_busy():
+    pool = DriverPool(max_size=2)
+    first, second = pool.checkout(), pool.checkout()
+
+    spare = FakeDriver(PROXY)
+    assert not pool.adopt(spare, PROXY)
+
+    assert not spare.quit_called  # Left to the caller
+    assert live(pool) == 2
+    assert not first.quit_called and not second.quit_called
+
+
+def test_checkin_never_parks_more_than_max_size():
+    pool = DriverPool(max_size=1)
+    pooled = pool.checkout()
+    pool._in_use[id('stray')] = driver_pool._PooledDriver(driver=FakeDriver(), key='direct')
+
+    pool.checkin(pooled)
+
+    assert pooled.quit_called
+    assert live(pool) == 1
+
+
+def test_close_quits_idle_drivers():
+    pool = DriverPool(max_size=2)
+    driver = pool.checkout()
+    pool.checkin(driver)
+    pool.close()
+
+    assert driver.quit_called
+    with pytest.raises(RuntimeError):
+        pool.checkout()
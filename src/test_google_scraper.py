@@ -1,7 +1,6 @@
 import os
 from src.utils.logger import setup_logger
 from src.scrapers.google_company_scraper import GoogleCompanyScraper
-import pandas as pd
 
 logger = setup_logger("test_google_scraper")
 
@@ -48,18 +47,15 @@ def test_google_scraping():
             # Clean and save the leads
             cleaned_leads = scraper.clean_data(leads)
             scraper.save_data(cleaned_leads)
-            logger.info(f"\nSaved {len(cleaned_leads)} leads to data/google_leads.csv")
+            logger.info(f"\nSaved {len(cleaned_leads)} leads to {scraper.lead_store.url}")
             
             # Verify saved data
-            if os.path.exists('data/google_leads.csv'):
-                df = pd.read_csv('data/google_leads.csv')
-                logger.info(f"\nVerifying saved data:")
-                logger.info(f"Number of saved leads: {len(df)}")
-                logger.info(f"Columns: {df.columns.tolist()}")
-                logger.info("\nFirst few saved leads:")
-                print(df.head().to_string())
-            else:
-                logger.error("CSV file not found after saving!")
+            df = scraper.lead_store.to_dataframe()
+            logger.info(f"\nVerifying saved data:")
+            logger.info(f"Number of saved leads: {len(df)}")
+            logger.info(f"Columns: {df.columns.tolist()}")
+            logger.info("\nFirst few saved leads:")
+            print(df.head().to_string())
         else:
             logger.warning("No leads found!")
             
@@ -0,0 +1,101 @@
+import gzip
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+from src.utils.http_cache import SelectiveGZipMiddleware, cache_headers, etag_matches, make_etag, not_modified
+
+BIG_TEXT = 'lead ' * 500  # Well over the middleware's minimum size
+
+
+def request_with(**headers):
+    raw = [(name.replace('_', '-').encode(), value.encode()) for name, value in headers.items()]
+    return Request({'type': 'http', 'method': 'GET', 'path': '/', 'headers': raw})
+
+
+def test_etag_is_weak_and_follows_its_parts():
+    etag = make_etag('index', 3, 120)
+
+    assert etag.startswith('W/"') and etag == make_etag('index', 3, 120)
+    assert etag != make_etag('index', 4, 120)
+
+
+@pytest.mark.parametrize('header, matches', [
+    (None, False),
+    ('W/"abc"', True),
+    ('"abc"', True),  # Weak comparison ignores the W/ prefix
+    ('"xyz", W/"abc"', True),
+    ('*', True),
+    ('"xyz"', False),
+])
+def test_etag_matches_if_none_match(header, matches):
+    request = request_with(if_none_match=header) if header else request_with()
+    assert etag_matches(request, 'W/"abc"') is matches
+
+
+def test_not_modified_carries_the_validator_without_a_body():
+    response = not_modified('W/"abc"')
+
+    assert response.status_code == 304 and response.body == b''
+    assert response.headers['etag'] == 'W/"abc"'
+    assert response.headers['cache-control'] == 'no-cache'
+    assert cache_headers(Response('x'), 'W/"abc"').headers['etag'] == 'W/"abc"'
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(SelectiveGZipMiddleware, exclude=('/excluded',))
+
+    @app.get('/html')
+    def html():
+        return HTMLResponse(BIG_TEXT)
+
+    @app.get('/json')
+    def json():
+        return JSONResponse({'leads': [BIG_TEXT]})
+
+    @app.get('/small')
+    def small():
+        return HTMLResponse('<p>tiny</p>')
+
+    @app.get('/events')
+    def events():
+        return StreamingResponse(iter([f'data: {BIG_TEXT}\n\n']), media_type='text/event-stream')
+
+    @app.get('/download')
+    def download():
+        return Response(gzip.compress(BIG_TEXT.encode()), media_type='application/gzip')
+
+    @app.get('/excluded')
+    def excluded():
+        return HTMLResponse(BIG_TEXT)
+
+    @app.get('/streamed')
+    def streamed():
+        return StreamingResponse(iter([BIG_TEXT, BIG_TEXT]), media_type='text/csv')
+
+    return TestClient(app)
+
+
+@pytest.mark.parametrize('path, compressed', [
+    ('/html', True),
+    ('/json', True),
+    ('/streamed', True),
+    ('/small', False),
+    ('/events', False),
+    ('/download', False),
+    ('/excluded', False),
+])
+def test_gzip_only_for_text_outside_excluded_paths(client, path, compressed):
+    response = client.get(path, headers={'Accept-Encoding': 'gzip'})
+
+    assert response.status_code == 200
+    assert (response.headers.get('content-encoding') == 'gzip') is compressed
+
+
+def test_gzip_needs_the_client_to_accept_it(client):
+    response = client.get('/html', headers={'Accept-Encoding': 'identity'})
+
+    assert 'content-encoding' not in response.headers
+    assert response.text == BIG_TEXT
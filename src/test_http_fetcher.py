@@ -0,0 +1,101 @@
+import pytest
+from src.fakes import FixtureServer
+from src.utils.http_fetcher import HttpFetcher
+from src.utils.response_cache import ResponseCache
+
+
+class RecordingLimiter:
+    """Rate limiter stand-in that keeps each report as (kind, url)"""
+
+    def __init__(self):
+        self.reports = []
+
+    def acquire(self, url):
+        return 0
+
+    def report_block(self, url):
+        self.reports.append(('block', url))
+
+    def report_success(self, url):
+        self.reports.append(('success', url))
+
+    def report_error(self, url):
+        self.reports.append(('error', url))
+
+
+def conditional(headers):
+    if headers.get('If-None-Match') == '"v1"':
+        return 304, '', {'ETag': '"v1"'}
+    return 200, '<p>Contact us</p>', {'ETag': '"v2"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}
+
+
+@pytest.fixture
+def site():
+    pages = {
+        '/': (200, '<p>Welcome</p>', {'ETag': '"home"'}),
+        '/forbidden': (403, 'Forbidden', {}),
+        '/slow-down': (429, 'Too many requests', {}),
+        '/unavailable': (503, 'Unavailable', {}),
+        '/missing': (404, 'Not found', {}),
+        '/data.json': (200, '{"email": "a@b.com"}', {'Content-Type': 'application/json'}),
+        '/contact': (200, conditional, {}),
+    }
+    with FixtureServer(pages) as server:
+        yield server
+
+
+@pytest.mark.parametrize('path', ['/forbidden', '/slow-down', '/unavailable'])
+def test_block_statuses_are_reported_as_blocks(site, path):
+    limiter = RecordingLimiter()
+    page = HttpFetcher(rate_limiter=limiter).fetch(site.url(path))
+
+    assert page.status_code in (403, 429, 503)
+    assert limiter.reports == [('block', site.url(path))]
+
+
+def test_other_statuses_count_as_success(site):
+    limiter = RecordingLimiter()
+    fetcher = HttpFetcher(rate_limiter=limiter)
+
+    assert fetcher.fetch(site.url('/')).html == '<p>Welcome</p>'
+    assert fetcher.fetch(site.url('/missing')).status_code == 404
+    assert [kind for kind, url in limiter.reports] == ['success', 'success']
+
+
+def test_connection_errors_are_reported_as_errors():
+    limiter = RecordingLimiter()
+    with FixtureServer() as server:
+        url = server.url('/')
+    # The server is shut down, so the connection is refused
+
+    assert HttpFetcher(rate_limiter=limiter, timeout=2).fetch(url) is None
+    assert limiter.reports == [('error', url)]
+
+
+def test_non_html_bodies_are_dropped(site):
+    page = HttpFetcher().fetch(site.url('/data.json'))
+    assert page.status_code == 200 and page.html == ''
+
+
+def test_revalidate_sends_validators_and_reads_304(site):
+    fetcher = HttpFetcher()
+
+    unchanged = fetcher.revalidate(site.url('/contact'), etag='"v1"', last_modified='Mon, 01 Jan 2024 00:00:00 GMT')
+    changed = fetcher.revalidate(site.url('/contact'), etag='"v0"')
+
+    assert unchanged.status_code == 304
+    assert changed.status_code == 200 and changed.etag == '"v2"'
+    sent = site.requests[0][1]
+    assert sent['If-None-Match'] == '"v1"'
+    assert sent['If-Modified-Since'] == 'Mon, 01 Jan 2024 00:00:00 GMT'
+
+
+def test_revalidate_bypasses_the_cache(site, tmp_path):
+    cache = ResponseCache(cache_dir=str(tmp_path / 'cache'))
+    fetcher = HttpFetcher(cache=cache)
+    fetcher.fetch(site.url('/'))
+    fetcher.fetch(site.url('/'))
+    assert len(site.requests) == 1  # Second fetch came from the cache
+
+    fetcher.revalidate(site.url('/'), etag='"home"')
+    assert len(site.requests) == 2
@@ -0,0 +1,76 @@
+import os
+from datetime import date, datetime
+import pytest
+from src.fakes import make_lead
+from src.utils.lead_store import LeadStore
+
+pytest.importorskip('pyarrow')
+from src.utils.lead_archive import LeadArchive  # noqa: E402
+
+MONDAY = datetime(2026, 3, 2, 9, 0)
+TUESDAY = datetime(2026, 3, 3, 9, 0)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LeadStore(url=f"sqlite:///{tmp_path / 'leads.db'}")
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return LeadArchive(str(tmp_path / 'archive'))
+
+
+def modified(archive, day):
+    return os.stat(archive._partition_path(day)).st_mtime_ns
+
+
+def test_compaction_partitions_leads_by_scrape_date(store, archive):
+    store.upsert([make_lead('Acme', 'a@acme.com', timestamp=MONDAY),
+                  make_lead('Globex', 'a@globex.com', timestamp=TUESDAY)])
+
+    assert archive.compact(store) == 2
+
+    assert archive.partitions() == [MONDAY.date(), TUESDAY.date()]
+    assert list(archive.read(columns=['name'], start=TUESDAY.date())['name']) == ['Globex']
+
+
+def test_compaction_resumes_from_the_watermark(store, archive):
+    store.upsert([make_lead('Acme', 'a@acme.com', timestamp=MONDAY)])
+    archive.compact(store)
+
+    assert archive.compact(store) == 0  # Nothing changed since the last run
+
+    store.upsert([make_lead('Globex', 'a@globex.com', timestamp=MONDAY)])
+    assert archive.compact(store) == 1
+    assert sorted(archive.read(columns=['name'])['name']) == ['Acme', 'Globex']
+
+
+def test_compaction_rewrites_only_touched_partitions(store, archive):
+    store.upsert([make_lead('Acme', 'a@acme.com', timestamp=MONDAY),
+                  make_lead('Globex', 'a@globex.com', timestamp=TUESDAY)])
+    archive.compact(store)
+    monday = modified(archive, MONDAY.date())
+
+    store.upsert([make_lead('Initech', 'a@initech.com', timestamp=TUESDAY)])
+    archive.compact(store)
+
+    assert modified(archive, MONDAY.date()) == monday
+    assert len(archive.read(columns=['name'], start=TUESDAY.date())) == 2
+
+
+def test_refreshed_lead_is_read_once_from_its_newest_row(store, archive):
+    store.upsert([make_lead('Acme', 'a@acme.com', location='Berlin', timestamp=MONDAY)])
+    archive.compact(store)
+
+    store.upsert([make_lead('Acme', 'a@acme.com', location='Munich', timestamp=TUESDAY)])
+    assert archive.compact(store) == 1
+
+    assert archive.read(columns=['name', 'location']).to_dict('records') == [{'name': 'Acme', 'location': 'Munich'}]
+    assert len(archive.read(columns=['name'], latest_only=False)) == 2  # The Monday row is still archived
+
+
+def test_reading_an_empty_archive(archive):
+    assert archive.read(columns=['name'], start=date(2026, 1, 1)).empty
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+import pytest
+from src.fakes import make_lead
+from src.utils.lead_store import LeadStore
+
+SAME_TIME = datetime(2026, 1, 1, 12, 0)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LeadStore(url=f"sqlite:///{tmp_path / 'leads.db'}", batch_size=4)
+    yield store
+    store.close()
+
+
+def test_reupsert_refreshes_without_duplicating_or_blanking(store):
+    store.upsert([make_lead('Acme', 'Info@Acme.com', website='https://acme.com', description='Builds things',
+                            location='Berlin')])
+    store.upsert([make_lead('Acme', 'info@acme.com', website=None, description='', location='Munich')])
+
+    assert store.count() == 1
+    [row], _ = store.query(columns=['name', 'email', 'website', 'description', 'location'])
+    assert row == {'name': 'Acme', 'email': 'info@acme.com', 'website': 'https://acme.com',
+                   'description': 'Builds things', 'location': 'Munich'}
+
+
+def test_one_upsert_spanning_statements_keeps_the_last_copy(store):
+    leads = [make_lead(f'Company {i}', f'info@company{i}.com') for i in range(10)]
+    leads.append(make_lead('Company 3', 'info@company3.com', location='Paris'))
+
+    assert store.upsert(leads) == 10  # Three statements of batch_size 4, one transaction
+
+    rows = {row['name']: row for row in store.stream(columns=['name', 'location'])}
+    assert len(rows) == 10 and rows['Company 3']['location'] == 'Paris'
+
+
+def page_through(store, **options):
+    seen, after = [], None
+    while True:
+        rows, after = store.query(columns=['name'], limit=7, after=after, **options)
+        seen.extend(row['name'] for row in rows)
+        if after is None:
+            return seen
+
+
+@pytest.mark.parametrize('sort', ['timestamp', 'updated_at'])
+@pytest.mark.parametrize('descending', [True, False])
+def test_keyset_pages_have_no_gaps_or_repeats_on_equal_keys(store, sort, descending):
+    # Every lead shares one timestamp and one upsert (so one updated_at); only id breaks the ties
+    store.upsert([make_lead(f'Company {i:02}', f'info@company{i}.com', timestamp=SAME_TIME) for i in range(25)])
+
+    names = page_through(store, sort=sort, descending=descending)
+
+    assert len(names) == 25 and len(set(names)) == 25
+    assert names == sorted(names, reverse=descending)  # Names follow insertion, as id does
+
+
+def test_filters_narrow_pages(store):
+    store.upsert([
+        make_lead('Old', 'a@old.com', website='https://www.old.com', timestamp=SAME_TIME - timedelta(days=2)),
+        make_lead('New', 'a@new.com', timestamp=SAME_TIME),
+    ])
+
+    assert page_through(store, since=SAME_TIME - timedelta(days=1)) == ['New']
+    assert page_through(store, until=SAME_TIME) == ['Old']
+    assert page_through(store, domain='old.com') == ['Old']
+    assert page_through(store, has_website=False) == ['New']
+
+
+def test_query_rejects_unsorted_columns(store):
+    with pytest.raises(ValueError):
+        store.query(sort='email')
+
+
+def test_iter_changes_returns_rows_touched_since(store):
+    store.upsert([make_lead('Acme', 'a@acme.com'), make_lead('Globex', 'a@globex.com')])
+    watermark = max(row['updated_at'] for row in store.iter_changes())
+    store.upsert([make_lead('Globex', 'a@globex.com', location='Springfield')])
+
+    assert [row['name'] for row in store.iter_changes(updated_after=watermark)] == ['Globex']
+
+
+def test_csv_round_trip(store, tmp_path):
+    store.upsert([
+        make_lead('Acme', 'a@acme.com', website='https://acme.com', description='Builds, "things"',
+                  timestamp=SAME_TIME),
+        make_lead('Globex', 'a@globex.com', timestamp=SAME_TIME + timedelta(minutes=1)),
+    ])
+    path = str(tmp_path / 'leads.csv')
+    assert store.export_csv(path) == 2
+
+    copy = LeadStore(url=f"sqlite:///{tmp_path / 'copy.db'}", import_csv=path)
+    try:
+        assert copy.to_dataframe().to_dict('records') == store.to_dataframe().to_dict('records')
+    finally:
+        copy.close()
@@ -0,0 +1,172 @@
+import json
+import threading
+import pytest
+from src.fakes import make_lead
+from src.utils import lead_writer
+from src.utils.activity_counters import ActivityCounters
+from src.utils.lead_store import LeadStore
+from src.utils.lead_writer import LeadWriter
+from src.utils.metrics import LEADS_SAVED_TOTAL
+
+
+def lead(i):
+    return make_lead(f'Company {i}', f'info@company{i}.example.com')
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LeadStore(url=f"sqlite:///{tmp_path / 'leads.db'}")
+    yield store
+    store.close()
+
+
+class FlakyStore:
+    """Records each batch it is handed and fails the first few commits"""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.batches = []
+
+    def upsert(self, leads):
+        leads = list(leads)
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("database is locked")
+        self.batches.append(leads)
+        return len(leads)
+
+
+def test_full_batches_commit_together():
+    store = FlakyStore()
+    writer = LeadWriter(store, batch_size=3, flush_interval=60)
+    try:
+        writer.submit_many([lead(i) for i in range(6)])
+        assert writer.flush(timeout=5)
+    finally:
+        writer.close()
+
+    assert [len(batch) for batch in store.batches] == [3, 3]
+    assert writer.stats()['batches'] == 2
+
+
+def test_partial_batch_commits_after_flush_interval():
+    store = FlakyStore()
+    writer = LeadWriter(store, batch_size=50, flush_interval=0.05)
+    try:
+        writer.submit(lead(0))
+        assert writer.flush(timeout=5)
+    finally:
+        writer.close()
+
+    assert [len(batch) for batch in store.batches] == [1]
+
+
+def test_failed_commit_is_retried(monkeypatch):
+    monkeypatch.setattr(lead_writer.time, 'sleep', lambda seconds: None)
+    store = FlakyStore(failures=2)
+    writer = LeadWriter(store, batch_size=2, flush_interval=60)
+    try:
+        writer.submit_many([lead(0), lead(1)])
+        assert writer.flush(timeout=5)
+    finally:
+        writer.close()
+
+    assert [len(batch) for batch in store.batches] == [2]
+    stats = writer.stats()
+    assert stats['failures'] == 2
+    assert stats['written'] == 2 and stats['pending'] == 0
+
+
+def test_flush_times_out_while_the_store_is_down():
+    release = threading.Event()
+
+    class StuckStore:
+        def upsert(self, leads):
+            release.wait()
+            return 0
+
+    writer = LeadWriter(StuckStore(), batch_size=1, flush_interval=60)
+    writer.submit(lead(0))
+    try:
+        assert not writer.flush(timeout=0.1)
+    finally:
+        release.set()
+        writer.close()
+
+
+def test_resubmitted_leads_are_counted_once(store):
+    counters = ActivityCounters(path=None)
+    before = LEADS_SAVED_TOTAL.value()
+    writer = LeadWriter(store, batch_size=2, flush_interval=0.05, counters=counters)
+    leads = [lead(0), lead(1)]
+    try:
+        writer.submit_many(leads)  # Queued in real time as each lead is found
+        writer.flush(timeout=5)
+        writer.submit_many(leads + [lead(2)])  # And again by save_data at the end of the run
+        writer.flush(timeout=5)
+    finally:
+        writer.close()
+
+    assert store.count() == 3
+    assert LEADS_SAVED_TOTAL.value() - before == 3
+    assert counters.totals(3600)['leads'] == 3
+
+
+def test_upsert_counts_only_new_rows(store):
+    assert store.upsert([lead(0), lead(1)]) == 2
+    assert store.upsert([lead(1), lead(2)]) == 1
+    # Same name under another email is a different lead
+    assert store.upsert([make_lead('Company 0', 'sales@company0.example.com')]) == 1
+    assert store.count() == 4
+
+
+class BadRowStore(FlakyStore):
+    """Refuses any commit that holds one of the bad companies"""
+
+    def __init__(self, *bad_names):
+        super().__init__()
+        self.bad_names = set(bad_names)
+
+    def upsert(self, leads):
+        leads = list(leads)
+        if any(lead.name in self.bad_names for lead in leads):
+            raise RuntimeError("CHECK constraint failed")
+        return super().upsert(leads)
+
+
+def test_batch_is_split_after_the_last_attempt(monkeypatch, tmp_path):
+    monkeypatch.setattr(lead_writer.time, 'sleep', lambda seconds: None)
+    store = BadRowStore('Company 1')
+    dead_letters = tmp_path / 'failed' / 'leads.jsonl'
+    writer = LeadWriter(store, batch_size=3, flush_interval=60, max_attempts=3,
+                        dead_letter_file=str(dead_letters))
+    try:
+        writer.submit_many([lead(0), lead(1), lead(2)])
+        assert writer.flush(timeout=5)
+    finally:
+        writer.close()
+
+    assert [[lead.name for lead in batch] for batch in store.batches] == [['Company 0'], ['Company 2']]
+    assert [json.loads(line)['name'] for line in dead_letters.read_text().splitlines()] == ['Company 1']
+    stats = writer.stats()
+    assert stats['failures'] == 4 and stats['dead_lettered'] == 1  # Three batch attempts, one refused lead
+    assert stats['written'] == 3 and stats['pending'] == 0
+
+
+def test_writer_moves_on_when_the_store_always_fails(monkeypatch, tmp_path):
+    monkeypatch.setattr(lead_writer.time, 'sleep', lambda seconds: None)
+    store = BadRowStore('Company 0', 'Company 1', 'Company 2', 'Company 3')
+    dead_letters = tmp_path / 'leads.jsonl'
+    writer = LeadWriter(store, batch_size=2, flush_interval=60, max_attempts=2,
+                        dead_letter_file=str(dead_letters))
+    try:
+        writer.submit_many([lead(0), lead(1)])
+        assert writer.flush(timeout=5)
+        writer.submit_many([lead(2), lead(3)])
+        assert writer.flush(timeout=5)  # The second batch is not stuck behind the first
+    finally:
+        writer.close()
+
+    assert store.batches == []
+    assert len(dead_letters.read_text().splitlines()) == 4
+    assert writer.stats()['dead_lettered'] == 4
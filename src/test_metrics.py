@@ -0,0 +1,122 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from fastapi.testclient import TestClient
+from src.config import Config
+from src.utils.metrics import MetricsExporter, MetricsRegistry, read_metrics_snapshots
+from src.web.app import app
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Stands in for `main.py --role scraper`: records scraper-side series, then exits
+SCRAPER_PROCESS = """
+from src.utils.metrics import PROXY_CHECKS_TOTAL, PROXY_ROTATIONS_TOTAL, SERP_LOAD_SECONDS, export_metrics
+export_metrics()
+SERP_LOAD_SECONDS.observe(0.3)
+SERP_LOAD_SECONDS.observe(7.0)
+PROXY_ROTATIONS_TOTAL.inc(2)
+PROXY_CHECKS_TOTAL.inc(source='manager', result='ok')
+"""
+
+
+def sample(text, line_prefix):
+    """Value of the exposition line that starts with line_prefix, 0 when there is none"""
+    for line in text.splitlines():
+        if line.startswith(line_prefix + ' '):
+            return float(line.rsplit(' ', 1)[1])
+    return 0.0
+
+
+def test_web_tier_serves_series_recorded_by_a_separate_scraper(monkeypatch, tmp_path):
+    metrics_dir = str(tmp_path / 'metrics')
+    monkeypatch.setattr(Config, 'METRICS_DIR', metrics_dir)
+    client = TestClient(app)
+    before = client.get('/metrics').text
+
+    subprocess.run([sys.executable, '-c', SCRAPER_PROCESS], cwd=ROOT, check=True, timeout=60,
+                   env={**os.environ, 'METRICS_DIR': metrics_dir})
+    after = client.get('/metrics').text
+
+    assert sample(after, 'proxy_rotations_total') - sample(before, 'proxy_rotations_total') == 2
+    checks = 'proxy_checks_total{source="manager",result="ok"}'
+    assert sample(after, checks) - sample(before, checks) == 1
+    assert sample(after, 'scraper_serp_load_seconds_count') - sample(before, 'scraper_serp_load_seconds_count') == 2
+    bucket = 'scraper_serp_load_seconds_bucket{le="0.5"}'
+    assert sample(after, bucket) - sample(before, bucket) == 1
+
+
+def export_from_other_process(registry, directory):
+    exporter = MetricsExporter(registry, directory)
+    exporter.pid = 12345
+    exporter.path = os.path.join(directory, '12345.json')
+    exporter.flush()
+    return exporter
+
+
+def make_registry():
+    registry = MetricsRegistry()
+    counter = registry.counter('jobs_total', 'Jobs', ['kind'])
+    gauge = registry.gauge('queue_depth', 'Queued')
+    histogram = registry.histogram('job_seconds', 'Job time', buckets=(1.0, 10.0))
+    return registry, counter, gauge, histogram
+
+
+def test_snapshots_add_up_counters_and_histograms(tmp_path):
+    scraper, jobs, depth, seconds = make_registry()
+    jobs.inc(3, kind='serp')
+    depth.set(4)
+    seconds.observe(0.5)
+    seconds.observe(5.0)
+    export_from_other_process(scraper, str(tmp_path))
+
+    web, jobs, _, seconds = make_registry()
+    jobs.inc(1, kind='serp')
+    seconds.observe(20.0)
+    text = web.render(read_metrics_snapshots(str(tmp_path)))
+
+    assert sample(text, 'jobs_total{kind="serp"}') == 4
+    assert sample(text, 'queue_depth') == 4
+    assert sample(text, 'job_seconds_bucket{le="1.0"}') == 1
+    assert sample(text, 'job_seconds_bucket{le="+Inf"}') == 3
+    assert sample(text, 'job_seconds_sum') == 25.5
+
+
+def test_gauges_of_exited_processes_are_dropped(tmp_path):
+    scraper, jobs, depth, _ = make_registry()
+    jobs.inc(kind='serp')
+    depth.set(4)
+    exporter = export_from_other_process(scraper, str(tmp_path))
+    long_ago = time.time() - 600
+    os.utime(exporter.path, (long_ago, long_ago))
+
+    text = make_registry()[0].render(read_metrics_snapshots(str(tmp_path), stale_after=60))
+
+    assert sample(text, 'jobs_total{kind="serp"}') == 1  # Its counts still belong in the totals
+    assert sample(text, 'queue_depth') == 0
+
+
+def test_own_snapshot_and_unreadable_files_are_skipped(tmp_path):
+    registry, jobs, _, _ = make_registry()
+    jobs.inc(kind='serp')
+    MetricsExporter(registry, str(tmp_path)).flush()  # This process's own file
+    (tmp_path / '99999999.json').write_text('{"pid": 99999999, "metr')
+
+    assert read_metrics_snapshots(str(tmp_path)) == []
+    assert sample(registry.render(read_metrics_snapshots(str(tmp_path))), 'jobs_total{kind="serp"}') == 1
+
+
+def test_exporter_prunes_snapshots_past_retention(tmp_path):
+    old, recent = tmp_path / '1.json', tmp_path / '2.json'
+    for path in (old, recent):
+        path.write_text(json.dumps({'pid': 1, 'metrics': {}}))
+    long_ago = time.time() - 7200
+    os.utime(old, (long_ago, long_ago))
+
+    exporter = MetricsExporter(make_registry()[0], str(tmp_path), retention=3600)
+    exporter.start()
+    exporter.close()
+
+    assert not old.exists() and recent.exists()
+    assert os.path.exists(exporter.path)
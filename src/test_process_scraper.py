@@ -0,0 +1,160 @@
+import queue
+from src.fakes import FakeDriver, FakeLeadWriter
+from src.models.lead import Lead
+from src.scrapers import google_company_scraper
+from src.utils import process_scraper, proxy_manager
+from src.utils.activity_counters import ActivityCounters
+from src.utils.metrics import REGISTRY, MetricsExporter
+from src.utils.progress_tracker import ProgressTracker
+from src.utils.run_journal import OUTCOME_SKIPPED
+from src.utils.scrape_history import OUTCOME_FAILED, OUTCOME_LEAD, OUTCOME_NO_EMAIL
+
+
+def fake_search(self, company):
+    if company == 'Boom':
+        raise RuntimeError("driver crashed")
+    if company == 'Blocked':
+        return None
+    info = {
+        'name': company, 'website': f'https://{company.lower()}.example.com',
+        'email': None, 'description': None, 'location': None
+    }
+    if company == 'Acme':
+        info['email'] = 'info@acme.example.com'
+        info['email_source'] = {'source_url': 'https://acme.example.com/contact', 'etag': '"v1"', 'last_modified': None}
+    return info
+
+
+def refuse(name):
+    def shared(*args, **kwargs):
+        raise AssertionError(f"worker process opened the shared {name}")
+    return shared
+
+
+def test_worker_reports_real_outcome_without_opening_shared_state(monkeypatch, tmp_path):
+    exporter = MetricsExporter(REGISTRY, str(tmp_path / 'metrics'))
+    monkeypatch.setattr(process_scraper, 'export_metrics', lambda: exporter)
+    monkeypatch.setattr(google_company_scraper, 'create_driver', FakeDriver)
+    monkeypatch.setattr(google_company_scraper.GoogleCompanyScraper, 'search_company', fake_search)
+    monkeypatch.setattr(google_company_scraper, 'get_lead_writer', refuse('lead writer'))
+    monkeypatch.setattr(google_company_scraper, 'get_dedup_index', refuse('dedup index'))
+    monkeypatch.setattr(google_company_scraper, 'get_progress_tracker', refuse('progress tracker'))
+    monkeypatch.setattr(proxy_manager, 'ProxyManager', lambda: None)
+
+    work, results = queue.Queue(), queue.Queue()
+    for company in ('Acme', 'NoMail', 'Blocked', 'Boom', None):
+        work.put(company)
+    process_scraper._worker_main(0, work, results, None, 1.0)
+
+    finished = {}
+    details = {}
+    events = []
+    while not results.empty():
+        kind, worker_id, payload = results.get()
+        events.append(kind)
+        if kind == 'finished':
+            company, lead, outcome, details[company], blocks = payload
+            finished[company] = (lead.email if lead else None, outcome)
+
+    assert events[-1] == 'exited'
+    assert (tmp_path / 'metrics' / f'{exporter.pid}.json').exists()  # Final snapshot written on the way out
+    assert finished == {
+        'Acme': ('info@acme.example.com', OUTCOME_LEAD),
+        'NoMail': (None, OUTCOME_NO_EMAIL),
+        'Blocked': (None, OUTCOME_FAILED),
+        'Boom': (None, OUTCOME_FAILED),
+    }
+    # The same history fields a scraper thread records, website included when no email was found
+    assert details['Acme']['source_url'] == 'https://acme.example.com/contact'
+    assert details['Acme']['website'] == 'https://acme.example.com'
+    assert details['NoMail'] == {'email': None, 'website': 'https://nomail.example.com'}
+    assert details['Blocked'] == {} and details['Boom'] == {}
+
+
+class FakeHistory:
+    def __init__(self):
+        self.recorded = {}
+        self.details = {}
+
+    def get(self, company):
+        return None
+
+    def record(self, company, outcome, **details):
+        self.recorded[company] = outcome
+        self.details[company] = details
+
+
+class FakeJournal:
+    def __init__(self):
+        self.finished_outcomes = {}
+
+    def started(self, company):
+        pass
+
+    def finished(self, company, outcome):
+        self.finished_outcomes[company] = outcome
+
+
+class FakeDedupIndex:
+    def has_company(self, name):
+        return False
+
+    def add_lead(self, lead):
+        pass
+
+
+def test_parent_records_outcomes_sent_by_workers(monkeypatch, tmp_path):
+    lead = Lead(name='Acme', email='info@acme.example.com', platform='google', category='business')
+    events = [
+        ('started', 0, 'Acme'), ('finished', 0, ('Acme', lead, OUTCOME_LEAD, {
+            'email': lead.email, 'website': None, 'source_url': 'https://acme.example.com/contact', 'etag': '"v1"'
+        }, 0)),
+        ('started', 1, 'NoMail'), ('finished', 1, (
+            'NoMail', None, OUTCOME_NO_EMAIL, {'email': None, 'website': 'https://nomail.example.com'}, 0
+        )),
+        ('started', 0, 'Blocked'), ('finished', 0, ('Blocked', None, OUTCOME_FAILED, {}, 2)),
+    ]
+    monkeypatch.setattr(process_scraper, 'iter_process_scrape', lambda companies, num, mode=None: iter(events))
+    monkeypatch.setattr(process_scraper, 'get_dedup_index', FakeDedupIndex)
+    monkeypatch.setattr(process_scraper, 'get_progress_tracker',
+                        lambda: ProgressTracker(str(tmp_path / 'progress.json')))
+    counters = ActivityCounters(path=None)
+    monkeypatch.setattr(process_scraper, 'get_activity_counters', lambda: counters)
+
+    history, journal, writer = FakeHistory(), FakeJournal(), FakeLeadWriter()
+    leads = process_scraper.process_scrape(['Acme', 'NoMail', 'Blocked'], 2, lead_writer=writer,
+                                           history=history, journal=journal)
+
+    expected = {'Acme': OUTCOME_LEAD, 'NoMail': OUTCOME_NO_EMAIL, 'Blocked': OUTCOME_FAILED}
+    assert journal.finished_outcomes == expected
+    assert history.recorded == expected
+    assert history.details['Acme']['source_url'] == 'https://acme.example.com/contact'
+    assert history.details['Acme']['etag'] == '"v1"'
+    assert history.details['NoMail']['website'] == 'https://nomail.example.com'
+    assert leads == [lead] and writer.submitted == [lead]
+    assert counters.totals(3600)['blocks'] == 2
+
+
+def test_parent_reports_held_companies_as_skipped(monkeypatch, tmp_path):
+    events = [('started', 0, 'Blocked'), ('finished', 0, ('Blocked', None, OUTCOME_FAILED, {}, 0))]
+
+    def fake_iter_process_scrape(companies, num, mode=None):
+        assert list(companies) == ['Blocked']  # Held companies never reach a worker
+        return iter(events)
+
+    counters = ActivityCounters(path=None)
+    tracker = ProgressTracker(str(tmp_path / 'progress.json'), counters=counters)
+    monkeypatch.setattr(process_scraper, 'iter_process_scrape', fake_iter_process_scrape)
+    monkeypatch.setattr(process_scraper, 'lead_already_held', lambda index, company, *args: company == 'Held')
+    monkeypatch.setattr(process_scraper, 'get_dedup_index', FakeDedupIndex)
+    monkeypatch.setattr(process_scraper, 'get_progress_tracker', lambda: tracker)
+    monkeypatch.setattr(process_scraper, 'get_activity_counters', lambda: counters)
+
+    journal = FakeJournal()
+    process_scraper.process_scrape(['Held', 'Blocked'], 1, lead_writer=FakeLeadWriter(), journal=journal)
+
+    snapshot = tracker.snapshot()
+    assert (snapshot['completed'], snapshot['total']) == (2, 2)
+    assert (snapshot['failed'], snapshot['skipped']) == (1, 1)
+    assert counters.totals(3600)['attempts'] == 1
+    assert journal.finished_outcomes == {'Held': OUTCOME_SKIPPED, 'Blocked': OUTCOME_FAILED}
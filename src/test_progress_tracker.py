@@ -0,0 +1,44 @@
+import json
+from src.fakes import make_scraper
+from src.scrapers import google_company_scraper
+from src.utils.activity_counters import ActivityCounters
+from src.utils.progress_tracker import ProgressTracker
+
+
+def make_tracker(tmp_path):
+    counters = ActivityCounters(path=None)
+    return ProgressTracker(str(tmp_path / 'progress.json'), counters=counters), counters
+
+
+def test_skips_complete_the_run_without_counting_as_attempts(tmp_path):
+    tracker, counters = make_tracker(tmp_path)
+    tracker.start_run(3)
+
+    tracker.started('Acme')
+    tracker.finished('Acme', True)
+    tracker.skipped('Globex')
+    tracker.started('Initech')
+    tracker.finished('Initech', False)
+    tracker.finish_run()
+
+    snapshot = json.loads((tmp_path / 'progress.json').read_text())
+    assert (snapshot['completed'], snapshot['total']) == (3, 3)
+    assert (snapshot['successful'], snapshot['failed'], snapshot['skipped']) == (1, 1, 1)
+    totals = counters.totals(3600)
+    assert (totals['attempts'], totals['failures']) == (2, 1)
+
+
+def test_scraper_reports_held_companies_as_skipped(monkeypatch, tmp_path):
+    tracker, counters = make_tracker(tmp_path)
+    monkeypatch.setattr(google_company_scraper, 'lead_already_held', lambda index, company, *args: company == 'Held')
+    monkeypatch.setattr(google_company_scraper.GoogleCompanyScraper, 'search_company', lambda self, company: None)
+    scraper = make_scraper(progress=tracker)
+    try:
+        scraper.scrape(['Held', 'Blocked'])
+    finally:
+        scraper.close()
+
+    snapshot = tracker.snapshot()
+    assert (snapshot['completed'], snapshot['total']) == (2, 2)
+    assert (snapshot['failed'], snapshot['skipped']) == (1, 1)
+    assert counters.totals(3600)['attempts'] == 1
@@ -0,0 +1,53 @@
+import threading
+import pytest
+from src.utils.proxy_manager import ProxyManager
+
+
+class SlowTester:
+    """Proxy tester that holds its run open until released"""
+
+    def __init__(self, *working):
+        self.working = working
+        self.release = threading.Event()
+        self.runs = 0
+
+    def test_proxy_list(self, proxies):
+        self.runs += 1
+        self.release.wait(5)
+        return [{'proxy': proxy, 'working': True} for proxy in self.working]
+
+
+def make_manager(tester):
+    manager = ProxyManager()
+    manager.tester = tester
+    manager._save_working_proxies = lambda: None
+    return manager
+
+
+def test_proxy_test_runs_outside_the_rotation_lock():
+    tester = SlowTester('http://10.0.0.1:8080', 'http://10.0.0.2:8080')
+    manager = make_manager(tester)
+    picked = []
+    callers = [threading.Thread(target=lambda: picked.append(manager.get_next_proxy()['http'])) for _ in range(2)]
+    for caller in callers:
+        caller.start()
+
+    try:
+        assert manager._lock.acquire(timeout=1)  # Free while the test run is under way
+        manager._lock.release()
+    finally:
+        tester.release.set()
+        for caller in callers:
+            caller.join(5)
+
+    assert tester.runs == 1  # The second caller reused the first run
+    assert sorted(picked) == ['http://10.0.0.1:8080', 'http://10.0.0.2:8080']
+
+
+def test_no_working_proxies_raises():
+    tester = SlowTester()
+    tester.release.set()
+    manager = make_manager(tester)
+
+    with pytest.raises(Exception, match="No working proxies available"):
+        manager.get_next_proxy()
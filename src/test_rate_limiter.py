@@ -0,0 +1,86 @@
+import time
+import pytest
+from src.utils import rate_limiter
+from src.utils.rate_limiter import GOOGLE, RateLimiter
+
+
+class FakeClock:
+    """monotonic() and sleep() for the limiter; sleeping moves the clock on"""
+
+    def __init__(self):
+        # Ahead of the real clock, which stamps new buckets
+        self.now = time.monotonic() + 1000
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, 'monotonic', clock.monotonic)
+    monkeypatch.setattr(rate_limiter.time, 'sleep', clock.sleep)
+    return clock
+
+
+def test_google_hosts_share_a_bucket_and_sites_get_their_own():
+    assert RateLimiter.domain_key('https://www.google.com/search?q=acme') == GOOGLE
+    assert RateLimiter.domain_key('https://www.google.co.uk/') == GOOGLE
+    assert RateLimiter.domain_key('https://www.Acme.com:443/contact') == 'acme.com'
+
+
+def test_burst_is_free_then_requests_are_paced(clock):
+    limiter = RateLimiter(site_rate_per_min=30, burst=2)  # One token every two seconds
+
+    waits = [limiter.acquire('https://acme.com/') for _ in range(4)]
+
+    assert waits == [0, 0, pytest.approx(2.0), pytest.approx(2.0)]
+    assert limiter.acquire('https://other.com/') == 0  # Another site has its own bucket
+
+
+def test_tokens_refill_while_idle_up_to_burst(clock):
+    limiter = RateLimiter(site_rate_per_min=30, burst=2)
+    limiter.acquire('https://acme.com/')
+    limiter.acquire('https://acme.com/')
+
+    clock.now += 60  # Long enough to refill far past the burst
+
+    assert [limiter.acquire('https://acme.com/') for _ in range(3)] == [0, 0, pytest.approx(2.0)]
+
+
+def test_blocks_halve_the_rate_and_back_off_exponentially(clock):
+    limiter = RateLimiter(site_rate_per_min=30, burst=1, block_backoff=10, max_block_backoff=25)
+
+    limiter.report_block('https://acme.com/')
+    assert limiter.stats()['acme.com'] == {'rate_per_min': 15.0, 'paused_for': 10.0, 'strikes': 1}
+    assert limiter.acquire('https://acme.com/') == pytest.approx(10.0)
+
+    limiter.report_block('https://acme.com/')
+    limiter.report_block('https://acme.com/')
+    assert limiter.stats()['acme.com']['paused_for'] == 25.0  # 40s capped
+
+    limiter.report_success('https://acme.com/')
+    stats = limiter.stats()['acme.com']
+    assert stats['strikes'] == 0 and stats['rate_per_min'] == pytest.approx(3.75 * 1.1, abs=0.01)
+
+
+def test_errors_pause_without_lowering_the_rate(clock):
+    limiter = RateLimiter(site_rate_per_min=30, error_backoff=5)
+    limiter.report_error('https://acme.com/')
+
+    assert limiter.stats()['acme.com'] == {'rate_per_min': 30.0, 'paused_for': 5.0, 'strikes': 0}
+
+
+def test_scale_shares_the_rate_between_processes(clock):
+    limiter = RateLimiter(google_rate_per_min=6, site_rate_per_min=30, burst=1)
+    limiter.acquire('https://acme.com/')
+
+    limiter.scale(0.5)
+
+    assert limiter.stats()['acme.com']['rate_per_min'] == 15.0
+    assert limiter.acquire('https://acme.com/') == pytest.approx(4.0)  # One token per four seconds now
+    limiter.acquire('https://www.google.com/')
+    assert limiter.stats()[GOOGLE]['rate_per_min'] == 3.0
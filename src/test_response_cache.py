@@ -0,0 +1,78 @@
+import os
+import time
+from src.utils import response_cache
+from src.utils.response_cache import ResponseCache, normalize_url
+
+
+def entry_size(tmp_path):
+    """Bytes on disk of one entry as the tests write them"""
+    probe = ResponseCache(cache_dir=str(tmp_path / 'probe'))
+    probe.put('http://probe.example.com/', 'x' * 100)
+    return probe.stats()['bytes']
+
+
+def test_urls_differing_only_in_tracking_or_form_share_a_key():
+    assert normalize_url('HTTP://Acme.com:80/about/?utm_source=x&b=2&a=1') == 'http://acme.com/about?a=1&b=2'
+    assert normalize_url('https://acme.com') == 'https://acme.com/'
+
+
+def test_entries_expire_after_ttl(tmp_path, monkeypatch):
+    cache = ResponseCache(cache_dir=str(tmp_path), ttl=60)
+    cache.put('http://acme.com/', '<p>Acme</p>')
+    assert cache.get('http://acme.com/').body == '<p>Acme</p>'
+
+    later = time.time() + 61
+    monkeypatch.setattr(response_cache.time, 'time', lambda: later)
+    assert cache.get('http://acme.com/') is None
+    assert cache.get('http://acme.com/', max_age=120).body == '<p>Acme</p>'  # A longer max_age still accepts it
+
+
+def test_namespaces_keep_variants_apart(tmp_path):
+    cache = ResponseCache(cache_dir=str(tmp_path))
+    cache.put('http://acme.com/', 'raw')
+    cache.put('http://acme.com/', 'rendered', namespace='selenium')
+
+    assert cache.get('http://acme.com/').body == 'raw'
+    assert cache.get('http://acme.com/', namespace='selenium').body == 'rendered'
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = ResponseCache(cache_dir=str(tmp_path / 'cache'), max_bytes=2 * entry_size(tmp_path))
+    cache.put('http://a.com/', 'x' * 100)
+    cache.put('http://b.com/', 'x' * 100)
+    cache.get('http://a.com/')  # a is now the most recently used
+
+    cache.put('http://c.com/', 'x' * 100)
+
+    assert cache.get('http://b.com/') is None
+    assert cache.get('http://a.com/') and cache.get('http://c.com/')
+    assert cache.stats()['evictions'] == 1
+    assert len(os.listdir(tmp_path / 'cache')) == 2
+
+
+def test_lru_order_survives_a_restart(tmp_path):
+    directory = str(tmp_path / 'cache')
+    cache = ResponseCache(cache_dir=directory)
+    cache.put('http://a.com/', 'x' * 100)
+    cache.put('http://b.com/', 'x' * 100)
+    # Give the entries distinct access times, a used longer ago than b
+    now = time.time()
+    os.utime(cache._path(cache._key('http://a.com/')), (now - 100, now - 100))
+    os.utime(cache._path(cache._key('http://b.com/')), (now - 50, now - 50))
+
+    reopened = ResponseCache(cache_dir=directory, max_bytes=entry_size(tmp_path))
+
+    assert reopened.get('http://a.com/') is None
+    assert reopened.get('http://b.com/').body == 'x' * 100
+
+
+def test_corrupt_entries_are_dropped(tmp_path):
+    cache = ResponseCache(cache_dir=str(tmp_path))
+    cache.put('http://acme.com/', '<p>Acme</p>')
+    path = cache._path(cache._key('http://acme.com/'))
+    with open(path, 'wb') as f:
+        f.write(b'not gzip')
+
+    assert cache.get('http://acme.com/') is None
+    assert not os.path.exists(path)
+    assert cache.stats()['entries'] == 0
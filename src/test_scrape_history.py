@@ -0,0 +1,138 @@
+import time
+import pytest
+from src.utils.http_fetcher import FetchedPage, HttpFetcher
+from src.utils.response_cache import ResponseCache
+from src.utils.scrape_history import (
+    CompanyRecord, FreshnessScheduler, OUTCOME_FAILED, OUTCOME_LEAD, OUTCOME_NO_EMAIL, OUTCOME_UNCHANGED,
+    ScrapeHistory
+)
+
+DAY = 86400
+
+
+class FakeFetcher:
+    """Answers conditional GETs from a table of url to (status, html, etag)"""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.requests = []
+        self.proxy = None
+
+    def revalidate(self, url, etag=None, last_modified=None):
+        self.requests.append((url, etag, last_modified))
+        status, html, new_etag = self.responses[url]
+        return FetchedPage(url=url, final_url=url, status_code=status, html=html,
+                           fetched_at=time.time(), etag=new_etag)
+
+    def set_proxy(self, proxy):
+        self.proxy = proxy
+
+
+@pytest.fixture
+def history(tmp_path):
+    return ScrapeHistory(path=str(tmp_path / 'history.json'), leads_file=str(tmp_path / 'missing.csv'))
+
+
+def age(history, company, seconds):
+    record = history.get(company)
+    record.last_attempt -= seconds
+    record.last_success -= seconds
+
+
+def test_plan_skips_fresh_leads_and_backs_off_misses(history):
+    scheduler = FreshnessScheduler(history, fetcher=FakeFetcher({}), fresh_ttl=7 * DAY,
+                                   miss_backoff=DAY, max_backoff=4 * DAY)
+    history.record('Fresh', OUTCOME_LEAD, email='a@fresh.com', website='https://fresh.com')
+    history.record('Stale', OUTCOME_LEAD, email='a@stale.com', website='https://stale.com')
+    age(history, 'Stale', 8 * DAY)
+    history.record('Missed', OUTCOME_NO_EMAIL)
+    history.record('Missed', OUTCOME_FAILED)  # Second miss doubles the wait to two days
+    age(history, 'Missed', int(1.5 * DAY))
+
+    plan = scheduler.plan(['New', 'Fresh', 'Stale', 'Missed'])
+
+    assert plan.to_scrape == ['New']
+    assert [record.name for record in plan.to_revalidate] == ['Stale']
+    assert plan.skipped == 2
+
+    age(history, 'Missed', DAY)
+    assert scheduler.plan(['Missed']).to_scrape == ['Missed']
+
+
+def test_backoff_is_capped(history):
+    scheduler = FreshnessScheduler(history, fetcher=FakeFetcher({}), miss_backoff=DAY, max_backoff=4 * DAY)
+    assert scheduler._backoff(1) == DAY
+    assert scheduler._backoff(3) == 4 * DAY
+    assert scheduler._backoff(10) == 4 * DAY
+
+
+def test_first_revalidation_is_conditional_on_the_email_page(history):
+    history.record('Acme', OUTCOME_LEAD, email='sales@acme.com', website='https://acme.com',
+                   source_url='https://acme.com/contact', etag='"v1"', last_modified='Mon, 01 Jan 2024 00:00:00 GMT')
+    fetcher = FakeFetcher({'https://acme.com/contact': (304, '', '"v1"')})
+    scheduler = FreshnessScheduler(history, fetcher=fetcher)
+
+    changed = scheduler.revalidate([history.get('Acme')])
+
+    assert changed == []
+    assert fetcher.requests == [('https://acme.com/contact', '"v1"', 'Mon, 01 Jan 2024 00:00:00 GMT')]
+    assert history.get('Acme').outcome == OUTCOME_UNCHANGED
+
+
+def test_revalidate_keeps_lead_when_email_still_on_page(history):
+    history.record('Acme', OUTCOME_LEAD, email='Sales@Acme.com', website='https://acme.com',
+                   source_url='https://acme.com/contact')
+    fetcher = FakeFetcher({'https://acme.com/contact': (200, '<a href="mailto:sales@acme.com">', '"v2"')})
+
+    changed = FreshnessScheduler(history, fetcher=fetcher).revalidate([history.get('Acme')])
+
+    assert changed == []
+    assert history.get('Acme').etag == '"v2"'
+
+
+def test_revalidate_flags_changed_and_emailless_records(history):
+    fetcher = FakeFetcher({
+        'https://gone.com': (200, '<p>No email here</p>', None),
+        'https://nomail.com': (200, '<p>Anything</p>', None),
+    })
+    records = [
+        CompanyRecord(name='Gone', email='a@gone.com', website='https://gone.com'),
+        CompanyRecord(name='NoMail', email=None, website='https://nomail.com'),
+    ]
+
+    assert FreshnessScheduler(history, fetcher=fetcher).revalidate(records) == ['Gone', 'NoMail']
+
+
+def test_new_email_page_replaces_old_validators(history):
+    history.record('Acme', OUTCOME_LEAD, email='a@acme.com', source_url='https://acme.com/', etag='"old"')
+    history.record('Acme', OUTCOME_LEAD, email='a@acme.com', source_url='https://acme.com/contact')
+
+    record = history.get('Acme')
+    assert record.source_url == 'https://acme.com/contact'
+    assert record.etag is None
+
+
+def test_history_survives_a_reload(history):
+    history.record('Acme', OUTCOME_LEAD, email='a@acme.com', source_url='https://acme.com/contact', etag='"v1"')
+    history.save()
+
+    reloaded = ScrapeHistory(path=history.path, leads_file=history.leads_file)
+    assert reloaded.get('acme').etag == '"v1"'
+
+
+def test_scheduler_routes_through_the_given_proxy(history):
+    fetcher = FakeFetcher({})
+    scheduler = FreshnessScheduler(history, fetcher=fetcher)
+    scheduler.set_proxy({'http': 'http://10.0.0.1:8080'})
+    assert fetcher.proxy == {'http': 'http://10.0.0.1:8080'}
+
+
+def test_cached_pages_keep_their_validators(tmp_path):
+    cache = ResponseCache(cache_dir=str(tmp_path / 'cache'))
+    cache.put('https://acme.com/contact', '<p>Contact</p>', etag='"v1"', last_modified='Mon, 01 Jan 2024 00:00:00 GMT')
+
+    page = HttpFetcher(cache=cache).fetch('https://acme.com/contact')
+
+    assert page.from_cache
+    assert page.etag == '"v1"'
+    assert page.last_modified == 'Mon, 01 Jan 2024 00:00:00 GMT'
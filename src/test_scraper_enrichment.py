@@ -0,0 +1,130 @@
+from src.fakes import PROXY_A, PROXY_B, FakeProxyManager, make_scraper
+from src.utils.async_enricher import AsyncEnricher, EnrichmentResult
+from src.utils.http_fetcher import FetchedPage
+
+
+def test_http_visits_count_pages_actually_fetched(monkeypatch):
+    monkeypatch.setattr(AsyncEnricher, 'find_email', lambda self, urls: EnrichmentResult(pages_fetched=5))
+    scraper = make_scraper()
+    try:
+        scraper._enrich_async(['http://a.example.com/', 'http://b.example.com/'])
+    finally:
+        scraper.close()
+
+    assert scraper.fetch_stats['http'] == 5
+
+
+def test_enricher_follows_proxy_rotation(monkeypatch):
+    monkeypatch.setattr(AsyncEnricher, 'find_email', lambda self, urls: EnrichmentResult())
+    scraper = make_scraper(FakeProxyManager(PROXY_B))
+    scraper.http_fetcher = None  # The enricher then owns its fetcher
+    scraper.current_proxy = PROXY_A
+    try:
+        scraper._enrich_async(['http://a.example.com/'])
+        assert scraper.enricher.fetcher.session.proxies == PROXY_A
+
+        scraper.max_proxy_failures = 1
+        scraper.handle_proxy_error()
+        assert scraper.enricher.fetcher.session.proxies == PROXY_B
+    finally:
+        scraper.close()
+
+
+def test_close_stops_the_enricher(monkeypatch):
+    monkeypatch.setattr(AsyncEnricher, 'find_email', lambda self, urls: EnrichmentResult())
+    scraper = make_scraper()
+    scraper._enrich_async(['http://a.example.com/'])
+    enricher = scraper.enricher
+
+    scraper.close()
+
+    assert scraper.enricher is None
+    assert scraper.driver is None
+    assert enricher.executor._shutdown
+
+
+class FakeHttpFetcher:
+    def __init__(self, pages):
+        self.pages = pages
+
+    def fetch(self, url):
+        html, etag = self.pages[url]
+        return FetchedPage(url=url, final_url=url, status_code=200, html=html, fetched_at=0, etag=etag)
+
+    def set_proxy(self, proxy):
+        pass
+
+
+def test_email_source_is_the_page_the_email_was_on():
+    filler = '<p>' + 'We build software for businesses around the world. ' * 10 + '</p>'
+    scraper = make_scraper()
+    scraper.http_fetcher = FakeHttpFetcher({
+        'https://acme.example.com/': (f'<html><body>{filler}<a href="/contact">Contact</a></body></html>', '"home"'),
+        'https://acme.example.com/contact': (
+            f'<html><body>{filler}<a href="mailto:sales@acme.example.com">Mail</a></body></html>', '"contact"'
+        ),
+    })
+    try:
+        assert scraper._extract_email_via_http('https://acme.example.com/') == (True, 'sales@acme.example.com')
+    finally:
+        scraper.close()
+
+    assert scraper.email_source == {
+        'source_url': 'https://acme.example.com/contact', 'etag': '"contact"', 'last_modified': None
+    }
+
+
+def test_async_email_source_carries_validators(monkeypatch):
+    monkeypatch.setattr(AsyncEnricher, 'find_email', lambda self, urls: EnrichmentResult(
+        email='a@acme.example.com', source_url='https://acme.example.com/about', etag='"v1"', pages_fetched=2
+    ))
+    scraper = make_scraper()
+    try:
+        assert scraper._enrich_async(['https://acme.example.com/']) == 'a@acme.example.com'
+    finally:
+        scraper.close()
+
+    assert scraper.email_source['source_url'] == 'https://acme.example.com/about'
+    assert scraper.email_source['etag'] == '"v1"'
+
+
+class SpareDriver:
+    quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+class FakeHotSpare:
+    def __init__(self, driver, proxy):
+        self.spare = (driver, proxy)
+
+    def take(self):
+        return self.spare
+
+
+def test_rotation_cold_starts_when_the_pool_refuses_the_spare():
+    spare = SpareDriver()
+    scraper = make_scraper(FakeProxyManager(PROXY_B))
+    scraper.hot_spare = FakeHotSpare(spare, PROXY_A)
+    scraper.driver_pool.accept_spares = False
+    scraper.max_proxy_failures = 1
+    try:
+        scraper.handle_proxy_error()
+        assert spare.quit_called
+        assert scraper.driver is not spare
+        assert scraper.current_proxy == PROXY_B
+        assert scraper.driver_pool.checked_out[-1] == PROXY_B
+    finally:
+        scraper.close()
+
+
+def test_rotation_swaps_in_an_adopted_spare():
+    spare = SpareDriver()
+    scraper = make_scraper()
+    scraper.hot_spare = FakeHotSpare(spare, PROXY_A)
+    scraper.max_proxy_failures = 1
+    scraper.handle_proxy_error()
+
+    assert scraper.driver is spare and not spare.quit_called
+    assert scraper.current_proxy == PROXY_A
@@ -0,0 +1,18 @@
+from src.scrapers.google_company_scraper import parse_serp_html
+
+SERP = (
+    '<html><body>'
+    '<div class="g"><a href="/url?q=https://acme.example.com/"><h3>Acme</h3></a>'
+    '<div class="VwiC3b">Acme builds things.</div></div>'
+    '<div class="g"><a href="https://beta.example.com/"><h3>Beta</h3></a></div>'
+    '</body></html>'
+)
+
+
+def test_cached_links_resolve_like_a_live_page():
+    results = parse_serp_html(SERP, 'https://www.google.com/search?q=acme')
+
+    assert results == [
+        {'link': 'https://www.google.com/url?q=https://acme.example.com/', 'snippet': 'Acme builds things.'},
+        {'link': 'https://beta.example.com/', 'snippet': None},
+    ]
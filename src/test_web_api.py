@@ -0,0 +1,99 @@
+import time
+from datetime import datetime, timedelta, timezone
+import pytest
+from fastapi.testclient import TestClient
+from src.fakes import make_lead
+from src.utils.lead_store import LeadStore
+from src.web import app as web_app
+from src.web.app import decode_cursor, encode_cursor
+
+NOON = datetime(2026, 3, 2, 12, 0)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = LeadStore(url=f"sqlite:///{tmp_path / 'leads.db'}")
+    monkeypatch.setattr(web_app, 'get_lead_store', lambda: store)
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def client(store):
+    # Without a with block the lifespan, and so the metrics exporter, does not start
+    return TestClient(web_app.app)
+
+
+def fetch_all(client, **params):
+    names, cursor = [], None
+    while True:
+        page = client.get('/api/leads', params={**params, **({'cursor': cursor} if cursor else {})}).json()
+        names.extend(lead['name'] for lead in page['leads'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            return names
+
+
+def test_cursor_round_trips_its_key():
+    assert decode_cursor(encode_cursor('timestamp', 'desc', (NOON, 7)), 'timestamp', 'desc') == (NOON, 7)
+    assert decode_cursor(encode_cursor('name', 'asc', ('Acme', 3)), 'name', 'asc') == ('Acme', 3)
+
+
+@pytest.mark.parametrize('sort, order', [('timestamp', 'desc'), ('updated_at', 'asc'), ('name', 'asc')])
+def test_cursor_pages_cover_every_lead_once(client, store, sort, order):
+    # Ten leads share each timestamp, so pages have to split runs of equal keys
+    store.upsert([make_lead(f'Company {i:02}', f'a@company{i}.com', timestamp=NOON + timedelta(hours=i // 10))
+                  for i in range(25)])
+
+    names = fetch_all(client, sort=sort, order=order, limit=4)
+
+    assert sorted(names) == [f'Company {i:02}' for i in range(25)]
+
+
+def test_cursor_from_another_sort_or_order_is_rejected(client, store):
+    store.upsert([make_lead(f'Company {i}', f'a@company{i}.com') for i in range(3)])
+    cursor = client.get('/api/leads', params={'sort': 'timestamp', 'order': 'desc', 'limit': 1}).json()['next_cursor']
+
+    assert client.get('/api/leads', params={'cursor': cursor, 'sort': 'name'}).status_code == 400
+    assert client.get('/api/leads', params={'cursor': cursor, 'order': 'asc'}).status_code == 400
+    assert client.get('/api/leads', params={'cursor': 'not-a-cursor'}).status_code == 400
+    assert client.get('/api/leads', params={'cursor': cursor}).status_code == 200
+
+
+def test_fields_project_and_unknown_fields_are_rejected(client, store):
+    store.upsert([make_lead('Acme', 'a@acme.com', website='https://www.acme.com')])
+
+    page = client.get('/api/leads', params={'fields': 'name,domain'}).json()
+
+    assert page['leads'] == [{'name': 'Acme', 'domain': 'acme.com'}]
+    assert client.get('/api/leads', params={'fields': 'name,password'}).status_code == 400
+
+
+def test_filters_narrow_the_page(client, store):
+    store.upsert([
+        make_lead('Old', 'a@old.com', website='https://old.com', timestamp=NOON - timedelta(days=2)),
+        make_lead('New', 'a@new.com', timestamp=NOON),
+    ])
+
+    assert fetch_all(client, since=(NOON - timedelta(days=1)).isoformat()) == ['New']
+    assert fetch_all(client, has_website='true') == ['Old']
+    assert fetch_all(client, domain='old.com') == ['Old']
+
+
+@pytest.fixture
+def local_zone(monkeypatch):
+    """Run with local time ahead of UTC, so a dropped offset would shift every bound"""
+    monkeypatch.setenv('TZ', 'Asia/Kolkata')
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_aware_since_and_until_compare_in_local_time(client, store, local_zone):
+    store.upsert([make_lead('Acme', 'a@acme.com', timestamp=NOON)])
+    utc_noon = NOON.astimezone(timezone.utc)  # NOON is local time, 06:30 in UTC
+
+    assert fetch_all(client, since=utc_noon.strftime('%Y-%m-%dT%H:%M:%SZ')) == ['Acme']
+    assert fetch_all(client, since=(utc_noon + timedelta(seconds=1)).strftime('%Y-%m-%dT%H:%M:%SZ')) == []
+    assert fetch_all(client, until=(utc_noon + timedelta(seconds=1)).isoformat()) == ['Acme']
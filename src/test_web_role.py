@@ -0,0 +1,78 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import pytest
+import requests
+from src.utils.progress_tracker import ProgressTracker
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def web_role(tmp_path):
+    """`main.py --role web` on its own, with every shared file under tmp_path"""
+    port = free_port()
+    env = {
+        **os.environ,
+        'WEB_HOST': '127.0.0.1', 'WEB_PORT': str(port), 'WEB_WORKERS': '1',
+        'DATABASE_URL': f"sqlite:///{tmp_path / 'leads.db'}",
+        'LEADS_CSV_FILE': str(tmp_path / 'leads.csv'),
+        'PROGRESS_FILE': str(tmp_path / 'progress.json'),
+        'ACTIVITY_COUNTERS_FILE': str(tmp_path / 'activity_counters.npz'),
+        'METRICS_DIR': str(tmp_path / 'metrics'),
+        'RUN_DIR': str(tmp_path / 'run'),
+    }
+    # Snapshots left by a scraper process running elsewhere
+    tracker = ProgressTracker(env['PROGRESS_FILE'])
+    tracker.start_run(5)
+    tracker.started('Acme')
+    tracker.finished('Acme', True)
+    tracker.flush()
+    os.makedirs(env['METRICS_DIR'])
+    with open(os.path.join(env['METRICS_DIR'], '1.json'), 'w') as f:
+        json.dump({'pid': 1, 'metrics': {'proxy_rotations_total': [[[], 3.0]]}}, f)
+
+    server = subprocess.Popen([sys.executable, '-m', 'src.main', '--role', 'web'], cwd=ROOT, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f'http://127.0.0.1:{port}'
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                requests.get(f'{base_url}/metrics', timeout=1)
+                break
+            except requests.ConnectionError:
+                if server.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("dashboard did not start")
+                time.sleep(0.2)
+        yield base_url, tmp_path
+    finally:
+        server.terminate()
+        server.wait(10)
+
+
+def test_web_role_serves_without_a_scraper(web_role):
+    base_url, tmp_path = web_role
+
+    status = requests.get(f'{base_url}/status', timeout=10)
+    assert status.status_code == 200
+    assert status.headers['content-type'].startswith('text/html')  # Errors come back as JSON
+    progress = requests.get(f'{base_url}/progress', timeout=10)
+    assert progress.status_code == 200
+    assert progress.json()['completed'] == 1 and progress.json()['total'] == 5
+
+    metrics = requests.get(f'{base_url}/metrics', timeout=10)
+    assert metrics.status_code == 200
+    assert 'proxy_rotations_total 3.0' in metrics.text.splitlines()
+
+    # No scrape run was started in this process
+    assert not os.path.exists(tmp_path / 'run')
@@ -0,0 +1,185 @@
+import atexit
+import os
+import threading
+import time
+from typing import Dict, Optional
+import numpy as np
+from src.config import Config
+from src.utils.logger import setup_logger
+
+logger = setup_logger("activity_counters")
+
+EVENTS = ('leads', 'attempts', 'failures', 'blocks')
+
+MINUTE = 60
+HOUR = 3600
+
+
+class _Ring:
+    """Counts per event in fixed-width time buckets, oldest overwritten first"""
+
+    def __init__(self, width: int, size: int):
+        self.width = width
+        self.counts = np.zeros((len(EVENTS), size), dtype=np.int64)
+        self.buckets = np.full(size, -1, dtype=np.int64)  # Bucket number each slot currently holds
+
+    def add(self, event: int, count: int, at: float) -> None:
+        bucket = int(at // self.width)
+        slot = bucket % self.buckets.size
+        if bucket < self.buckets[slot]:
+            return  # Older than the ring reaches back
+        if self.buckets[slot] != bucket:
+            self.counts[:, slot] = 0
+            self.buckets[slot] = bucket
+        self.counts[event, slot] += count
+
+    def window(self, seconds: float, now: float) -> np.ndarray:
+        """Totals per event over the buckets overlapping the last seconds"""
+        current = int(now // self.width)
+        oldest = current - int(np.ceil(seconds / self.width)) + 1
+        live = (self.buckets >= oldest) & (self.buckets <= current)
+        return self.counts[:, live].sum(axis=1)
+
+    def series(self, event: int, periods: int, now: float) -> np.ndarray:
+        """Counts for the last periods buckets, oldest first, zero where nothing was recorded"""
+        current = int(now // self.width)
+        wanted = np.arange(current - periods + 1, current + 1)
+        slots = wanted % self.buckets.size
+        held = self.buckets[slots] == wanted
+        return np.where(held, self.counts[event, slots], 0)
+
+
+class ActivityCounters:
+    """Leads, attempts, failures and blocks in per-minute and per-hour ring buffers
+
+    Recording an event is a constant-time bucket increment; windows and rates
+    are NumPy reductions over at most a day of minutes or a month of hours.
+    The buffers are snapshotted to path so the dashboard and the monitor can
+    read them from another process.
+    """
+
+    def __init__(self, path: Optional[str] = 'data/activity_counters.npz', minutes: int = 24 * 60,
+                 hours: int = 30 * 24, flush_interval: float = 5.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._minutes = _Ring(MINUTE, minutes)
+        self._hours = _Ring(HOUR, hours)
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def record(self, event: str, count: int = 1, at: Optional[float] = None) -> None:
+        if count <= 0:
+            return
+        index = EVENTS.index(event)
+        at = time.time() if at is None else at
+        with self._lock:
+            self._minutes.add(index, count, at)
+            self._hours.add(index, count, at)
+            self._dirty = True
+            # Started on the first event, so a process that never records never writes the file
+            if self._flusher is None and self.path:
+                self._flusher = threading.Thread(target=self._flush_loop, name="activity-flusher", daemon=True)
+                self._flusher.start()
+
+    def totals(self, seconds: float, now: Optional[float] = None) -> Dict[str, int]:
+        """Events per type over the last seconds, at minute resolution up to a day"""
+        now = time.time() if now is None else now
+        ring = self._minutes if seconds <= self._minutes.buckets.size * MINUTE else self._hours
+        with self._lock:
+            sums = ring.window(seconds, now)
+        return dict(zip(EVENTS, sums.tolist()))
+
+    def rates(self, seconds: float = HOUR, now: Optional[float] = None) -> Dict[str, float]:
+        """Events per hour, averaged over the last seconds"""
+        return {event: round(total * HOUR / seconds, 2) for event, total in self.totals(seconds, now).items()}
+
+    def series(self, event: str, periods: int = 60, resolution: str = 'minute',
+               now: Optional[float] = None) -> np.ndarray:
+        ring = self._minutes if resolution == 'minute' else self._hours
+        now = time.time() if now is None else now
+        with self._lock:
+            return ring.series(EVENTS.index(event), periods, now)
+
+    def flush(self) -> None:
+        """Snapshot the buffers atomically if anything changed since the last flush"""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            arrays = {
+                'minute_counts': self._minutes.counts.copy(), 'minute_buckets': self._minutes.buckets.copy(),
+                'hour_counts': self._hours.counts.copy(), 'hour_buckets': self._hours.buckets.copy(),
+            }
+
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, events=np.array(EVENTS), **arrays)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Error writing activity counters: {e}")
+
+    def close(self) -> None:
+        self._stop.set()
+        self.flush()
+
+    def _load(self, path: str) -> None:
+        try:
+            with np.load(path) as data:
+                if tuple(data['events'].tolist()) != EVENTS:
+                    logger.warning(f"Ignoring activity counters in {path}: recorded for other events")
+                    return
+                for ring, name in ((self._minutes, 'minute'), (self._hours, 'hour')):
+                    if data[f'{name}_buckets'].shape == ring.buckets.shape:
+                        ring.counts = data[f'{name}_counts']
+                        ring.buckets = data[f'{name}_buckets']
+        except Exception as e:
+            logger.error(f"Error reading activity counters from {path}: {e}")
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+
+_snapshot = None
+_snapshot_mtime = None
+_snapshot_lock = threading.Lock()
+
+
+def read_activity_counters(path: str = 'data/activity_counters.npz') -> ActivityCounters:
+    """The latest snapshot written by the scraper, reloaded only when the file changes"""
+    global _snapshot, _snapshot_mtime
+    with _snapshot_lock:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime = None
+        if _snapshot is None or mtime != _snapshot_mtime:
+            _snapshot = ActivityCounters(path=None)
+            if mtime is not None:
+                _snapshot._load(path)
+            _snapshot_mtime = mtime
+        return _snapshot
+
+
+_shared_counters = None
+_shared_counters_lock = threading.Lock()
+
+
+def get_activity_counters() -> ActivityCounters:
+    """Process-wide counters fed by the lead writer, the progress tracker and the scraper"""
+    global _shared_counters
+    with _shared_counters_lock:
+        if _shared_counters is None:
+            _shared_counters = ActivityCounters(Config.ACTIVITY_COUNTERS_FILE,
+                                                flush_interval=Config.ACTIVITY_FLUSH_INTERVAL)
+            atexit.register(_shared_counters.close)
+        return _shared_counters
@@ -0,0 +1,166 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+from src.utils.http_fetcher import HttpFetcher, parse_html, extract_email, find_page_links, needs_javascript
+from src.utils.logger import setup_logger
+
+logger = setup_logger("async_enricher")
+
+
+@dataclass
+class EnrichmentResult:
+    email: Optional[str] = None
+    source_url: Optional[str] = None
+    etag: Optional[str] = None  # Validators of source_url, for later revalidation
+    last_modified: Optional[str] = None
+    pages_fetched: int = 0
+    js_sites: List[str] = field(default_factory=list)  # Sites that need the browser path
+
+
+@dataclass
+class _PageScan:
+    url: str
+    email: Optional[str] = None
+    links: List[str] = field(default_factory=list)
+    needs_js: bool = False
+    fetched: bool = False
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class AsyncEnricher:
+    """Fetch candidate sites and their contact/about pages concurrently"""
+
+    def __init__(self, fetcher: Optional[HttpFetcher] = None, max_in_flight: int = 10,
+                 max_per_host: int = 2, page_timeout: float = 15, total_timeout: float = 30,
+                 max_subpages: int = 2):
+        self.fetcher = fetcher or HttpFetcher()
+        self.max_in_flight = max_in_flight
+        self.max_per_host = max_per_host
+        self.page_timeout = page_timeout
+        self.total_timeout = total_timeout
+        self.max_subpages = max_subpages
+        # requests is blocking, so fetches run on a bounded pool driven by the event loop
+        self.executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="enricher")
+
+    def find_email(self, urls: List[str]) -> EnrichmentResult:
+        """Blocking entry point for callers outside an event loop"""
+        return asyncio.run(self.find_email_async(urls))
+
+    async def find_email_async(self, urls: List[str]) -> EnrichmentResult:
+        """Crawl sites and sub-pages concurrently, stopping at the first email"""
+        result = EnrichmentResult()
+        global_limit = asyncio.Semaphore(self.max_in_flight)
+        host_limits: Dict[str, asyncio.Semaphore] = {}
+        pending = set()
+        # Lower rank means closer to the top of the SERP, so ties favour better results
+        ranks = {}
+
+        def schedule(url: str, rank: int, is_root: bool):
+            task = asyncio.create_task(self._scan(url, global_limit, host_limits))
+            ranks[task] = (rank, is_root)
+            pending.add(task)
+
+        for rank, url in enumerate(urls):
+            schedule(url, rank, True)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.total_timeout
+
+        try:
+            while pending:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    logger.warning(f"Enrichment timed out with {len(pending)} pages outstanding")
+                    break
+
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in sorted(done, key=lambda t: ranks[t]):
+                    rank, is_root = ranks.pop(task)
+                    scan = task.result()
+                    if scan.fetched:
+                        result.pages_fetched += 1
+
+                    if scan.email and not result.email:
+                        result.email = scan.email
+                        result.source_url = scan.url
+                        result.etag = scan.etag
+                        result.last_modified = scan.last_modified
+                    elif is_root and scan.needs_js:
+                        result.js_sites.append(scan.url)
+                    elif is_root and not result.email:
+                        for link in scan.links[:self.max_subpages]:
+                            schedule(link, rank, False)
+
+                if result.email:
+                    break
+        finally:
+            # Stop waiting on outstanding pages once an email is found or time runs out; their
+            # requests finish on the executor in the background
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        return result
+
+    async def _scan(self, url: str, global_limit: asyncio.Semaphore,
+                    host_limits: Dict[str, asyncio.Semaphore]) -> _PageScan:
+        """Fetch and parse a single page under the global and per-host limits"""
+        host = urlparse(url).netloc.lower()
+        if host not in host_limits:
+            host_limits[host] = asyncio.Semaphore(self.max_per_host)
+
+        host_limit = host_limits[host]
+        loop = asyncio.get_running_loop()
+        try:
+            await host_limit.acquire()
+            try:
+                await global_limit.acquire()
+            except BaseException:
+                host_limit.release()
+                raise
+            try:
+                future = loop.run_in_executor(self.executor, self._scan_blocking, url)
+            except BaseException:
+                global_limit.release()
+                host_limit.release()
+                raise
+            # A blocking request cannot be interrupted, so its slots are freed when its thread is
+            # done with the host, while a timed-out or cancelled caller moves on without waiting
+            future.add_done_callback(lambda _: (global_limit.release(), host_limit.release()))
+            return await asyncio.wait_for(asyncio.shield(future), timeout=self.page_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Timed out fetching {url}")
+            return _PageScan(url=url)
+        except Exception as e:
+            logger.error(f"Error scanning {url}: {str(e)}")
+            return _PageScan(url=url)
+
+    def _scan_blocking(self, url: str) -> _PageScan:
+        """Fetch a page and pull out its email and follow-up links"""
+        scan = _PageScan(url=url)
+        page = self.fetcher.fetch(url)
+        if not page or page.status_code >= 400:
+            return scan
+
+        scan.fetched = True
+        scan.etag = page.etag
+        scan.last_modified = page.last_modified
+        soup = parse_html(page.html)
+        if needs_javascript(page.html, soup):
+            scan.needs_js = True
+            return scan
+
+        scan.email = extract_email(soup)
+        if not scan.email:
+            scan.links = find_page_links(soup, page.final_url)
+        return scan
+
+    def close(self) -> None:
+        """Stop worker threads"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -1,5 +1,7 @@
 import pandas as pd
 from pathlib import Path
+from src.config import Config
+from src.utils.lead_archive import LeadArchive, archive_available
 from src.utils.logger import setup_logger
 
 logger = setup_logger("data_checker")
@@ -10,27 +12,34 @@ def check_data_files():
         logger.error("Data directory does not exist!")
         return
     
+    # The Parquet archive loads with real dtypes and without parsing text
+    if archive_available():
+        archive = LeadArchive(Config.ARCHIVE_DIR)
+        if archive.partitions():
+            check_frame(f"archive {archive.root}", archive.read())
+            return
+    
     for csv_file in data_dir.glob("*_leads.csv"):
         try:
-            logger.info(f"\nChecking file: {csv_file}")
-            df = pd.read_csv(csv_file)
-            
-            logger.info(f"Number of leads: {len(df)}")
-            logger.info(f"Columns: {df.columns.tolist()}")
-            
-            # Check for missing values
-            missing_values = df.isnull().sum()
-            if missing_values.any():
-                logger.warning("Missing values found:")
-                for col, count in missing_values[missing_values > 0].items():
-                    logger.warning(f"  {col}: {count} missing values")
-            
-            # Display first few rows
-            logger.info("\nFirst few leads:")
-            print(df.head().to_string())
-            
+            check_frame(f"file: {csv_file}", pd.read_csv(csv_file))
         except Exception as e:
             logger.error(f"Error checking {csv_file}: {e}")
 
+def check_frame(source: str, df: pd.DataFrame):
+    logger.info(f"\nChecking {source}")
+    logger.info(f"Number of leads: {len(df)}")
+    logger.info(f"Columns: {df.columns.tolist()}")
+    
+    # Check for missing values
+    missing_values = df.isnull().sum()
+    if missing_values.any():
+        logger.warning("Missing values found:")
+        for col, count in missing_values[missing_values > 0].items():
+            logger.warning(f"  {col}: {count} missing values")
+    
+    # Display first few rows
+    logger.info("\nFirst few leads:")
+    print(df.head().to_string())
+
 if __name__ == "__main__":
-    check_data_files() 
\ No newline at end of file
+    check_data_files()
@@ -0,0 +1,172 @@
+import importlib.util
+import os
+import queue
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import pandas as pd
+from src.utils.dedup_index import normalize_company
+from src.utils.logger import setup_logger
+from src.utils.metrics import QUEUE_DEPTH
+
+logger = setup_logger("company_sources")
+
+# A named, zero-argument callable returning an iterator of company names
+Source = Tuple[str, Callable[[], Iterable[str]]]
+
+
+def iter_csv_companies(path: str = 'data/target_companies.csv', column: str = 'company_name',
+                       chunksize: int = 10000) -> Iterator[str]:
+    """Company names from a CSV, read in chunks"""
+    if not os.path.exists(path):
+        return
+    for chunk in pd.read_csv(path, usecols=[column], chunksize=chunksize):
+        yield from chunk[column].dropna().astype(str)
+
+
+def iter_industry_targets(path: str = 'data/industry_targets.py') -> Iterator[str]:
+    """Company names from the *_COMPANIES lists in the industry targets module"""
+    if not os.path.exists(path):
+        return
+    spec = importlib.util.spec_from_file_location('industry_targets', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    for name in dir(module):
+        if name.endswith('_COMPANIES'):
+            yield from getattr(module, name)
+
+
+def iter_gemini_companies(helper=None) -> Iterator[str]:
+    """Companies suggested by Gemini, one industry at a time, then the expanded lists"""
+    if helper is None:
+        from src.utils.gemini_helper import GeminiHelper
+        helper = GeminiHelper()
+
+    companies_by_industry = helper.get_industries_and_companies()
+    for companies in companies_by_industry.values():
+        yield from companies
+    for industry, companies in companies_by_industry.items():
+        yield from helper.expand_company_list(industry, companies)
+
+
+def iter_stock_market_companies() -> Iterator[str]:
+    """S&P 500 and NASDAQ-100 constituents, each table yielded as soon as it loads"""
+    tables = [
+        ('https://en.wikipedia.org/wiki/List_of_S%26P_500_companies', 0, 'Security'),
+        ('https://en.wikipedia.org/wiki/NASDAQ-100', 4, 'Company'),
+    ]
+    for url, index, column in tables:
+        yield from pd.read_html(url)[index][column].dropna().astype(str)
+
+
+def default_sources() -> List[Source]:
+    """Local files first so scraping can start before the network sources answer"""
+    sources = [
+        ('target_csv', iter_csv_companies),
+        ('industry_targets', iter_industry_targets),
+        ('gemini', iter_gemini_companies),
+    ]
+    # Public companies are only collected where the stock market extras are installed
+    try:
+        import yfinance  # noqa: F401
+        sources.append(('stock_markets', iter_stock_market_companies))
+    except ImportError:
+        logger.warning("yfinance not installed, skipping stock market companies")
+    return sources
+
+
+# Scraped when every source fails or comes back empty
+FALLBACK_COMPANIES = [
+    "OpenAI", "Anthropic", "Scale AI", "Stability AI", "Cohere",
+    "Microsoft", "Google", "Amazon", "Meta", "Apple", "Netflix", "Tesla",
+]
+
+
+_SOURCE_DONE = object()
+
+
+class CompanyStream:
+    """Merges company sources into one de-duplicated stream through a bounded queue
+
+    Each source runs on its own thread and blocks when the queue is full, so a
+    large source never gets ahead of the scraper by more than maxsize names.
+    Only normalized keys of names already seen are kept in memory.
+    """
+
+    def __init__(self, sources: List[Source], maxsize: int = 1000, exclude: Iterable[str] = (),
+                 fallback: Optional[List[str]] = None):
+        self.sources = sources
+        self.fallback = fallback
+        self._queue: "queue.Queue" = queue.Queue(maxsize=maxsize)
+        self._seen = {normalize_company(name) for name in exclude}
+        self._seen_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self.stats: Dict[str, Dict[str, int]] = {name: {'yielded': 0, 'duplicates': 0} for name, _ in sources}
+
+    def __iter__(self) -> Iterator[str]:
+        if not self._threads:
+            self._start()
+
+        remaining = len(self._threads)
+        yielded = 0
+        try:
+            while remaining:
+                item = self._queue.get()
+                if item is _SOURCE_DONE:
+                    remaining -= 1
+                    continue
+                yielded += 1
+                yield item
+        finally:
+            self.close()
+
+        if not yielded and self.fallback:
+            logger.warning("No companies from any source, using the fallback list")
+            yield from (name for name in self.fallback if normalize_company(name) not in self._seen)
+
+    def close(self) -> None:
+        """Stop the producers, e.g. when the consumer gives up early"""
+        self._stop.set()
+
+    def _start(self) -> None:
+        QUEUE_DEPTH.set_function(self._queue.qsize, queue='company_sources')
+        for name, source in self.sources:
+            thread = threading.Thread(target=self._produce, args=(name, source), name=f"source-{name}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def _produce(self, name: str, source: Callable[[], Iterable[str]]) -> None:
+        try:
+            for company in source():
+                if self._stop.is_set():
+                    break
+                if not isinstance(company, str):
+                    continue
+                company = ' '.join(company.split())
+                key = normalize_company(company)
+                if not key:
+                    continue
+                with self._seen_lock:
+                    if key in self._seen:
+                        self.stats[name]['duplicates'] += 1
+                        continue
+                    self._seen.add(key)
+                self.stats[name]['yielded'] += 1
+                if not self._put(company):
+                    break
+            logger.info(f"Source {name} finished: {self.stats[name]}")
+        except Exception as e:
+            logger.error(f"Error reading companies from {name}: {e}")
+        finally:
+            self._put(_SOURCE_DONE, force=True)
+
+    def _put(self, item, force: bool = False) -> bool:
+        while True:
+            if self._stop.is_set() and not force:
+                return False
+            try:
+                self._queue.put(item, timeout=1)
+                return True
+            except queue.Full:
+                if force and self._stop.is_set():
+                    return False
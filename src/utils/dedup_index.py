@@ -0,0 +1,238 @@
+import hashlib
+import math
+import os
+import re
+import struct
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+from src.config import Config
+from src.models.lead import Lead
+from src.utils.lead_store import LeadStore, get_lead_store, lead_domain
+from src.utils.logger import setup_logger
+
+logger = setup_logger("dedup_index")
+
+KINDS = ('email', 'company', 'domain')
+
+# Legal suffixes dropped so "Acme Inc." and "ACME" share a key
+COMPANY_SUFFIXES = {'inc', 'incorporated', 'llc', 'ltd', 'limited', 'corp', 'corporation', 'co', 'company',
+                    'gmbh', 'plc', 'sa', 'ag', 'bv', 'pvt', 'private'}
+
+_PUNCTUATION = re.compile(r'[^\w\s]')
+
+_BLOOM_HEADER = struct.Struct('<QQQQ')  # bits, hashes, items, high-water lead id
+
+
+def normalize_email(email: Optional[str]) -> Optional[str]:
+    if not isinstance(email, str) or '@' not in email:
+        return None
+    return email.strip().lower()
+
+
+def normalize_company(name: Optional[str]) -> Optional[str]:
+    if not isinstance(name, str):
+        return None
+    words = _PUNCTUATION.sub(' ', name.lower()).split()
+    while len(words) > 1 and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    return ' '.join(words) or None
+
+
+def normalize_domain(website: Optional[str]) -> Optional[str]:
+    return lead_domain(website)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings, serializable to bytes"""
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.001,
+                 num_bits: Optional[int] = None, num_hashes: Optional[int] = None):
+        self.num_bits = num_bits or max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = num_hashes or max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.items = 0
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.items += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def _positions(self, key: str) -> Iterable[int]:
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+
+class DedupIndex:
+    """Leads already held, keyed on normalized email, company name and website domain
+
+    By default the keys live in sets, which answer exactly. With use_bloom the keys
+    go into one Bloom filter instead: memory stays at a few bytes per key for very
+    large sets, at the cost of error_rate false positives (a new company that is
+    wrongly reported as held). The Bloom filter is snapshotted to path so startup
+    only reads leads added since the last save.
+
+    The last refresh of each normalized company is kept next to the keys, so
+    "ACME" finds the time "Acme Inc." was saved. In Bloom mode that covers the
+    leads read since the snapshot and those added in this process.
+    """
+
+    def __init__(self, lead_store: LeadStore, path: str = 'data/dedup_index.bloom', use_bloom: bool = False,
+                 capacity: int = 1_000_000, error_rate: float = 0.001):
+        self.lead_store = lead_store
+        self.path = path
+        self.use_bloom = use_bloom
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._sets = {kind: set() for kind in KINDS}
+        self._bloom: Optional[BloomFilter] = None
+        self._refreshed: Dict[str, datetime] = {}  # Normalized company to its latest updated_at
+        self._high_water = 0  # Highest lead id already in the index
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        if self.use_bloom:
+            self._bloom = self._read_snapshot() or BloomFilter(self.capacity, self.error_rate)
+
+        added = 0
+        for lead_id, name, email, domain, updated_at in self.lead_store.iter_keys(after_id=self._high_water):
+            # The store keeps email and domain normalized already
+            company = normalize_company(name)
+            self._add_keys([(kind, value) for kind, value in zip(KINDS, (email, company, domain)) if value])
+            self._note_refresh(company, updated_at)
+            self._high_water = max(self._high_water, lead_id)
+            added += 1
+
+        logger.info(
+            f"Dedup index loaded ({'bloom' if self.use_bloom else 'exact'}), "
+            f"{added} leads read from the store"
+        )
+
+    def add_lead(self, lead: Lead) -> None:
+        with self._lock:
+            self._add_keys(self._keys(lead.name, lead.email, lead.website))
+            self._note_refresh(normalize_company(lead.name), datetime.now())
+
+    def last_refreshed(self, name: str) -> Optional[datetime]:
+        """When a lead for the normalized company was last saved, None if the index has no time for it"""
+        with self._lock:
+            return self._refreshed.get(normalize_company(name))
+
+    def has_email(self, email: str) -> bool:
+        return self._contains('email', normalize_email(email))
+
+    def has_company(self, name: str) -> bool:
+        return self._contains('company', normalize_company(name))
+
+    def has_domain(self, website: str) -> bool:
+        return self._contains('domain', normalize_domain(website))
+
+    def save(self) -> None:
+        """Snapshot the Bloom filter atomically; exact mode is rebuilt from the store instead"""
+        if not self.use_bloom:
+            return
+
+        with self._lock:
+            header = _BLOOM_HEADER.pack(self._bloom.num_bits, self._bloom.num_hashes,
+                                        self._bloom.items, self._high_water)
+            payload = bytes(self._bloom.bits)
+
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(header)
+                f.write(payload)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Error saving dedup index: {e}")
+
+    def __len__(self) -> int:
+        if self.use_bloom:
+            return self._bloom.items
+        return sum(len(keys) for keys in self._sets.values())
+
+    def _contains(self, kind: str, value: Optional[str]) -> bool:
+        if not value:
+            return False
+        with self._lock:
+            if self.use_bloom:
+                return f"{kind}:{value}" in self._bloom
+            return value in self._sets[kind]
+
+    def _add_keys(self, keys: Iterable[Tuple[str, str]]) -> None:
+        for kind, value in keys:
+            if self.use_bloom:
+                self._bloom.add(f"{kind}:{value}")
+            else:
+                self._sets[kind].add(value)
+
+    def _note_refresh(self, company: Optional[str], updated_at: Optional[datetime]) -> None:
+        if company and updated_at and updated_at > self._refreshed.get(company, datetime.min):
+            self._refreshed[company] = updated_at
+
+    @staticmethod
+    def _keys(name, email, website) -> Iterable[Tuple[str, str]]:
+        keys = zip(KINDS, (normalize_email(email), normalize_company(name), normalize_domain(website)))
+        return [(kind, value) for kind, value in keys if value]
+
+    def _read_snapshot(self) -> Optional[BloomFilter]:
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, 'rb') as f:
+                num_bits, num_hashes, items, high_water = _BLOOM_HEADER.unpack(f.read(_BLOOM_HEADER.size))
+                bloom = BloomFilter(num_bits=num_bits, num_hashes=num_hashes)
+                bits = f.read()
+            if len(bits) != len(bloom.bits):
+                raise ValueError("truncated snapshot")
+            bloom.bits = bytearray(bits)
+            bloom.items = items
+            self._high_water = high_water
+            return bloom
+        except Exception as e:
+            logger.error(f"Error reading dedup snapshot, rebuilding from the store: {e}")
+            self._high_water = 0
+            return None
+
+
+def lead_already_held(index: DedupIndex, company: str, history=None, fresh_ttl: float = 7 * 86400) -> bool:
+    """True when a lead for the company is held and not yet due for a refresh"""
+    if not index.has_company(company):
+        return False
+    # Stale leads the scheduler sent back for a re-scrape still get searched
+    record = history.get(company) if history else None
+    if record is not None:
+        return time.time() - record.last_success < fresh_ttl
+    # Without a history record the last refresh decides. A Bloom hit the index has
+    # no time for goes to the store, which catches a false positive for a company
+    # that was never saved
+    updated_at = index.last_refreshed(company) or index.lead_store.last_updated(company)
+    return updated_at is not None and (datetime.now() - updated_at).total_seconds() < fresh_ttl
+
+
+_shared_index = None
+_shared_index_lock = threading.Lock()
+
+
+def get_dedup_index() -> DedupIndex:
+    """Process-wide dedup index over the shared lead store"""
+    global _shared_index
+    with _shared_index_lock:
+        if _shared_index is None:
+            _shared_index = DedupIndex(
+                get_lead_store(),
+                path=Config.DEDUP_INDEX_FILE,
+                use_bloom=Config.DEDUP_USE_BLOOM,
+                capacity=Config.DEDUP_BLOOM_CAPACITY,
+                error_rate=Config.DEDUP_BLOOM_ERROR_RATE
+            )
+        return _shared_index
@@ -0,0 +1,339 @@
+import threading
+import time
+import random
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from selenium import webdriver
+from src.utils.http_fetcher import USER_AGENTS
+from src.utils.logger import setup_logger
+from src.utils.metrics import DRIVER_STARTUP_SECONDS
+
+logger = setup_logger("driver_pool")
+
+
+def proxy_key(proxy: Optional[Dict[str, str]]) -> str:
+    """Pool key for a proxy configuration"""
+    return proxy['http'] if proxy else 'direct'
+
+
+def create_driver(proxy: Optional[Dict[str, str]] = None) -> webdriver.Chrome:
+    """Start Chrome with stealth options and verify it can reach Google"""
+    start = time.perf_counter()
+    chrome_options = webdriver.ChromeOptions()
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--window-size=1920,1080')
+
+    # Add proxy if configured
+    if proxy:
+        proxy_str = proxy['http'].replace('http://', '')
+        chrome_options.add_argument(f'--proxy-server={proxy_str}')
+        logger.info(f"Using proxy: {proxy_str}")
+
+    # Add stealth options
+    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.add_argument('--disable-notifications')
+
+    # Additional options to handle proxy issues
+    chrome_options.add_argument('--ignore-certificate-errors')
+    chrome_options.add_argument('--ignore-ssl-errors')
+    chrome_options.add_argument('--disable-web-security')
+
+    # Rotate user agents
+    chrome_options.add_argument(f'--user-agent={random.choice(USER_AGENTS)}')
+
+    driver = webdriver.Chrome(options=chrome_options)
+    driver.set_page_load_timeout(30)
+
+    # Test the connection
+    try:
+        driver.get("https://www.google.com")
+        if "google" not in driver.current_url.lower():
+            raise Exception("Failed to connect to Google")
+    except Exception:
+        _quit(driver)
+        raise
+
+    DRIVER_STARTUP_SECONDS.observe(time.perf_counter() - start)
+    return driver
+
+
+def _quit(driver) -> None:
+    try:
+        driver.quit()
+    except:
+        pass
+
+
+def _quit_all(pooled_drivers) -> None:
+    for pooled in pooled_drivers:
+        _quit(pooled.driver)
+
+
+@dataclass
+class _PooledDriver:
+    driver: webdriver.Chrome
+    key: str
+    created: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+    uses: int = 0
+
+
+class DriverPool:
+    """Keeps Chrome instances alive across chunks and cycles, keyed by proxy"""
+
+    def __init__(self, max_size: int = 3, max_uses: int = 20, max_age: int = 3600, max_idle: int = 900):
+        self.max_size = max_size
+        self.max_uses = max_uses  # Checkouts before a driver is recycled
+        self.max_age = max_age  # Seconds before a driver is recycled
+        self.max_idle = max_idle  # Seconds an unused driver is kept around
+        self._idle: Dict[str, List[_PooledDriver]] = {}
+        self._in_use: Dict[int, _PooledDriver] = {}
+        self._starting = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self.stats = {'created': 0, 'reused': 0, 'recycled': 0}
+
+    def checkout(self, proxy: Optional[Dict[str, str]] = None, timeout: Optional[float] = None) -> webdriver.Chrome:
+        """Get a healthy driver for this proxy, starting one if none is idle"""
+        key = proxy_key(proxy)
+        deadline = time.time() + timeout if timeout else None
+
+        while True:
+            candidate, start_new, to_quit = self._reserve(key, deadline)
+            _quit_all(to_quit)
+            if start_new or self.is_healthy(candidate.driver):
+                break
+            logger.warning(f"Discarding unhealthy driver for {key}")
+            with self._condition:
+                self.stats['recycled'] += 1
+                self._starting -= 1
+                self._condition.notify()
+            _quit(candidate.driver)
+
+        if start_new:
+            try:
+                candidate = _PooledDriver(driver=create_driver(proxy), key=key)
+            except Exception:
+                with self._condition:
+                    self._starting -= 1
+                    self._condition.notify()
+                raise
+            logger.info(f"Started new driver for {key}")
+
+        with self._condition:
+            self._starting -= 1
+            self.stats['created' if start_new else 'reused'] += 1
+            candidate.uses += 1
+            candidate.last_used = time.time()
+            self._in_use[id(candidate.driver)] = candidate
+        return candidate.driver
+
+    def checkin(self, driver: webdriver.Chrome, healthy: bool = True) -> None:
+        """Return a driver to the pool, recycling it if broken or worn out"""
+        with self._condition:
+            pooled = self._in_use.pop(id(driver), None)
+            if pooled is not None:
+                pooled.last_used = time.time()
+                # Never park more than max_size drivers, whatever was adopted meanwhile
+                if healthy and not self._closed and not self._worn_out(pooled) and self._size() < self.max_size:
+                    self._idle.setdefault(pooled.key, []).append(pooled)
+                    self._condition.notify()
+                    return
+                self.stats['recycled'] += 1
+            self._condition.notify()
+
+        if pooled is None:
+            logger.warning("Checked in a driver that is not from this pool")
+        else:
+            logger.info(f"Recycling driver for {pooled.key} after {pooled.uses} uses")
+        _quit(driver)
+
+    def adopt(self, driver: webdriver.Chrome, proxy: Optional[Dict[str, str]] = None) -> bool:
+        """Track a driver started outside the pool (e.g. a hot spare) as checked out
+
+        An idle driver is retired to make room when the pool is full. Returns
+        False, leaving the driver to the caller, when every slot is busy.
+        """
+        evicted = None
+        with self._condition:
+            if self._closed:
+                return False
+            if self._size() >= self.max_size:
+                evicted = self._evict_lru()
+            if self._size() >= self.max_size:
+                return False
+            self._in_use[id(driver)] = _PooledDriver(driver=driver, key=proxy_key(proxy), uses=1)
+            self.stats['created'] += 1
+
+        if evicted is not None:
+            logger.info(f"Retired idle driver for {evicted.key} to adopt a spare")
+            _quit(evicted.driver)
+        return True
+
+    @contextmanager
+    def driver(self, proxy: Optional[Dict[str, str]] = None):
+        """Check out a driver for the duration of a with-block"""
+        driver = self.checkout(proxy)
+        healthy = True
+        try:
+            yield driver
+        except Exception:
+            healthy = self.is_healthy(driver)
+            raise
+        finally:
+            self.checkin(driver, healthy=healthy)
+
+    def close(self) -> None:
+        """Quit every idle driver; busy drivers are quit when checked in"""
+        with self._condition:
+            self._closed = True
+            idle = [pooled for drivers in self._idle.values() for pooled in drivers]
+            self._idle.clear()
+            self._condition.notify_all()
+        _quit_all(idle)
+
+    @staticmethod
+    def is_healthy(driver: webdriver.Chrome) -> bool:
+        """Check that the browser session still responds"""
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _reserve(self, key: str, deadline: Optional[float]):
+        """Claim an idle driver or a slot to start one, returns (pooled, start_new, to_quit)"""
+        to_quit = []
+        with self._condition:
+            while True:
+                if self._closed:
+                    _quit_all(to_quit)
+                    raise RuntimeError("Driver pool is closed")
+
+                to_quit.extend(self._evict_expired())
+                drivers = self._idle.get(key)
+                if drivers:
+                    # Counted as starting until the health check passes
+                    self._starting += 1
+                    return drivers.pop(), False, to_quit
+
+                if self._size() >= self.max_size:
+                    evicted = self._evict_lru()
+                    if evicted:
+                        to_quit.append(evicted)
+                if self._size() < self.max_size:
+                    self._starting += 1
+                    return None, True, to_quit
+
+                remaining = deadline - time.time() if deadline else None
+                if remaining is not None and remaining <= 0:
+                    _quit_all(to_quit)
+                    raise TimeoutError("Timed out waiting for a free driver")
+                self._condition.wait(remaining)
+
+    def _evict_lru(self) -> Optional[_PooledDriver]:
+        """Make room by dropping the least recently used idle driver of any key"""
+        candidates = [pooled for drivers in self._idle.values() for pooled in drivers]
+        if not candidates:
+            return None
+        oldest = min(candidates, key=lambda pooled: pooled.last_used)
+        self._idle[oldest.key].remove(oldest)
+        self.stats['recycled'] += 1
+        return oldest
+
+    def _evict_expired(self) -> List[_PooledDriver]:
+        now = time.time()
+        expired = []
+        for drivers in self._idle.values():
+            for pooled in list(drivers):
+                if self._worn_out(pooled) or now - pooled.last_used > self.max_idle:
+                    drivers.remove(pooled)
+                    expired.append(pooled)
+        self.stats['recycled'] += len(expired)
+        return expired
+
+    def _worn_out(self, pooled: _PooledDriver) -> bool:
+        return pooled.uses >= self.max_uses or time.time() - pooled.created > self.max_age
+
+    def _size(self) -> int:
+        return sum(len(drivers) for drivers in self._idle.values()) + len(self._in_use) + self._starting
+
+
+class HotSpareDriver:
+    """A browser prepared in the background on the next proxy, ready to swap in
+
+    Rotating a proxy then costs a health check instead of a Chrome start and a
+    google.com probe. The spare is rebuilt asynchronously after every swap.
+    """
+
+    def __init__(self, proxy_manager, max_age: int = 1800, retry_delay: int = 30):
+        self.proxy_manager = proxy_manager
+        self.max_age = max_age  # Seconds before an unused spare is rebuilt
+        self.retry_delay = retry_delay  # Pause after a failed preparation
+        self._spare: Optional[_PooledDriver] = None
+        self._proxy: Optional[Dict[str, str]] = None
+        self._preparing = False
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Begin preparing a spare in the background"""
+        self._replenish()
+
+    def take(self):
+        """Return (driver, proxy) if a verified spare is ready, else None"""
+        with self._lock:
+            spare, proxy = self._spare, self._proxy
+            self._spare, self._proxy = None, None
+
+        if spare is not None and (time.time() - spare.created > self.max_age or not DriverPool.is_healthy(spare.driver)):
+            logger.info(f"Discarding stale spare driver for {spare.key}")
+            _quit(spare.driver)
+            spare = None
+
+        self._replenish()
+        if spare is None:
+            return None
+        return spare.driver, proxy
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            spare, self._spare = self._spare, None
+        if spare is not None:
+            _quit(spare.driver)
+
+    def _replenish(self) -> None:
+        with self._lock:
+            if self._closed or self._preparing or self._spare is not None:
+                return
+            self._preparing = True
+        threading.Thread(target=self._prepare, name="hot-spare-driver", daemon=True).start()
+
+    def _prepare(self) -> None:
+        start = time.time()
+        spare = None
+        proxy = None
+        try:
+            proxy = self.proxy_manager.get_next_proxy() if self.proxy_manager else None
+            spare = _PooledDriver(driver=create_driver(proxy), key=proxy_key(proxy))
+            logger.info(f"Spare driver ready on {spare.key} after {time.time() - start:.1f}s")
+        except Exception as e:
+            logger.error(f"Failed to prepare spare driver: {str(e)}")
+
+        with self._lock:
+            self._preparing = False
+            if spare is not None and not self._closed:
+                self._spare, self._proxy = spare, proxy
+                return
+
+        if spare is not None:
+            _quit(spare.driver)
+        elif not self._closed:
+            # Try again later rather than hammering a dead proxy list
+            timer = threading.Timer(self.retry_delay, self._replenish)
+            timer.daemon = True
+            timer.start()
@@ -0,0 +1,93 @@
+import hashlib
+import os
+from typing import Iterable, Optional, Tuple
+from fastapi import Request, Response
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+
+# Cached copies may be kept but must be revalidated, which costs a 304 when nothing changed
+REVALIDATE = 'no-cache'
+
+# Media types worth gzipping; event streams must flush per event and the rest are binary or compressed already
+COMPRESSIBLE_TYPES = frozenset({
+    'text/html', 'text/plain', 'text/css', 'text/csv', 'text/javascript', 'application/javascript',
+    'application/json', 'application/x-ndjson', 'image/svg+xml',
+})
+
+
+def make_etag(*parts) -> str:
+    """Weak validator over the values a response is built from
+
+    Weak because the same content is sent gzipped or not, so the bytes differ.
+    """
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def file_version(path: str) -> Optional[Tuple[int, int]]:
+    """mtime and size of a snapshot file, or None if it does not exist yet"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check, using weak comparison as RFC 9110 requires"""
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    opaque = etag.removeprefix('W/')
+    return any(tag.strip().removeprefix('W/') == opaque for tag in header.split(','))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={'ETag': etag, 'Cache-Control': REVALIDATE})
+
+
+def cache_headers(response: Response, etag: str) -> Response:
+    response.headers['ETag'] = etag
+    response.headers['Cache-Control'] = REVALIDATE
+    return response
+
+
+def compressible(content_type: Optional[str]) -> bool:
+    media_type = (content_type or '').split(';')[0].strip().lower()
+    return media_type in COMPRESSIBLE_TYPES
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """GZip text responses except on paths that must not be buffered or are compressed already
+
+    Whether a response is compressed is decided from its Content-Type once it
+    starts, so an event stream or a gzipped download passes through untouched
+    even on a path that is not excluded.
+    """
+
+    def __init__(self, app, minimum_size: int = 1000, compresslevel: int = 6, exclude: Iterable[str] = ()):
+        super().__init__(app, minimum_size=minimum_size, compresslevel=compresslevel)
+        self.exclude = frozenset(exclude)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if (scope['type'] != 'http' or scope['path'] in self.exclude
+                or 'gzip' not in Headers(scope=scope).get('Accept-Encoding', '')):
+            await self.app(scope, receive, send)
+            return
+
+        responder = GZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+        responder.send = send
+        compress = False
+
+        async def send_selectively(message) -> None:
+            nonlocal compress
+            if message['type'] == 'http.response.start':
+                compress = compressible(Headers(raw=message['headers']).get('content-type'))
+            if compress:
+                await responder.send_with_gzip(message)
+            else:
+                await send(message)
+
+        await self.app(scope, receive, send_selectively)
@@ -0,0 +1,205 @@
+import time
+import random
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from urllib.parse import urljoin
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, Comment
+from src.utils.logger import setup_logger
+
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0'
+]
+
+# Markers of client-side rendered pages that need a real browser
+JS_APP_MARKERS = [
+    'id="root"></div>',
+    'id="app"></div>',
+    'id="__next"',
+    'ng-app',
+    'data-reactroot',
+]
+
+JS_REQUIRED_TEXT = [
+    'enable javascript',
+    'javascript is required',
+    'javascript is disabled',
+    'requires javascript',
+]
+
+HIDDEN_TAGS = {'script', 'style', 'noscript', 'template', 'head', 'title', '[document]'}
+
+# Pages with less visible text than this are assumed to be rendered by scripts
+MIN_VISIBLE_TEXT = 200
+
+
+@dataclass
+class FetchedPage:
+    url: str
+    final_url: str
+    status_code: int
+    html: str
+    fetched_at: float
+    from_cache: bool = False
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class HttpFetcher:
+    """Lightweight page fetcher backed by a pooled requests.Session"""
+
+    def __init__(self, proxy: Optional[Dict[str, str]] = None, timeout: int = 10, pool_size: int = 10,
+                 cache=None, rate_limiter=None):
+        self.logger = setup_logger("http_fetcher")
+        self.timeout = timeout
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.session = requests.Session()
+
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'User-Agent': random.choice(USER_AGENTS),
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.9'
+        })
+        self.set_proxy(proxy)
+
+    def set_proxy(self, proxy: Optional[Dict[str, str]]) -> None:
+        """Route subsequent requests through the given proxy"""
+        self.session.proxies = dict(proxy) if proxy else {}
+
+    def fetch(self, url: str) -> Optional[FetchedPage]:
+        """Fetch a page, serving it from the response cache when fresh"""
+        if self.cache:
+            cached = self.cache.get(url)
+            if cached:
+                return FetchedPage(
+                    url=url,
+                    final_url=cached.final_url,
+                    status_code=cached.status_code,
+                    html=cached.body,
+                    fetched_at=cached.fetched_at,
+                    from_cache=True,
+                    etag=cached.etag,
+                    last_modified=cached.last_modified
+                )
+
+        return self._get(url)
+
+    def revalidate(self, url: str, etag: Optional[str] = None,
+                   last_modified: Optional[str] = None) -> Optional[FetchedPage]:
+        """Conditional GET that bypasses the cache; a 304 status means the page is unchanged"""
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return self._get(url, headers)
+
+    def _get(self, url: str, headers: Optional[Dict[str, str]] = None) -> Optional[FetchedPage]:
+        if self.rate_limiter:
+            self.rate_limiter.acquire(url)
+
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout, allow_redirects=True)
+        except requests.RequestException as e:
+            self.logger.warning(f"HTTP fetch failed for {url}: {str(e)}")
+            if self.rate_limiter:
+                self.rate_limiter.report_error(url)
+            return None
+
+        if self.rate_limiter:
+            if response.status_code in (403, 429, 503):
+                self.rate_limiter.report_block(url)
+            else:
+                self.rate_limiter.report_success(url)
+
+        content_type = response.headers.get('Content-Type', '')
+        html = response.text if 'html' in content_type.lower() else ''
+
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if self.cache and response.status_code == 200 and html:
+            self.cache.put(url, html, final_url=response.url, etag=etag, last_modified=last_modified)
+
+        return FetchedPage(
+            url=url,
+            final_url=response.url,
+            status_code=response.status_code,
+            html=html,
+            fetched_at=time.time(),
+            etag=etag,
+            last_modified=last_modified
+        )
+
+    def close(self) -> None:
+        """Release pooled connections"""
+        self.session.close()
+
+
+def parse_html(html: str) -> BeautifulSoup:
+    """Parse a page once so the helpers below can share the tree"""
+    return BeautifulSoup(html or '', 'html.parser')
+
+
+def extract_email(soup: BeautifulSoup) -> Optional[str]:
+    """Return the first mailto address found in the page"""
+    for link in soup.find_all('a', href=True):
+        href = link['href'].strip()
+        if href.lower().startswith('mailto:'):
+            email = href[len('mailto:'):].split('?')[0].strip()
+            if email:
+                return email
+    return None
+
+
+def find_contact_link(soup: BeautifulSoup, base_url: str) -> Optional[str]:
+    """Return the absolute URL of the first link mentioning 'contact'"""
+    for link in soup.find_all('a', href=True):
+        if 'contact' in link.get_text().lower():
+            return urljoin(base_url, link['href'])
+    return None
+
+
+def find_page_links(soup: BeautifulSoup, base_url: str, keywords=('contact', 'about')) -> List[str]:
+    """Return absolute URLs of links whose text mentions any keyword, in keyword order"""
+    found = {keyword: [] for keyword in keywords}
+    for link in soup.find_all('a', href=True):
+        text = link.get_text().lower()
+        for keyword in keywords:
+            if keyword in text:
+                found[keyword].append(urljoin(base_url, link['href']))
+                break
+
+    links = []
+    for keyword in keywords:
+        for url in found[keyword]:
+            if url not in links:
+                links.append(url)
+    return links
+
+
+def needs_javascript(html: str, soup: BeautifulSoup) -> bool:
+    """Guess whether the page only renders its content with JavaScript"""
+    if not html:
+        return True
+
+    visible_text = ' '.join(
+        text.strip() for text in soup.find_all(string=True)
+        if not isinstance(text, Comment) and text.parent.name not in HIDDEN_TAGS and text.strip()
+    )
+    if len(visible_text) < MIN_VISIBLE_TEXT:
+        return True
+
+    # Thin pages that announce a script-driven app are not worth parsing
+    lowered = html.lower()
+    looks_like_app = (
+        any(marker in lowered for marker in JS_APP_MARKERS)
+        or any(text in lowered for text in JS_REQUIRED_TEXT)
+    )
+    return looks_like_app and len(visible_text) < MIN_VISIBLE_TEXT * 5
@@ -0,0 +1,205 @@
+import argparse
+import json
+import os
+import shutil
+from datetime import date
+from typing import List, Optional
+import pandas as pd
+from src.config import Config
+from src.utils.logger import setup_logger
+
+logger = setup_logger("lead_archive")
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    ds = None
+    pq = None
+
+LEAD_DTYPES = {
+    'name': 'string',
+    'email': 'string',
+    'platform': 'category',
+    'category': 'category',
+    'website': 'string',
+    'description': 'string',
+    'location': 'string',
+}
+
+# Key a lead is identified by, shared with the lead store
+LEAD_KEY = ['name', 'email']
+
+STATE_FILE = '_state.json'
+PART_FILE = 'part-0.parquet'
+
+
+def _parse_timestamps(values: pd.Series) -> pd.Series:
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    try:
+        # Leads are written with isoformat(), which parses far faster than format='mixed'
+        return pd.to_datetime(values, format='ISO8601')
+    except (ValueError, TypeError):
+        return pd.to_datetime(values, errors='coerce', format='mixed')
+
+
+def archive_available() -> bool:
+    return pa is not None
+
+
+class LeadArchive:
+    """Leads as Parquet files partitioned by scrape date (root/date=YYYY-MM-DD/part-0.parquet)
+
+    Compaction only rewrites the partitions that received new or refreshed leads,
+    and readers load just the columns and dates they ask for.
+    """
+
+    def __init__(self, root: str = 'data/archive'):
+        if pa is None:
+            raise ImportError("pyarrow is required for the lead archive (pip install pyarrow)")
+        self.root = root
+
+    def compact(self, lead_store) -> int:
+        """Archive leads the store inserted or refreshed since the last compaction"""
+        state = self._read_state()
+        watermark = pd.Timestamp(state['updated_at']).to_pydatetime() if state.get('updated_at') else None
+
+        changes = lead_store.changes_since(watermark)
+        if changes.empty:
+            return 0
+
+        written = self.write_frame(changes.drop(columns=['updated_at']))
+        self._write_state({'updated_at': changes['updated_at'].max().isoformat()})
+        return written
+
+    def convert_csv(self, csv_path: str, chunksize: int = 1_000_000) -> int:
+        """Archive a legacy leads CSV, reading it in chunks"""
+        written = 0
+        for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+            written += self.write_frame(chunk)
+        return written
+
+    def write_frame(self, df: pd.DataFrame) -> int:
+        """Merge leads into their date partitions, keeping the newest row per lead"""
+        df = self._normalize(df)
+        if df.empty:
+            return 0
+
+        for day, rows in df.groupby(df['timestamp'].dt.date, sort=True):
+            path = self._partition_path(day)
+            if os.path.exists(path):
+                rows = pd.concat([self._normalize(pd.read_parquet(path)), rows], ignore_index=True)
+            rows = rows.sort_values('timestamp').drop_duplicates(subset=LEAD_KEY, keep='last')
+            self._write_partition(path, rows)
+
+        logger.info(f"Archived {len(df)} leads into {df['timestamp'].dt.date.nunique()} partitions")
+        return len(df)
+
+    def read(self, columns: Optional[List[str]] = None, start: Optional[date] = None,
+             end: Optional[date] = None, latest_only: bool = True) -> pd.DataFrame:
+        """Load leads with only the requested columns, from partitions in [start, end]
+
+        A refreshed lead can sit in an older partition as well as its newest one;
+        latest_only keeps just the newest row per lead.
+        """
+        partitions = self.partitions(start, end)
+        wanted = list(columns) if columns else None
+        if wanted and latest_only:
+            load = list(dict.fromkeys(wanted + LEAD_KEY + ['timestamp']))
+        else:
+            load = wanted
+
+        if not partitions:
+            return pd.DataFrame(columns=wanted or list(LEAD_DTYPES) + ['timestamp'])
+
+        # One dataset scan over the selected files reads them in parallel and unifies categories
+        paths = [self._partition_path(day) for day in partitions]
+        df = ds.dataset(paths, format='parquet').to_table(columns=load).to_pandas()
+        if latest_only and len(partitions) > 1:
+            df = df.sort_values('timestamp').drop_duplicates(subset=LEAD_KEY, keep='last')
+        return df[wanted] if wanted else df
+
+    def partitions(self, start: Optional[date] = None, end: Optional[date] = None) -> List[date]:
+        if not os.path.isdir(self.root):
+            return []
+        days = []
+        for entry in os.listdir(self.root):
+            if not entry.startswith('date='):
+                continue
+            day = date.fromisoformat(entry[len('date='):])
+            if (start is None or day >= start) and (end is None or day <= end):
+                days.append(day)
+        return sorted(days)
+
+    def clear(self) -> None:
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    @staticmethod
+    def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+        df = df.copy()
+        df['timestamp'] = _parse_timestamps(df['timestamp'])
+        df = df.dropna(subset=LEAD_KEY + ['timestamp'])
+        for column, dtype in LEAD_DTYPES.items():
+            if column not in df:
+                df[column] = None
+            df[column] = df[column].astype(dtype)
+        return df[list(LEAD_DTYPES) + ['timestamp']]
+
+    def _partition_path(self, day: date) -> str:
+        return os.path.join(self.root, f"date={day.isoformat()}", PART_FILE)
+
+    @staticmethod
+    def _write_partition(path: str, df: pd.DataFrame) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp_path, compression='snappy')
+        os.replace(tmp_path, path)
+
+    def _read_state(self) -> dict:
+        try:
+            with open(os.path.join(self.root, STATE_FILE), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_state(self, state: dict) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, STATE_FILE)
+        with open(f"{path}.tmp", 'w') as f:
+            json.dump(state, f)
+        os.replace(f"{path}.tmp", path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and inspect the Parquet lead archive")
+    parser.add_argument('--root', default=Config.ARCHIVE_DIR, help="Archive directory")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    convert = commands.add_parser('convert', help="Archive a legacy leads CSV")
+    convert.add_argument('csv', nargs='?', default=Config.LEADS_CSV_FILE)
+    commands.add_parser('compact', help="Archive leads added to the lead store since the last compaction")
+    commands.add_parser('rebuild', help="Drop the archive and rebuild it from the lead store")
+    commands.add_parser('info', help="Show partitions and row counts")
+
+    args = parser.parse_args()
+    archive = LeadArchive(args.root)
+
+    if args.command == 'convert':
+        logger.info(f"Converted {archive.convert_csv(args.csv)} rows from {args.csv}")
+    elif args.command in ('compact', 'rebuild'):
+        from src.utils.lead_store import get_lead_store
+        if args.command == 'rebuild':
+            archive.clear()
+        logger.info(f"Archived {archive.compact(get_lead_store())} leads")
+    else:
+        partitions = archive.partitions()
+        rows = len(archive.read(columns=['name'], latest_only=False))
+        span = f"{partitions[0]} to {partitions[-1]}" if partitions else "empty"
+        logger.info(f"{len(partitions)} partitions ({span}), {rows} rows")
+
+
+if __name__ == "__main__":
+    main()
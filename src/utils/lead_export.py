@@ -0,0 +1,60 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List
+
+# Export formats and their media types
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+# Bytes buffered before a chunk is sent
+CHUNK_BYTES = 64 * 1024
+
+
+def _value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def encode_leads(rows: Iterable[Dict], columns: List[str], fmt: str = 'ndjson',
+                 compress: bool = False) -> Iterator[bytes]:
+    """Encode leads incrementally as NDJSON or CSV, optionally gzipped
+
+    Only one chunk is held at a time, so memory stays flat however many rows
+    the iterator yields.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}', expected one of {', '.join(EXPORT_FORMATS)}")
+
+    # wbits=31 writes a gzip header and trailer around the deflate stream
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == 'csv' else None
+    if writer:
+        writer.writerow(columns)
+
+    def drain() -> bytes:
+        data = buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+        return compressor.compress(data) if compressor else data
+
+    for row in rows:
+        if writer:
+            writer.writerow([_value(row.get(column)) for column in columns])
+        else:
+            buffer.write(json.dumps({column: _value(row.get(column)) for column in columns}))
+            buffer.write('\n')
+        if buffer.tell() >= CHUNK_BYTES:
+            chunk = drain()
+            if chunk:
+                yield chunk
+
+    chunk = drain()
+    if compressor:
+        chunk += compressor.flush()
+    if chunk:
+        yield chunk
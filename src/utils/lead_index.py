@@ -0,0 +1,140 @@
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from src.config import Config
+from src.utils.lead_store import LEAD_COLUMNS, get_lead_store
+from src.utils.logger import setup_logger
+
+logger = setup_logger("lead_index")
+
+# Changes are re-read this far behind the watermark: updated_at is stamped before the
+# commit, so a second writer's transaction can land a row just under the newest one seen
+REFRESH_OVERLAP = timedelta(seconds=1)
+
+
+class LeadIndex:
+    """Leads held in memory newest first, kept current by tailing the store
+
+    The first refresh loads every lead; later refreshes only read rows whose
+    updated_at moved past the watermark. Pages and platform counts are served
+    from memory, so a page costs its size rather than the size of the store.
+    """
+
+    def __init__(self, lead_store=None, refresh_interval: float = 2.0):
+        self.lead_store = lead_store or get_lead_store()
+        self.refresh_interval = refresh_interval
+        self._leads: Dict[Tuple[str, str], Dict] = {}  # (name, email) to lead
+        self._order: List[Tuple[datetime, int]] = []  # (timestamp, id), oldest first
+        self._by_order: Dict[Tuple[datetime, int], Dict] = {}
+        self._platforms: Counter = Counter()
+        self._watermark: Optional[datetime] = None
+        self._last_refresh = 0.0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def total(self) -> int:
+        self.refresh()
+        return len(self._order)
+
+    @property
+    def version(self) -> str:
+        """Changes whenever a lead is added or updated; the same in every process tailing the store"""
+        self.refresh()
+        with self._lock:
+            watermark = self._watermark.isoformat() if self._watermark else ''
+            return f"{len(self._order)}:{watermark}"
+
+    def platform_counts(self) -> Dict[str, int]:
+        self.refresh()
+        with self._lock:
+            return dict(self._platforms)
+
+    def page(self, offset: int = 0, limit: int = 100) -> List[Dict]:
+        """Leads newest first, like LeadStore.recent()"""
+        self.refresh()
+        with self._lock:
+            end = len(self._order) - offset
+            keys = self._order[max(0, end - limit):max(0, end)]
+            return [self._public(self._by_order[key]) for key in reversed(keys)]
+
+    def refresh(self, force: bool = False) -> int:
+        """Apply leads changed since the last refresh, at most once per refresh_interval"""
+        if not force and time.time() - self._last_refresh < self.refresh_interval:
+            return 0
+        # One refresh at a time; once loaded, concurrent requests serve the current state instead of waiting
+        if not self._refresh_lock.acquire(blocking=force or self._watermark is None):
+            return 0
+        try:
+            start = time.time()
+            initial = self._watermark is None
+            since = None if initial else self._watermark - REFRESH_OVERLAP
+            try:
+                changes = list(self.lead_store.iter_changes(since))
+            except Exception as e:
+                logger.error(f"Error refreshing lead index: {e}")
+                return 0
+            self._last_refresh = time.time()
+
+            applied = 0
+            with self._lock:
+                for lead in changes:
+                    applied += self._apply(lead, bulk=initial)
+                    if self._watermark is None or lead['updated_at'] > self._watermark:
+                        self._watermark = lead['updated_at']
+                if initial:
+                    self._order.sort()
+
+            if initial:
+                logger.info(f"Loaded {len(self._order)} leads into the index in {time.time() - start:.2f}s")
+            return applied
+        finally:
+            self._refresh_lock.release()
+
+    def _apply(self, lead: Dict, bulk: bool) -> int:
+        key = (lead['name'], lead['email'])
+        current = self._leads.get(key)
+        if current is not None:
+            if current['updated_at'] >= lead['updated_at'] and current['id'] == lead['id']:
+                return 0  # Re-read inside the overlap window
+            self._remove(current)
+
+        self._leads[key] = lead
+        order_key = (lead['timestamp'], lead['id'])
+        self._by_order[order_key] = lead
+        if bulk:
+            self._order.append(order_key)
+        else:
+            insort(self._order, order_key)
+        self._platforms[lead['platform']] += 1
+        return 1
+
+    def _remove(self, lead: Dict) -> None:
+        order_key = (lead['timestamp'], lead['id'])
+        position = bisect_left(self._order, order_key)
+        if position < len(self._order) and self._order[position] == order_key:
+            del self._order[position]
+        self._by_order.pop(order_key, None)
+        self._platforms[lead['platform']] -= 1
+        if self._platforms[lead['platform']] <= 0:
+            del self._platforms[lead['platform']]
+
+    @staticmethod
+    def _public(lead: Dict) -> Dict:
+        return {column: lead[column] for column in LEAD_COLUMNS}
+
+
+_shared_index = None
+_shared_index_lock = threading.Lock()
+
+
+def get_lead_index() -> LeadIndex:
+    """Process-wide index over the shared lead store, used by the dashboard"""
+    global _shared_index
+    with _shared_index_lock:
+        if _shared_index is None:
+            _shared_index = LeadIndex(get_lead_store(), Config.LEAD_INDEX_REFRESH)
+        return _shared_index
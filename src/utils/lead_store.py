@@ -0,0 +1,394 @@
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+import pandas as pd
+from sqlalchemy import (
+    Column, DateTime, Index, Integer, MetaData, String, Table, Text, UniqueConstraint,
+    and_, create_engine, delete, event, func, or_, select
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from src.config import Config
+from src.models.lead import Lead
+from src.utils.logger import setup_logger
+
+logger = setup_logger("lead_store")
+
+LEAD_COLUMNS = ['name', 'email', 'platform', 'category', 'website', 'description', 'location', 'timestamp']
+
+metadata = MetaData()
+
+leads_table = Table(
+    'leads', metadata,
+    Column('id', Integer, primary_key=True, autoincrement=True),
+    Column('name', String(255), nullable=False),
+    Column('email', String(255), nullable=False),
+    Column('platform', String(50)),
+    Column('category', String(50)),
+    Column('website', Text),
+    Column('domain', String(255)),
+    Column('description', Text),
+    Column('location', String(255)),
+    Column('timestamp', DateTime, nullable=False),
+    Column('updated_at', DateTime, nullable=False),
+    UniqueConstraint('name', 'email', name='uq_leads_name_email'),
+    Index('ix_leads_email', 'email'),
+    Index('ix_leads_domain', 'domain'),
+    Index('ix_leads_timestamp', 'timestamp'),
+    Index('ix_leads_updated_at', 'updated_at'),
+)
+
+# Columns a page of leads can be sorted on; each is indexed, with id breaking ties
+SORTABLE_COLUMNS = ('timestamp', 'updated_at', 'name')
+
+# SQLite synchronous level per fsync policy: every commit, only at WAL checkpoints, or never
+FSYNC_POLICIES = {
+    'commit': 'FULL',
+    'checkpoint': 'NORMAL',
+    'off': 'OFF',
+}
+
+# Dialects with a native INSERT ... ON CONFLICT DO UPDATE
+_UPSERT_INSERTS = {
+    'sqlite': sqlite.insert,
+    'postgresql': postgresql.insert,
+}
+
+
+def lead_domain(website: Optional[str]) -> Optional[str]:
+    """Host of a lead's website without a leading www."""
+    if not isinstance(website, str) or not website:
+        return None
+    host = urlparse(website if '://' in website else f'http://{website}').netloc.lower().split(':')[0]
+    return host[4:] if host.startswith('www.') else host or None
+
+
+def _local_naive(value: datetime) -> datetime:
+    """Timestamps are stored as naive local time, so aware values are converted before they reach the database"""
+    if value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+
+def _blank_to_none(value):
+    """Empty text is stored as NULL, so a later upsert's coalesce keeps the known value"""
+    if isinstance(value, str) and not value.strip():
+        return None
+    return value
+
+
+class LeadStore:
+    """Lead repository on Config.DATABASE_URL with batched, transactional upserts
+
+    A lead is identified by (name, email); saving it again refreshes the row
+    instead of adding a duplicate.
+    """
+
+    def __init__(self, url: str = 'sqlite:///data/leads.db', batch_size: int = 500,
+                 import_csv: Optional[str] = None, fsync_policy: str = 'checkpoint'):
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy '{fsync_policy}', expected one of {', '.join(FSYNC_POLICIES)}")
+        self.url = url
+        self.batch_size = batch_size
+        self.fsync_policy = fsync_policy
+        self.engine = self._create_engine(url, FSYNC_POLICIES[fsync_policy])
+        metadata.create_all(self.engine)
+        # create_all skips tables that already exist, so indexes added later are created here
+        for index in leads_table.indexes:
+            index.create(self.engine, checkfirst=True)
+
+        if import_csv and self.count() == 0 and os.path.exists(import_csv):
+            self.import_csv(import_csv)
+
+    def upsert(self, leads: Iterable[Lead]) -> int:
+        """Insert or refresh leads in one transaction, returns the number of new leads
+
+        Rows that only refreshed a lead already in the store are not counted.
+        """
+        rows = self._dedupe([self._to_row(lead) for lead in leads])
+        if not rows:
+            return 0
+
+        inserted = 0
+        with self.engine.begin() as conn:
+            for start in range(0, len(rows), self.batch_size):
+                batch = rows[start:start + self.batch_size]
+                inserted += len(batch) - self._count_existing(conn, batch)
+                insert = _UPSERT_INSERTS.get(self.engine.dialect.name)
+                if insert:
+                    stmt = insert(leads_table)
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=['name', 'email'],
+                        set_={
+                            # Keep known details when a later scrape comes back without them
+                            column: func.coalesce(getattr(stmt.excluded, column), leads_table.c[column])
+                            for column in ('platform', 'category', 'website', 'domain', 'description',
+                                           'location', 'timestamp', 'updated_at')
+                        }
+                    )
+                    conn.execute(stmt, batch)
+                else:
+                    # Portable fallback: replace existing rows inside the same transaction
+                    for row in batch:
+                        conn.execute(delete(leads_table).where(
+                            (leads_table.c.name == row['name']) & (leads_table.c.email == row['email'])
+                        ))
+                    conn.execute(leads_table.insert(), batch)
+
+        return inserted
+
+    def count(self, since: Optional[datetime] = None) -> int:
+        query = select(func.count()).select_from(leads_table)
+        if since is not None:
+            query = query.where(leads_table.c.timestamp > since)
+        with self.engine.connect() as conn:
+            return conn.execute(query).scalar_one()
+
+    def last_updated(self, name: str) -> Optional[datetime]:
+        """When a lead for the company was last inserted or refreshed, None if none is held"""
+        query = select(func.max(leads_table.c.updated_at)).where(leads_table.c.name == name)
+        with self.engine.connect() as conn:
+            return conn.execute(query).scalar_one()
+
+    def last_timestamp(self) -> Optional[datetime]:
+        with self.engine.connect() as conn:
+            return conn.execute(select(func.max(leads_table.c.timestamp))).scalar_one()
+
+    def recent(self, limit: Optional[int] = None, since: Optional[datetime] = None) -> List[Dict]:
+        """Leads as dicts, newest first"""
+        query = select(*[leads_table.c[column] for column in LEAD_COLUMNS]).order_by(
+            leads_table.c.timestamp.desc(), leads_table.c.id.desc()
+        )
+        if since is not None:
+            query = query.where(leads_table.c.timestamp > since)
+        if limit is not None:
+            query = query.limit(limit)
+        with self.engine.connect() as conn:
+            return [dict(row._mapping) for row in conn.execute(query)]
+
+    def query(self, columns: Optional[List[str]] = None, sort: str = 'timestamp', descending: bool = True,
+              after: Optional[Tuple] = None, limit: int = 50, **filters) -> Tuple[List[Dict], Optional[Tuple]]:
+        """One page of leads matching the filters, and the key to pass as after for the next page
+
+        Pages are keyed on (sort column, id) rather than offsets, so every page
+        is an index range scan no matter how deep into the results it is.
+        filters are the keyword arguments of _filter().
+        """
+        if sort not in SORTABLE_COLUMNS:
+            raise ValueError(f"Cannot sort on '{sort}', expected one of {', '.join(SORTABLE_COLUMNS)}")
+        sort_column = leads_table.c[sort]
+        id_column = leads_table.c.id
+
+        query = self._filter(select(
+            *[leads_table.c[column] for column in (columns or LEAD_COLUMNS)],
+            sort_column.label('_sort'), id_column.label('_id')
+        ), **filters)
+        if after is not None:
+            value, last_id = after
+            if descending:
+                query = query.where(or_(sort_column < value, and_(sort_column == value, id_column < last_id)))
+            else:
+                query = query.where(or_(sort_column > value, and_(sort_column == value, id_column > last_id)))
+
+        if descending:
+            query = query.order_by(sort_column.desc(), id_column.desc())
+        else:
+            query = query.order_by(sort_column.asc(), id_column.asc())
+
+        # One extra row tells whether another page follows
+        with self.engine.connect() as conn:
+            rows = [dict(row._mapping) for row in conn.execute(query.limit(limit + 1))]
+
+        next_key = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_key = (rows[-1]['_sort'], rows[-1]['_id'])
+        for row in rows:
+            del row['_sort'], row['_id']
+        return rows, next_key
+
+    def stream(self, columns: Optional[List[str]] = None, chunk_size: int = 5000, **filters) -> Iterator[Dict]:
+        """Every lead matching the filters in insertion order, fetched chunk_size rows at a time"""
+        query = self._filter(select(*[leads_table.c[column] for column in (columns or LEAD_COLUMNS)]), **filters)
+        with self.engine.connect() as conn:
+            result = conn.execution_options(yield_per=chunk_size).execute(query.order_by(leads_table.c.id))
+            for row in result:
+                yield dict(row._mapping)
+
+    def recent_companies(self, hours: int = 24, limit: int = 10) -> List[str]:
+        since = datetime.now() - timedelta(hours=hours)
+        return [lead['name'] for lead in reversed(self.recent(limit=limit, since=since))]
+
+    def iter_keys(self, after_id: int = 0, chunk_size: int = 10000) -> Iterator[Tuple]:
+        """Stream (id, name, email, domain, updated_at) for leads with id above after_id"""
+        query = select(
+            leads_table.c.id, leads_table.c.name, leads_table.c.email, leads_table.c.domain, leads_table.c.updated_at
+        ).where(leads_table.c.id > after_id).order_by(leads_table.c.id)
+        with self.engine.connect() as conn:
+            result = conn.execution_options(yield_per=chunk_size).execute(query)
+            for row in result:
+                yield tuple(row)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        with self.engine.connect() as conn:
+            df = pd.read_sql(
+                select(*[leads_table.c[column] for column in LEAD_COLUMNS]).order_by(leads_table.c.id),
+                conn
+            )
+        return df
+
+    def changes_since(self, updated_after: Optional[datetime] = None) -> pd.DataFrame:
+        """Leads inserted or refreshed after updated_after, with their updated_at"""
+        query = select(*[leads_table.c[column] for column in LEAD_COLUMNS], leads_table.c.updated_at).order_by(
+            leads_table.c.updated_at
+        )
+        if updated_after is not None:
+            query = query.where(leads_table.c.updated_at > updated_after)
+        with self.engine.connect() as conn:
+            return pd.read_sql(query, conn)
+
+    def iter_changes(self, updated_after: Optional[datetime] = None, chunk_size: int = 10000) -> Iterator[Dict]:
+        """Stream leads inserted or refreshed after updated_after as dicts with id and updated_at"""
+        query = select(leads_table.c.id, *[leads_table.c[column] for column in LEAD_COLUMNS],
+                       leads_table.c.updated_at).order_by(leads_table.c.updated_at)
+        if updated_after is not None:
+            query = query.where(leads_table.c.updated_at > updated_after)
+        with self.engine.connect() as conn:
+            result = conn.execution_options(yield_per=chunk_size).execute(query)
+            for row in result:
+                yield dict(row._mapping)
+
+    def export_csv(self, path: str = 'data/google_leads.csv') -> int:
+        """Write every lead to a CSV in the legacy column layout, returns the row count"""
+        df = self.to_dataframe()
+        df['timestamp'] = df['timestamp'].map(lambda ts: ts.isoformat() if pd.notna(ts) else None)
+
+        tmp_path = f"{path}.tmp"
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        df.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        return len(df)
+
+    def import_csv(self, path: str) -> int:
+        """Load leads from a legacy CSV, returns the number of rows stored"""
+        try:
+            df = pd.read_csv(path)
+            df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce', format='mixed')
+            df = df.dropna(subset=['name', 'email'])
+            df = df.astype(object).where(pd.notna(df), None)
+            leads = [
+                Lead(**{column: row.get(column) for column in LEAD_COLUMNS})
+                for row in df.to_dict('records')
+            ]
+            stored = self.upsert(leads)
+            logger.info(f"Imported {stored} leads from {path}")
+            return stored
+        except Exception as e:
+            logger.error(f"Error importing leads from {path}: {e}")
+            return 0
+
+    def close(self) -> None:
+        self.engine.dispose()
+
+    @staticmethod
+    def _filter(query, platform: Optional[str] = None, category: Optional[str] = None,
+                since: Optional[datetime] = None, until: Optional[datetime] = None, domain: Optional[str] = None,
+                has_website: Optional[bool] = None):
+        """Narrow a leads query; since is inclusive and until exclusive, on the scrape timestamp
+
+        Every lead has an email, so there is no filter on it.
+        """
+        if platform:
+            query = query.where(leads_table.c.platform == platform)
+        if category:
+            query = query.where(leads_table.c.category == category)
+        if since is not None:
+            query = query.where(leads_table.c.timestamp >= _local_naive(since))
+        if until is not None:
+            query = query.where(leads_table.c.timestamp < _local_naive(until))
+        if domain:
+            query = query.where(leads_table.c.domain == lead_domain(domain))
+        if has_website is not None:
+            present = and_(leads_table.c.website.is_not(None), leads_table.c.website != '')
+            query = query.where(present if has_website else ~present)
+        return query
+
+    @staticmethod
+    def _create_engine(url: str, synchronous: str = 'NORMAL'):
+        if url.startswith('sqlite:///'):
+            db_path = url[len('sqlite:///'):]
+            if db_path and db_path != ':memory:':
+                os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+
+        engine = create_engine(url, connect_args={'timeout': 30} if url.startswith('sqlite') else {})
+
+        if engine.dialect.name == 'sqlite':
+            @event.listens_for(engine, 'connect')
+            def _set_sqlite_pragmas(dbapi_connection, connection_record):
+                # WAL lets the dashboard read while a scraper writes
+                cursor = dbapi_connection.cursor()
+                cursor.execute('PRAGMA journal_mode=WAL')
+                cursor.execute(f'PRAGMA synchronous={synchronous}')
+                cursor.close()
+
+        return engine
+
+    @staticmethod
+    def _to_row(lead: Lead) -> Dict:
+        now = datetime.now()
+        timestamp = lead.timestamp
+        if isinstance(timestamp, str):
+            timestamp = pd.to_datetime(timestamp, errors='coerce')
+        if timestamp is None or pd.isna(timestamp):
+            timestamp = now
+        if isinstance(timestamp, pd.Timestamp):
+            timestamp = timestamp.to_pydatetime()
+        timestamp = _local_naive(timestamp)
+
+        return {
+            'name': lead.name,
+            'email': lead.email.strip().lower(),
+            'platform': _blank_to_none(lead.platform),
+            'category': _blank_to_none(lead.category),
+            'website': _blank_to_none(lead.website),
+            'domain': lead_domain(lead.website),
+            'description': _blank_to_none(lead.description),
+            'location': _blank_to_none(lead.location),
+            'timestamp': timestamp,
+            'updated_at': now
+        }
+
+    @staticmethod
+    def _count_existing(conn, batch: List[Dict]) -> int:
+        """How many of the batch's (name, email) keys already have a row"""
+        keys = {(row['name'], row['email']) for row in batch}
+        existing = conn.execute(
+            select(leads_table.c.name, leads_table.c.email).where(
+                leads_table.c.email.in_({email for _, email in keys})
+            )
+        )
+        return sum(1 for row in existing if (row.name, row.email) in keys)
+
+    @staticmethod
+    def _dedupe(rows: List[Dict]) -> List[Dict]:
+        """Keep the last row per key, one statement cannot update the same row twice"""
+        return list({(row['name'], row['email']): row for row in rows}.values())
+
+
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+
+def get_lead_store() -> LeadStore:
+    """Process-wide store on Config.DATABASE_URL, seeded from the legacy CSV on first use"""
+    global _shared_store
+    with _shared_store_lock:
+        if _shared_store is None:
+            _shared_store = LeadStore(
+                url=Config.DATABASE_URL,
+                batch_size=Config.LEAD_BATCH_SIZE,
+                import_csv=Config.LEADS_CSV_FILE,
+                fsync_policy=Config.LEAD_FSYNC_POLICY
+            )
+        return _shared_store
@@ -0,0 +1,225 @@
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from typing import Dict, List, Optional
+from src.config import Config
+from src.models.lead import Lead
+from src.utils.activity_counters import get_activity_counters
+from src.utils.lead_store import LeadStore, get_lead_store
+from src.utils.logger import setup_logger
+from src.utils.metrics import LEADS_SAVED_TOTAL, QUEUE_DEPTH
+
+logger = setup_logger("lead_writer")
+
+# Longest pause between retries of a failed commit
+MAX_RETRY_DELAY = 30
+
+
+class LeadWriter:
+    """Single background writer that group-commits leads to the lead store
+
+    Scraper threads submit leads to a queue and return immediately. The writer
+    commits a batch when it reaches batch_size or when its oldest lead has
+    waited flush_interval seconds. A failed commit is retried up to max_attempts
+    times; after that the batch is committed lead by lead so one bad row cannot
+    hold back the rest, and the leads still refused are appended to the
+    dead-letter file as JSON lines. Upserts on (name, email) make a retried or
+    resubmitted lead land once.
+    Only leads new to the store are counted as saved, so a resubmitted lead
+    refreshes its row without being counted twice.
+    """
+
+    def __init__(self, lead_store: LeadStore, batch_size: int = 50, flush_interval: float = 2.0,
+                 counters=None, max_attempts: int = 5, dead_letter_file: Optional[str] = None):
+        self.lead_store = lead_store
+        self.counters = counters  # Activity counters credited with each committed lead
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self.dead_letter_file = dead_letter_file  # None only logs the refused leads
+        self._queue: "queue.Queue[Lead]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self._committed = threading.Condition(self._lock)
+        self.stats_counters = {
+            'submitted': 0,
+            'written': 0,
+            'batches': 0,
+            'failures': 0,
+            'dead_lettered': 0,
+            'last_flush_ms': 0.0,
+            'max_flush_ms': 0.0,
+            'total_flush_ms': 0.0
+        }
+
+    def submit(self, lead: Lead) -> None:
+        """Queue a lead for the next group commit"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Lead writer is closed")
+            self.stats_counters['submitted'] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="lead-writer", daemon=True)
+                self._thread.start()
+        self._queue.put(lead)
+
+    def submit_many(self, leads: List[Lead]) -> None:
+        for lead in leads:
+            self.submit(lead)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every lead submitted so far is committed, returns False on timeout"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._committed:
+            target = self.stats_counters['submitted']
+            while self.stats_counters['written'] < target:
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._committed.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = 30) -> None:
+        """Commit everything queued and stop the writer thread"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout)
+            if thread.is_alive():
+                logger.error(f"Lead writer did not finish within {timeout}s, {self._queue.qsize()} leads still queued")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counters = dict(self.stats_counters)
+        batches = counters.pop('batches')
+        total_ms = counters.pop('total_flush_ms')
+        return {
+            **counters,
+            'batches': batches,
+            'queue_depth': self._queue.qsize(),
+            'pending': counters['submitted'] - counters['written'],
+            'avg_flush_ms': round(total_ms / batches, 1) if batches else 0.0
+        }
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            lead = self._queue.get()
+            if lead is None:
+                break
+
+            # Gather a batch: stop at batch_size or when the first lead has waited long enough
+            batch = [lead]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    lead = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if lead is None:
+                    stopping = True
+                    break
+                batch.append(lead)
+
+            self._commit(batch)
+
+    def _commit(self, batch: List[Lead]) -> None:
+        for attempt in range(1, self.max_attempts + 1):
+            start = time.monotonic()
+            try:
+                inserted = self.lead_store.upsert(batch)
+                break
+            except Exception as e:
+                with self._lock:
+                    self.stats_counters['failures'] += 1
+                if attempt == self.max_attempts:
+                    logger.error(f"Error committing {len(batch)} leads (attempt {attempt}), committing them one by one: {e}")
+                    inserted = self._commit_each(batch)
+                    break
+                delay = min(2 ** attempt, MAX_RETRY_DELAY)
+                logger.error(f"Error committing {len(batch)} leads (attempt {attempt}), retrying in {delay}s: {e}")
+                time.sleep(delay)
+
+        elapsed_ms = (time.monotonic() - start) * 1000
+        with self._committed:
+            counters = self.stats_counters
+            counters['written'] += len(batch)  # Dead-lettered leads too, so flush() does not wait on them
+            counters['batches'] += 1
+            counters['last_flush_ms'] = round(elapsed_ms, 1)
+            counters['max_flush_ms'] = round(max(counters['max_flush_ms'], elapsed_ms), 1)
+            counters['total_flush_ms'] += elapsed_ms
+            self._committed.notify_all()
+        if inserted:
+            LEADS_SAVED_TOTAL.inc(inserted)
+            if self.counters:
+                self.counters.record('leads', inserted)
+
+        logger.info(
+            f"Committed {len(batch)} leads ({inserted} new) in {elapsed_ms:.1f} ms "
+            f"(queue depth {self._queue.qsize()})"
+        )
+
+    def _commit_each(self, batch: List[Lead]) -> int:
+        """Commit leads one at a time and dead-letter the ones still refused"""
+        inserted = 0
+        refused = []
+        for lead in batch:
+            try:
+                inserted += self.lead_store.upsert([lead])
+            except Exception as e:
+                logger.error(f"Error committing lead {lead.name} <{lead.email}>, dead-lettering it: {e}")
+                refused.append(lead)
+
+        if refused:
+            with self._lock:
+                self.stats_counters['failures'] += len(refused)
+                self.stats_counters['dead_lettered'] += len(refused)
+            self._dead_letter(refused)
+        return inserted
+
+    def _dead_letter(self, leads: List[Lead]) -> None:
+        if not self.dead_letter_file:
+            return
+        try:
+            directory = os.path.dirname(self.dead_letter_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.dead_letter_file, 'a', encoding='utf-8') as f:
+                for lead in leads:
+                    f.write(json.dumps(lead.to_dict()) + '\n')
+        except OSError as e:
+            logger.error(f"Error writing {len(leads)} leads to {self.dead_letter_file}: {e}")
+
+
+_shared_writer = None
+_shared_writer_lock = threading.Lock()
+
+
+def get_lead_writer() -> LeadWriter:
+    """Process-wide writer on the shared lead store, flushed at interpreter exit"""
+    global _shared_writer
+    with _shared_writer_lock:
+        if _shared_writer is None:
+            _shared_writer = LeadWriter(
+                get_lead_store(),
+                batch_size=Config.LEAD_WRITER_BATCH,
+                flush_interval=Config.LEAD_WRITER_INTERVAL,
+                counters=get_activity_counters(),
+                max_attempts=Config.LEAD_WRITER_ATTEMPTS,
+                dead_letter_file=Config.LEAD_DEAD_LETTER_FILE
+            )
+            atexit.register(_shared_writer.close)
+            QUEUE_DEPTH.set_function(_shared_writer._queue.qsize, queue='lead_writer')
+        return _shared_writer
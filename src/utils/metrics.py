@@ -0,0 +1,390 @@
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from src.config import Config
+from src.utils.logger import setup_logger
+
+logger = setup_logger("metrics")
+
+# Seconds; spans a cached page parse up to a slow Chrome start
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Starlette appends the charset to text responses
+CONTENT_TYPE = 'text/plain; version=0.0.4'
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+class Metric:
+    """A named family of samples, one per combination of label values"""
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self, others: Iterable[list] = ()) -> List[str]:
+        """Exposition lines, with the samples other processes exported added in"""
+        state = self.state()
+        for other in others:
+            for key, value in other:
+                self._merge(state, tuple(key), value)
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        return lines + self._samples(state)
+
+    def state(self) -> Dict[Tuple[str, ...], object]:
+        """Current value per label combination, in a form that survives a JSON round trip"""
+        raise NotImplementedError
+
+    def _merge(self, state: Dict, key: Tuple[str, ...], value) -> None:
+        state[key] = state.get(key, 0.0) + value
+
+    def _samples(self, state: Dict) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(state.items())
+        ]
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only go up")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def state(self) -> Dict[Tuple[str, ...], float]:
+        with self._lock:
+            return dict(self._values)
+
+
+class Gauge(Metric):
+    """A value that goes up and down, either set directly or read from a callback at scrape time"""
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._functions: Dict[Tuple[str, ...], Callable[[], float]] = {}
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def set_function(self, function: Callable[[], float], **labels) -> None:
+        with self._lock:
+            self._functions[self._key(labels)] = function
+
+    def state(self) -> Dict[Tuple[str, ...], float]:
+        with self._lock:
+            values = dict(self._values)
+            functions = dict(self._functions)
+        for key, function in functions.items():
+            try:
+                values[key] = function()
+            except Exception:
+                continue
+        return values
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * len(self.buckets)
+                self._sums[key] = 0.0
+            counts[index] += 1
+            self._sums[key] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe how long the with block took, including when it raises"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def state(self) -> Dict[Tuple[str, ...], list]:
+        """Per label combination, [counts per bucket, sum of observations]"""
+        with self._lock:
+            return {key: [list(counts), self._sums[key]] for key, counts in self._counts.items()}
+
+    def _merge(self, state: Dict, key: Tuple[str, ...], value) -> None:
+        counts, total = value
+        if len(counts) != len(self.buckets):
+            return  # Exported with other buckets, cannot be added up
+        if key not in state:
+            state[key] = [[0] * len(self.buckets), 0.0]
+        merged = state[key]
+        merged[0] = [a + b for a, b in zip(merged[0], counts)]
+        merged[1] += total
+
+    def _samples(self, state: Dict) -> List[str]:
+        lines = []
+        for key in sorted(state):
+            counts, total = state[key]
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, ('le', _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Metrics of this process, rendered in the Prometheus text exposition format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self, snapshots: Iterable[Dict] = ()) -> str:
+        """Exposition text for this process, summed with snapshots exported by other processes
+
+        Counters and histograms are added up across processes. Gauges from a
+        snapshot that is no longer being refreshed are left out, since they
+        describe a process that has exited.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        snapshots = list(snapshots)
+        lines = []
+        for metric in metrics:
+            others = [
+                snapshot['metrics'][metric.name] for snapshot in snapshots
+                if metric.name in snapshot['metrics'] and (metric.kind != 'gauge' or snapshot['live'])
+            ]
+            lines.extend(metric.render(others))
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self) -> Dict[str, list]:
+        """Every metric's samples as [label values, value] pairs, for export to another process"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: [[list(key), value] for key, value in metric.state().items()] for metric in metrics}
+
+
+class MetricsExporter:
+    """Snapshots a registry to directory/<pid>.json every interval
+
+    /metrics is served by whichever process runs the dashboard, so the scraper,
+    its worker processes and other dashboard workers each export their own
+    samples here for it to merge. Snapshots are written atomically, and a
+    process's last one is kept after it exits so its counts do not drop out of
+    the totals; files older than retention are removed when an exporter starts.
+    """
+
+    def __init__(self, registry: MetricsRegistry, directory: str = 'data/metrics', interval: float = 5.0,
+                 retention: float = 86400):
+        self.registry = registry
+        self.directory = directory
+        self.interval = interval
+        self.retention = retention
+        self.pid = os.getpid()
+        self.path = os.path.join(directory, f"{self.pid}.json")
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._prune()
+        self.flush()
+        self._thread = threading.Thread(target=self._flush_loop, name="metrics-exporter", daemon=True)
+        self._thread.start()
+
+    def flush(self) -> None:
+        snapshot = {'pid': self.pid, 'metrics': self.registry.snapshot()}
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Error exporting metrics: {e}")
+
+    def close(self) -> None:
+        self._stop.set()
+        self.flush()
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.retention
+        for path in glob.glob(os.path.join(self.directory, '*.json')):
+            try:
+                if os.stat(path).st_mtime < cutoff:
+                    os.remove(path)
+            except OSError:
+                continue
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+
+_snapshots: Dict[str, Tuple[int, Dict]] = {}
+_snapshots_lock = threading.Lock()
+
+
+def read_metrics_snapshots(directory: str = 'data/metrics', stale_after: float = 60) -> List[Dict]:
+    """Snapshots exported by other processes, each file reparsed only when it changes
+
+    A snapshot is marked live when it was refreshed within stale_after seconds.
+    This process's own file is skipped, its samples come straight from the registry.
+    """
+    own = f"{os.getpid()}.json"
+    paths = [path for path in glob.glob(os.path.join(directory, '*.json')) if os.path.basename(path) != own]
+    now = time.time()
+    snapshots = []
+    with _snapshots_lock:
+        for path in set(_snapshots) - set(paths):
+            del _snapshots[path]
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                cached = _snapshots.get(path)
+                if cached is None or cached[0] != stat.st_mtime_ns:
+                    with open(path) as f:
+                        cached = _snapshots[path] = (stat.st_mtime_ns, json.load(f))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping metrics snapshot {path}: {e}")
+                continue
+            snapshots.append({**cached[1], 'live': now - stat.st_mtime < stale_after})
+    return snapshots
+
+
+REGISTRY = MetricsRegistry()
+
+_exporter: Optional[MetricsExporter] = None
+_exporter_lock = threading.Lock()
+
+
+def export_metrics() -> MetricsExporter:
+    """Start snapshotting this process's metrics to Config.METRICS_DIR, once per process"""
+    global _exporter
+    with _exporter_lock:
+        if _exporter is None or _exporter.pid != os.getpid():
+            _exporter = MetricsExporter(REGISTRY, Config.METRICS_DIR, interval=Config.METRICS_FLUSH_INTERVAL,
+                                        retention=Config.METRICS_RETENTION)
+            _exporter.start()
+            atexit.register(_exporter.close)
+        return _exporter
+
+
+def render_metrics() -> str:
+    """This process's metrics merged with those every other process exported"""
+    return REGISTRY.render(read_metrics_snapshots(Config.METRICS_DIR, Config.METRICS_STALE_AFTER))
+
+# Scraper
+DRIVER_STARTUP_SECONDS = REGISTRY.histogram(
+    'scraper_driver_startup_seconds', 'Time to start a Chrome driver'
+)
+SERP_LOAD_SECONDS = REGISTRY.histogram(
+    'scraper_serp_load_seconds', 'Time to load and read a Google result page'
+)
+SITE_VISIT_SECONDS = REGISTRY.histogram(
+    'scraper_site_visit_seconds', 'Time to load a company page', ['via']
+)
+EMAIL_EXTRACTION_SECONDS = REGISTRY.histogram(
+    'scraper_email_extraction_seconds', 'Time to find an email on a company website, contact page included'
+)
+BLOCKS_TOTAL = REGISTRY.counter(
+    'scraper_blocks_total', 'Result pages that were a block or captcha page', ['kind']
+)
+LEADS_SAVED_TOTAL = REGISTRY.counter(
+    'scraper_leads_saved_total', 'Leads committed to the lead store'
+)
+QUEUE_DEPTH = REGISTRY.gauge(
+    'scraper_queue_depth', 'Items waiting in a work queue', ['queue']
+)
+
+# Proxies
+PROXY_ROTATIONS_TOTAL = REGISTRY.counter(
+    'proxy_rotations_total', 'Times the scraper moved on to the next proxy'
+)
+PROXY_CHECKS_TOTAL = REGISTRY.counter(
+    'proxy_checks_total', 'Proxy verifications and tests by outcome', ['source', 'result']
+)
+PROXY_CHECK_SECONDS = REGISTRY.histogram(
+    'proxy_check_seconds', 'Time to verify or test a proxy', ['source']
+)
+
+# Web
+HTTP_REQUESTS_TOTAL = REGISTRY.counter(
+    'http_requests_total', 'Dashboard requests by route and status', ['method', 'route', 'status']
+)
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    'http_request_duration_seconds', 'Dashboard request handling time', ['route']
+)
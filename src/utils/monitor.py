@@ -1,42 +1,36 @@
-import pandas as pd
 import time
+from src.config import Config
+from src.utils.activity_counters import HOUR, read_activity_counters
 from src.utils.logger import setup_logger
+from src.utils.lead_store import get_lead_store
 from typing import Dict
-import os
 
 logger = setup_logger("monitor")
 
 class ScrapingMonitor:
-    def __init__(self):
-        self.last_count = 0
-        self.start_time = time.time()
+    def __init__(self, lead_store=None, counters_path: str = Config.ACTIVITY_COUNTERS_FILE, interval: int = 300):
+        self.lead_store = lead_store or get_lead_store()
+        self.counters_path = counters_path
+        self.interval = interval
     
     def check_progress(self) -> Dict:
         """Check scraping progress"""
         try:
-            if not os.path.exists('data/google_leads.csv'):
-                return {
-                    "status": "No data file found",
-                    "leads": 0,
-                    "rate": 0
-                }
-            
-            df = pd.read_csv('data/google_leads.csv')
-            current_count = len(df)
-            elapsed_time = (time.time() - self.start_time) / 3600  # hours
-            
-            # Calculate scraping rate
-            new_leads = current_count - self.last_count
-            rate_per_hour = new_leads / elapsed_time if elapsed_time > 0 else 0
-            
-            self.last_count = current_count
+            # Activity comes from the scraper's rolling counters instead of re-counting leads
+            activity = read_activity_counters(self.counters_path)
+            recent = activity.totals(self.interval)
+            rates = activity.rates(HOUR)
             
             return {
-                "status": "Active" if new_leads > 0 else "Idle",
-                "total_leads": current_count,
-                "new_leads": new_leads,
-                "rate_per_hour": round(rate_per_hour, 2),
-                "elapsed_hours": round(elapsed_time, 2)
+                "status": "Active" if recent['attempts'] or recent['leads'] else "Idle",
+                "total_leads": self.lead_store.count(),
+                "new_leads": recent['leads'],
+                "attempts": recent['attempts'],
+                "failures": recent['failures'],
+                "blocks": recent['blocks'],
+                "rate_per_hour": rates['leads'],
+                "attempts_per_hour": rates['attempts'],
+                "leads_last_24h": activity.totals(24 * HOUR)['leads']
             }
             
         except Exception as e:
@@ -55,11 +49,13 @@ def monitor_scraping():
         print(f"Status: {progress['status']}")
         print(f"Total Leads: {progress.get('total_leads', 0)}")
         print(f"New Leads: {progress.get('new_leads', 0)}")
-        print(f"Rate: {progress.get('rate_per_hour', 0)} leads/hour")
-        print(f"Elapsed Time: {progress.get('elapsed_hours', 0)} hours")
+        print(f"Companies Tried: {progress.get('attempts', 0)} ({progress.get('failures', 0)} without a lead)")
+        print(f"Blocks: {progress.get('blocks', 0)}")
+        print(f"Rate: {progress.get('rate_per_hour', 0)} leads/hour, {progress.get('attempts_per_hour', 0)} companies/hour")
+        print(f"Leads (Last 24h): {progress.get('leads_last_24h', 0)}")
         print("=====================\n")
         
-        time.sleep(300)  # Check every 5 minutes
+        time.sleep(monitor.interval)  # Check every 5 minutes
 
 if __name__ == "__main__":
     monitor_scraping() 
\ No newline at end of file
@@ -1,23 +1,102 @@
-from concurrent.futures import ThreadPoolExecutor
-from typing import List
+import queue
+import threading
+from typing import Iterator, List
 from src.scrapers.google_company_scraper import GoogleCompanyScraper
+from src.models.lead import Lead
 from src.utils.proxy_manager import ProxyManager
+from src.utils.logger import setup_logger
+from src.utils.progress_tracker import get_progress_tracker
 
-def parallel_scrape(companies: List[str], num_workers: int = 3):
+logger = setup_logger("parallel_scraper")
+
+# Sentinel a worker puts on the result queue when it exits
+_WORKER_DONE = object()
+
+
+def iter_parallel_scrape(companies: List[str], num_workers: int = 3, proxy_manager=None,
+                         driver_pool=None, history=None, journal=None) -> Iterator[Lead]:
+    """Scrape companies with workers pulling from a shared queue, yielding leads as they finish
+
+    Each worker sets up its own scraper (and browser) on its own thread and takes the
+    next company only when it is free, so a slow or blocked worker never holds back
+    work the others could be doing.
+    """
+    if not companies:
+        return
+
+    work = queue.Queue()
+    for company in companies:
+        work.put(company)
+
+    results = queue.Queue()
+    stop = threading.Event()
+    progress = get_progress_tracker()
+    owns_run = not progress.active
+    if owns_run:
+        progress.start_run(len(companies))
+    proxy_manager = proxy_manager or ProxyManager()
+    num_workers = max(1, min(num_workers, len(companies)))
+
+    def worker(worker_id: int):
+        scraper = None
+        scraped = 0
+        try:
+            scraper = GoogleCompanyScraper(proxy_manager=proxy_manager, driver_pool=driver_pool,
+                                           history=history, journal=journal)
+            while not stop.is_set():
+                try:
+                    company = work.get_nowait()
+                except queue.Empty:
+                    break
+
+                lead = None
+                progress.started(company)
+                try:
+                    lead = scraper.scrape_company(company)
+                    scraped += 1
+                    if lead:
+                        scraper._save_lead(lead)
+                        results.put(lead)
+                except Exception as e:
+                    logger.error(f"Worker {worker_id} error processing {company}: {str(e)}")
+                finally:
+                    progress.finished(company, lead is not None)
+        except Exception as e:
+            logger.error(f"Worker {worker_id} failed: {str(e)}")
+        finally:
+            if scraper:
+                scraper.close()
+            logger.info(f"Worker {worker_id} finished after {scraped} companies")
+            results.put(_WORKER_DONE)
+
+    threads = [
+        threading.Thread(target=worker, args=(worker_id,), name=f"scrape-worker-{worker_id}", daemon=True)
+        for worker_id in range(num_workers)
+    ]
+    for thread in threads:
+        thread.start()
+
+    finished = 0
+    try:
+        while finished < len(threads):
+            item = results.get()
+            if item is _WORKER_DONE:
+                finished += 1
+                continue
+            yield item
+    finally:
+        # Stop handing out companies if the consumer goes away early
+        stop.set()
+        for thread in threads:
+            thread.join()
+        if owns_run:
+            progress.finish_run()
+
+    if not work.empty():
+        logger.warning(f"{work.qsize()} companies left unscraped after all workers exited")
+
+
+def parallel_scrape(companies: List[str], num_workers: int = 3, proxy_manager=None,
+                    driver_pool=None, history=None, journal=None) -> List[Lead]:
     """Scrape companies in parallel"""
-    with ThreadPoolExecutor(max_workers=num_workers) as executor:
-        proxy_manager = ProxyManager()
-        chunks = chunk_companies(companies, len(companies) // num_workers)
-        
-        futures = []
-        for chunk in chunks:
-            scraper = GoogleCompanyScraper(proxy_manager=proxy_manager)
-            future = executor.submit(scraper.scrape, chunk)
-            futures.append(future)
-        
-        all_leads = []
-        for future in futures:
-            leads = future.result()
-            all_leads.extend(leads)
-            
-    return all_leads 
\ No newline at end of file
+    return list(iter_parallel_scrape(companies, num_workers, proxy_manager, driver_pool, history, journal))
@@ -0,0 +1,283 @@
+import multiprocessing as mp
+import queue
+import threading
+import time
+from typing import Iterable, Iterator, List, Optional
+from src.config import Config
+from src.models.lead import Lead
+from src.utils.activity_counters import ActivityCounters, get_activity_counters
+from src.utils.lead_writer import get_lead_writer
+from src.utils.dedup_index import get_dedup_index, lead_already_held
+from src.utils.logger import setup_logger
+from src.utils.metrics import QUEUE_DEPTH, export_metrics
+from src.utils.progress_tracker import get_progress_tracker
+from src.utils.run_journal import OUTCOME_SKIPPED
+from src.utils.scrape_history import OUTCOME_FAILED
+
+logger = setup_logger("process_scraper")
+
+# Seconds the parent waits on the result queue before checking for dead workers
+POLL_INTERVAL = 5
+
+# Companies queued per worker process ahead of the one it is scraping
+WORK_QUEUE_DEPTH = 2
+
+
+class _ParentOwned:
+    """Lead writer, dedup index and progress tracker stand-in for a worker process
+
+    The parent records every result it receives, so a child must not open the
+    store, load the index or start writer and flusher threads of its own.
+    """
+
+    lead_store = None
+    active = False
+
+    def submit(self, lead) -> None:
+        pass
+
+    def submit_many(self, leads) -> None:
+        pass
+
+    def flush(self, timeout=None) -> bool:
+        return True
+
+    def add_lead(self, lead) -> None:
+        pass
+
+    def has_email(self, email) -> bool:
+        return False
+
+    def has_company(self, name) -> bool:
+        return False
+
+    def has_domain(self, website) -> bool:
+        return False
+
+    def start_run(self, total) -> None:
+        pass
+
+    def finish_run(self) -> None:
+        pass
+
+    def started(self, company, worker=None) -> None:
+        pass
+
+    def finished(self, company, success, worker=None) -> None:
+        pass
+
+
+class _OutcomeRecorder:
+    """Journal and history stand-in that keeps what the scraper reports, to send back to the parent
+
+    details are the history fields of the attempt (email, website and the page the
+    email was on), so the parent records the same history as a scraper thread would.
+    """
+
+    def __init__(self):
+        self.outcome = None
+        self.details = {}
+
+    def started(self, company) -> None:
+        self.outcome = None
+        self.details = {}
+
+    def finished(self, company, outcome) -> None:
+        self.outcome = outcome
+
+    def get(self, company):
+        return None
+
+    def record(self, company, outcome, **details) -> None:
+        self.details = details
+
+
+def _worker_main(worker_id: int, work, results, mode: Optional[str], rate_share: float) -> None:
+    """Child process: own a scraper and pull companies until the sentinel arrives"""
+    # Imported here so the parent process never loads Selenium for this mode
+    from src.scrapers.google_company_scraper import GoogleCompanyScraper
+    from src.utils.proxy_manager import ProxyManager
+    from src.utils.rate_limiter import get_rate_limiter
+
+    # Processes cannot share one limiter, so each takes an equal share of the configured rates
+    get_rate_limiter().scale(rate_share)
+    # Timings and proxy counts reach /metrics through this process's snapshot
+    exporter = export_metrics()
+
+    scraper = None
+    try:
+        # Blocks are reported to the parent with each result; only the parent writes the counters file
+        parent_owned = _ParentOwned()
+        outcomes = _OutcomeRecorder()
+        scraper = GoogleCompanyScraper(
+            proxy_manager=ProxyManager(), counters=ActivityCounters(path=None), lead_writer=parent_owned,
+            dedup_index=parent_owned, progress=parent_owned, journal=outcomes, history=outcomes
+        )
+        if mode:
+            scraper.enrichment_mode = mode
+        # The parent already dropped companies whose lead is held, using the history it owns
+        scraper.skip_held_leads = False
+
+        while True:
+            company = work.get()
+            if company is None:
+                break
+
+            results.put(('started', worker_id, company))
+            blocks = scraper.blocks
+            try:
+                lead = scraper.scrape_company(company)
+                outcome = outcomes.outcome or OUTCOME_FAILED
+                details = outcomes.details
+            except Exception as e:
+                logger.error(f"Process {worker_id} error processing {company}: {str(e)}")
+                lead = None
+                outcome = OUTCOME_FAILED
+                details = {}
+            # The website and email page go back too, so the parent's history can revalidate them later
+            results.put(('finished', worker_id, (company, lead, outcome, details, scraper.blocks - blocks)))
+    except Exception as e:
+        logger.error(f"Process {worker_id} failed: {str(e)}")
+    finally:
+        if scraper:
+            scraper.close()
+        # Child processes skip atexit handlers, so the final snapshot is written here
+        exporter.close()
+        results.put(('exited', worker_id, None))
+
+
+def iter_process_scrape(companies: Iterable[str], num_processes: int, mode: Optional[str] = None) -> Iterator[tuple]:
+    """Scrape across worker processes, yielding ('started' | 'finished', worker_id, payload) events
+
+    companies may be a lazy stream; a feeder thread keeps the work queue topped up
+    so workers start on the first names while the rest are still arriving.
+    """
+    if isinstance(companies, list):
+        if not companies:
+            return
+        num_processes = min(num_processes, len(companies))
+    num_processes = max(1, num_processes)
+    # Spawn keeps children clear of the parent's web server and logging threads
+    ctx = mp.get_context('spawn')
+    work = ctx.Queue(maxsize=num_processes * WORK_QUEUE_DEPTH)
+    results = ctx.Queue()
+    stop = threading.Event()
+
+    def feed():
+        try:
+            for company in companies:
+                if not _put(work, company, stop):
+                    return
+        except Exception as e:
+            logger.error(f"Error reading companies for scraper processes: {e}")
+        for _ in range(num_processes):
+            if not _put(work, None, stop):
+                return
+
+    QUEUE_DEPTH.set_function(work.qsize, queue='process_work')
+    feeder = threading.Thread(target=feed, name="process-feeder", daemon=True)
+    feeder.start()
+
+    processes = {
+        worker_id: ctx.Process(
+            target=_worker_main,
+            args=(worker_id, work, results, mode, 1 / num_processes),
+            name=f"scrape-process-{worker_id}",
+            daemon=True
+        )
+        for worker_id in range(num_processes)
+    }
+    for process in processes.values():
+        process.start()
+    logger.info(f"Started {num_processes} scraper processes")
+
+    running = set(processes)
+    try:
+        while running:
+            try:
+                kind, worker_id, payload = results.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                for worker_id in list(running):
+                    if not processes[worker_id].is_alive():
+                        logger.error(f"Process {worker_id} died with exit code {processes[worker_id].exitcode}")
+                        running.discard(worker_id)
+                continue
+
+            if kind == 'exited':
+                running.discard(worker_id)
+            else:
+                yield kind, worker_id, payload
+    finally:
+        # Unblocks the feeder if every worker died with the queue full
+        stop.set()
+        for process in processes.values():
+            process.join(timeout=POLL_INTERVAL)
+            if process.is_alive():
+                process.terminate()
+
+
+def _put(work, item, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            work.put(item, timeout=POLL_INTERVAL)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def process_scrape(companies: Iterable[str], num_processes: int, mode: Optional[str] = None,
+                   lead_writer=None, history=None, journal=None) -> List[Lead]:
+    """Scrape with a process pool; this process is the single writer for leads and progress"""
+    lead_writer = lead_writer or get_lead_writer()
+    dedup_index = get_dedup_index()
+    progress = get_progress_tracker()
+    held = 0
+
+    def unheld():
+        nonlocal held
+        for company in companies:
+            if lead_already_held(dedup_index, company, history, Config.FRESH_LEAD_TTL):
+                held += 1
+                progress.skipped(company)
+                if journal:
+                    journal.finished(company, OUTCOME_SKIPPED)
+                continue
+            yield company
+    
+    leads = []
+    completed = 0
+    start_time = time.time()
+    counters = get_activity_counters()
+    owns_run = not progress.active
+    if owns_run:
+        progress.start_run(len(companies) if isinstance(companies, list) else 0)
+
+    for kind, worker_id, payload in iter_process_scrape(unheld(), num_processes, mode):
+        if kind == 'started':
+            progress.started(payload, worker=f"process-{worker_id}")
+            if journal:
+                journal.started(payload)
+        else:
+            company, lead, outcome, details, blocks = payload
+            completed += 1
+            counters.record('blocks', blocks)
+            progress.finished(company, lead is not None, worker=f"process-{worker_id}")
+            if journal:
+                journal.finished(company, outcome)
+            if history:
+                history.record(company, outcome, **details)
+            if lead:
+                leads.append(lead)
+                lead_writer.submit(lead)
+                dedup_index.add_lead(lead)
+
+    lead_writer.flush()
+    if owns_run:
+        progress.finish_run()
+    elapsed = time.time() - start_time
+    rate = completed / (elapsed / 3600) if elapsed > 0 else 0
+    if held:
+        logger.info(f"Skipped {held} companies whose lead is already held")
+    logger.info(f"Process scrape finished: {completed} companies, {len(leads)} leads, {rate:.1f} companies/hour")
+    return leads
@@ -0,0 +1,156 @@
+import asyncio
+import json
+import os
+from typing import Dict, Optional, Set, Tuple
+from src.config import Config
+from src.utils.logger import setup_logger
+from src.utils.progress_tracker import ProgressTracker, get_progress_tracker, load_progress
+
+logger = setup_logger("progress_broadcaster")
+
+# Events a slow subscriber may fall behind by before it is sent a fresh snapshot instead
+MAX_PENDING_EVENTS = 100
+
+
+def progress_view(snapshot: Optional[Dict]) -> Dict:
+    """Dashboard fields for a tracker snapshot; the rate is as of the last reported company"""
+    if not snapshot or not snapshot.get('start_time'):
+        return {
+            "status": "idle", "progress": "0.0%", "completed": 0, "total": 0, "current_company": '',
+            "rate": "0.0 companies/hour", "start_time": 0, "successful": 0, "failed": 0, "workers": {}
+        }
+
+    elapsed = snapshot['last_update'] - snapshot['start_time']
+    rate = snapshot['completed'] / (elapsed / 3600) if elapsed > 0 else 0
+    return {
+        "status": "active" if snapshot.get('running') else "idle",
+        "progress": f"{(snapshot['completed'] / snapshot['total']) * 100:.1f}%" if snapshot['total'] else "0.0%",
+        "completed": snapshot['completed'],
+        "total": snapshot['total'],
+        "current_company": snapshot['current_company'],
+        "rate": f"{rate:.1f} companies/hour",
+        "start_time": snapshot['start_time'],
+        "successful": snapshot.get('successful', 0),
+        "failed": snapshot.get('failed', 0),
+        "workers": snapshot.get('workers', {})
+    }
+
+
+def format_event(event: str, data: Dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class ProgressBroadcaster:
+    """Pushes progress changes to every dashboard subscriber from a single reader
+
+    In the scraper's own process the tracker wakes the broadcaster on each
+    change. Elsewhere it checks the snapshot file's mtime once per
+    poll_interval for all subscribers together. Either way, subscribers get
+    one full snapshot and then only the fields that changed.
+    """
+
+    def __init__(self, tracker: Optional[ProgressTracker] = None, path: str = 'data/scraping_progress.json',
+                 poll_interval: float = 1.0, min_interval: float = 0.25):
+        self.tracker = tracker
+        self.path = path
+        self.poll_interval = poll_interval
+        self.min_interval = min_interval  # Bursts of changes inside this window go out as one event
+        self.latest: Dict = progress_view(None)
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._file_cache: Tuple[Optional[int], Optional[Dict]] = (None, None)
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def current(self) -> Dict:
+        """Latest view, from the in-process tracker or the snapshot file when it has changed
+
+        Safe to call from threadpool workers; the file is only read when its mtime moved.
+        """
+        snapshot = self.tracker.snapshot() if self.tracker else None
+        if not snapshot or not snapshot['start_time']:
+            snapshot = self._read_file()
+        self.latest = progress_view(snapshot)
+        return self.latest
+
+    def subscribe(self) -> asyncio.Queue:
+        """Queue of (event, data) pairs for one client; must be called from the event loop"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=MAX_PENDING_EVENTS)
+        self._subscribers.add(queue)
+        if self._task is None or self._task.done():
+            self._loop = asyncio.get_running_loop()
+            self._wake = asyncio.Event()
+            self.current()
+            if self.tracker:
+                self.tracker.add_listener(self._on_change)
+            self._task = self._loop.create_task(self._run())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+        if not self._subscribers and self._wake:
+            self._wake.set()  # Lets the loop notice nobody is listening
+
+    def _on_change(self) -> None:
+        # Called on scraper threads; hand the wake-up to the event loop
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._wake.set)
+
+    async def _run(self) -> None:
+        # Compared against what was last sent, not self.latest, which /progress also refreshes
+        sent = self.latest
+        try:
+            while self._subscribers:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+
+                view = await self._loop.run_in_executor(None, self.current)
+                delta = {key: value for key, value in view.items() if sent.get(key) != value}
+                if delta:
+                    self._publish('progress', delta)
+                    sent = view
+                await asyncio.sleep(self.min_interval)
+        except Exception as e:
+            logger.error(f"Progress broadcaster stopped: {e}")
+        finally:
+            if self.tracker:
+                self.tracker.remove_listener(self._on_change)
+
+    def _publish(self, event: str, data: Dict) -> None:
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait((event, data))
+            except asyncio.QueueFull:
+                # The client fell behind; its missed deltas are replaced by one snapshot
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(('snapshot', self.latest))
+
+    def _read_file(self) -> Optional[Dict]:
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+        cached_mtime, cached = self._file_cache
+        if mtime != cached_mtime:
+            try:
+                cached = load_progress(self.path)
+            except Exception as e:
+                logger.error(f"Error reading progress snapshot: {e}")
+            self._file_cache = (mtime, cached)
+        return cached
+
+
+_shared_broadcaster = None
+
+
+def get_progress_broadcaster() -> ProgressBroadcaster:
+    """Broadcaster for this web process; only used from the event loop, so no lock is needed"""
+    global _shared_broadcaster
+    if _shared_broadcaster is None:
+        _shared_broadcaster = ProgressBroadcaster(get_progress_tracker(), Config.PROGRESS_FILE)
+    return _shared_broadcaster
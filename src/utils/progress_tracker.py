@@ -0,0 +1,203 @@
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional
+from src.config import Config
+from src.utils.activity_counters import get_activity_counters
+from src.utils.logger import setup_logger
+
+logger = setup_logger("progress_tracker")
+
+
+@dataclass
+class WorkerProgress:
+    current_company: str = ''
+    completed: int = 0
+    successful: int = 0
+    failed: int = 0
+    skipped: int = 0
+    last_update: float = 0.0
+
+
+class ProgressTracker:
+    """Scrape progress kept in memory and snapshotted to disk at a fixed interval
+
+    Workers report through started() and finished(), or skipped() for a company
+    passed over without a search; a skip counts toward completion but not as an
+    attempt or failure. Counters are kept per worker and aggregated under one lock, so a snapshot is always internally consistent.
+    The snapshot file is replaced atomically, so readers never see a partial write.
+    """
+
+    def __init__(self, path: str = 'data/scraping_progress.json', flush_interval: float = 5.0, counters=None):
+        self.path = path
+        self.counters = counters  # Activity counters credited with each attempt and failure
+        self.flush_interval = flush_interval
+        self.active = False
+        self._total = 0
+        self._start_time = 0.0
+        self._last_update = 0.0
+        self._workers: Dict[str, WorkerProgress] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # The interval flush and explicit flushes share a temp file
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self._listeners: List[Callable[[], None]] = []
+
+    def add_listener(self, callback: Callable[[], None]) -> None:
+        """Call callback after every change; it runs on the reporting thread, so it must be quick"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[], None]) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def start_run(self, total: int) -> None:
+        """Reset the counters for a run over total companies"""
+        with self._lock:
+            self.active = True
+            self._total = total
+            self._start_time = self._last_update = time.time()
+            self._workers = {}
+            self._dirty = True
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_loop, name="progress-flusher", daemon=True)
+                self._flusher.start()
+        self.flush()
+        self._notify()
+
+    def add_total(self, count: int) -> None:
+        """Grow the run total as companies stream in"""
+        with self._lock:
+            self._total += count
+            self._dirty = True
+        self._notify()
+
+    def finish_run(self) -> None:
+        with self._lock:
+            self.active = False
+            self._dirty = True
+        self.flush()
+        self._notify()
+
+    def started(self, company: str, worker: Optional[str] = None) -> None:
+        with self._lock:
+            progress = self._worker(worker)
+            progress.current_company = company
+            progress.last_update = self._last_update = time.time()
+            self._dirty = True
+        self._notify()
+
+    def finished(self, company: str, success: bool, worker: Optional[str] = None) -> None:
+        with self._lock:
+            progress = self._worker(worker)
+            progress.completed += 1
+            if success:
+                progress.successful += 1
+            else:
+                progress.failed += 1
+            if progress.current_company == company:
+                progress.current_company = ''
+            progress.last_update = self._last_update = time.time()
+            self._dirty = True
+        if self.counters:
+            self.counters.record('attempts')
+            if not success:
+                self.counters.record('failures')
+        self._notify()
+
+    def skipped(self, company: str, worker: Optional[str] = None) -> None:
+        with self._lock:
+            progress = self._worker(worker)
+            progress.completed += 1
+            progress.skipped += 1
+            if progress.current_company == company:
+                progress.current_company = ''
+            progress.last_update = self._last_update = time.time()
+            self._dirty = True
+        self._notify()
+
+    def snapshot(self) -> Dict:
+        """Global aggregates plus per-worker counters, taken under one lock"""
+        with self._lock:
+            completed = sum(worker.completed for worker in self._workers.values())
+            successful = sum(worker.successful for worker in self._workers.values())
+            skipped = sum(worker.skipped for worker in self._workers.values())
+            elapsed = time.time() - self._start_time if self._start_time else 0
+            return {
+                'running': self.active,
+                'total': self._total,
+                'completed': completed,
+                'successful': successful,
+                'failed': completed - successful - skipped,
+                'skipped': skipped,
+                'start_time': self._start_time,
+                'last_update': self._last_update,
+                'rate': round(completed / (elapsed / 3600), 2) if elapsed > 0 else 0,
+                'current_company': ', '.join(
+                    worker.current_company for worker in self._workers.values() if worker.current_company
+                ),
+                'workers': {name: asdict(worker) for name, worker in self._workers.items()}
+            }
+
+    def flush(self) -> None:
+        """Write the snapshot atomically if anything changed since the last flush"""
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                self._dirty = False
+            snapshot = self.snapshot()
+
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                with open(tmp_path, 'w') as f:
+                    json.dump(snapshot, f)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                logger.error(f"Error writing progress snapshot: {e}")
+
+    def close(self) -> None:
+        self._stop.set()
+        self.flush()
+
+    def _notify(self) -> None:
+        for callback in list(self._listeners):
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Error in progress listener: {e}")
+
+    def _worker(self, worker: Optional[str]) -> WorkerProgress:
+        name = worker or threading.current_thread().name
+        progress = self._workers.get(name)
+        if progress is None:
+            progress = self._workers[name] = WorkerProgress()
+        return progress
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+
+def load_progress(path: str = 'data/scraping_progress.json') -> Dict:
+    """Read the latest progress snapshot written by a tracker"""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+_shared_tracker = None
+_shared_tracker_lock = threading.Lock()
+
+
+def get_progress_tracker() -> ProgressTracker:
+    """Process-wide tracker shared by every scraper and worker in this process"""
+    global _shared_tracker
+    with _shared_tracker_lock:
+        if _shared_tracker is None:
+            _shared_tracker = ProgressTracker(Config.PROGRESS_FILE, Config.PROGRESS_FLUSH_INTERVAL,
+                                              counters=get_activity_counters())
+        return _shared_tracker
@@ -4,8 +4,10 @@ from src.utils.logger import setup_logger
 import requests
 from requests.exceptions import RequestException
 import concurrent.futures
+import threading
 import time
 from src.utils.proxy_tester import ProxyTester
+from src.utils.metrics import PROXY_CHECK_SECONDS, PROXY_CHECKS_TOTAL
 
 class ProxyManager:
     def __init__(self):
@@ -16,6 +18,8 @@ class ProxyManager:
         self.current_index = 0
         self.last_test_time = 0
         self.test_interval = 300  # Test proxies every 5 minutes
+        self._lock = threading.Lock()  # Shared by parallel scraper workers
+        self._verify_lock = threading.Lock()  # One proxy test run at a time, outside _lock
         
     def _initialize_proxies(self) -> List[Dict[str, str]]:
         """Initialize list of proxy configurations"""
@@ -168,33 +172,42 @@ class ProxyManager:
     
     def _verify_proxy(self, proxy: Dict[str, str]) -> bool:
         """Verify if proxy is working"""
+        working = False
         try:
             test_url = 'https://www.google.com'
-            response = requests.get(
-                test_url,
-                proxies=proxy,
-                timeout=10,
-                headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/91.0.4472.124'}
-            )
-            return response.status_code == 200
+            with PROXY_CHECK_SECONDS.time(source='manager'):
+                response = requests.get(
+                    test_url,
+                    proxies=proxy,
+                    timeout=10,
+                    headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/91.0.4472.124'}
+                )
+            working = response.status_code == 200
+            return working
         except RequestException:
             return False
+        finally:
+            PROXY_CHECKS_TOTAL.inc(source='manager', result='working' if working else 'failed')
 
     def _verify_proxies(self) -> List[Dict[str, str]]:
-        """Verify and test proxies"""
-        current_time = time.time()
-        
-        # Only test if enough time has passed
-        if current_time - self.last_test_time > self.test_interval:
-            self.logger.info("Testing proxies...")
-            working_proxies = self.tester.test_proxy_list(self.proxies)
-            self.working_proxies = [p['proxy'] for p in working_proxies]
-            self.last_test_time = current_time
-            
-            self.logger.info(f"Found {len(self.working_proxies)} working proxies")
+        """Verify and test proxies outside _lock, then swap the result in under it"""
+        # Callers arriving during a test run wait for it and reuse its result
+        with self._verify_lock:
+            current_time = time.time()
             
-            # Save working proxies to file
-            self._save_working_proxies()
+            # Only test if enough time has passed
+            if current_time - self.last_test_time > self.test_interval:
+                self.logger.info("Testing proxies...")
+                working_proxies = [p['proxy'] for p in self.tester.test_proxy_list(self.proxies)]
+                with self._lock:
+                    self.working_proxies = working_proxies
+                    self.current_index = 0
+                    self.last_test_time = current_time
+                
+                self.logger.info(f"Found {len(working_proxies)} working proxies")
+                
+                # Save working proxies to file
+                self._save_working_proxies()
             
         return self.working_proxies
 
@@ -206,14 +219,18 @@ class ProxyManager:
     
     def get_next_proxy(self) -> Dict[str, str]:
         """Get next working proxy"""
-        if not self.working_proxies:
+        with self._lock:
+            needs_test = not self.working_proxies
+        if needs_test:
             self._verify_proxies()
-            
-        if not self.working_proxies:
-            raise Exception("No working proxies available")
-            
-        proxy = self.working_proxies[self.current_index]
-        self.current_index = (self.current_index + 1) % len(self.working_proxies)
+        
+        with self._lock:
+            if not self.working_proxies:
+                raise Exception("No working proxies available")
+                
+            self.current_index %= len(self.working_proxies)
+            proxy = self.working_proxies[self.current_index]
+            self.current_index = (self.current_index + 1) % len(self.working_proxies)
         
         return {"http": proxy, "https": proxy}
 
@@ -2,6 +2,7 @@ import requests
 import concurrent.futures
 from typing import Dict, List
 from src.utils.logger import setup_logger
+from src.utils.metrics import PROXY_CHECK_SECONDS, PROXY_CHECKS_TOTAL
 import time
 
 logger = setup_logger("proxy_tester")
@@ -36,6 +37,7 @@ class ProxyTester:
                 headers=self.headers
             )
             elapsed = time.time() - start_time
+            PROXY_CHECK_SECONDS.observe(elapsed, source='tester')
             
             if response.status_code == 200:
                 results['working'] = True
@@ -47,7 +49,8 @@ class ProxyTester:
         except Exception as e:
             results['errors'].append(str(e))
             logger.warning(f"Proxy {proxy['http']} failed: {str(e)}")
-            
+        
+        PROXY_CHECKS_TOTAL.inc(source='tester', result='working' if results['working'] else 'failed')
         return results
 
     def test_proxy_list(self, proxies: List[Dict[str, str]]) -> List[Dict]:
@@ -0,0 +1,155 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict
+from urllib.parse import urlparse
+from src.config import Config
+from src.utils.logger import setup_logger
+
+logger = setup_logger("rate_limiter")
+
+# Bucket shared by every Google host
+GOOGLE = 'google'
+
+
+@dataclass
+class _Bucket:
+    rate_per_min: float
+    burst: float
+    tokens: float
+    updated: float = field(default_factory=time.monotonic)
+    factor: float = 1.0  # Adaptive multiplier on rate_per_min, lowered on blocks
+    strikes: int = 0  # Consecutive blocks
+    blocked_until: float = 0.0
+
+
+class RateLimiter:
+    """Per-domain token buckets with adaptive backoff on block signals
+
+    Google gets one bucket for all of its hosts; every company site gets its own.
+    Callers take a token before each request and report blocks and successes so
+    the limiter can slow down or recover.
+    """
+
+    def __init__(self, google_rate_per_min: float = 6, site_rate_per_min: float = 30, burst: float = 2,
+                 block_backoff: float = 30, max_block_backoff: float = 600, error_backoff: float = 5,
+                 min_factor: float = 0.1):
+        self.google_rate_per_min = google_rate_per_min
+        self.site_rate_per_min = site_rate_per_min
+        self.burst = burst
+        self.block_backoff = block_backoff  # First pause after a block, doubled per further block
+        self.max_block_backoff = max_block_backoff
+        self.error_backoff = error_backoff  # Pause after an error that is not a block
+        self.min_factor = min_factor
+        self._buckets: Dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, target: str) -> float:
+        """Block until a request to target is allowed, returns the seconds waited"""
+        key = self.domain_key(target)
+        with self._lock:
+            bucket = self._bucket(key)
+            now = time.monotonic()
+            self._refill(bucket, now)
+
+            # Reserve a token even when empty so concurrent callers queue up in order
+            bucket.tokens -= 1
+            rate_per_sec = bucket.rate_per_min * bucket.factor / 60
+            wait = max(bucket.blocked_until - now, -bucket.tokens / rate_per_sec if bucket.tokens < 0 else 0)
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def report_block(self, target: str) -> None:
+        """A block or captcha: halve the rate and pause the domain with exponential backoff"""
+        key = self.domain_key(target)
+        with self._lock:
+            bucket = self._bucket(key)
+            bucket.strikes += 1
+            bucket.factor = max(self.min_factor, bucket.factor / 2)
+            pause = min(self.block_backoff * 2 ** (bucket.strikes - 1), self.max_block_backoff)
+            bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + pause)
+            rate = bucket.rate_per_min * bucket.factor
+
+        logger.warning(f"Block on {key}: pausing {pause:.0f}s, rate now {rate:.1f}/min")
+
+    def report_error(self, target: str) -> None:
+        """A failed request that was not a block: pause briefly without lowering the rate"""
+        key = self.domain_key(target)
+        with self._lock:
+            bucket = self._bucket(key)
+            bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + self.error_backoff)
+
+    def report_success(self, target: str) -> None:
+        """A clean response: recover the rate gradually"""
+        key = self.domain_key(target)
+        with self._lock:
+            bucket = self._bucket(key)
+            bucket.strikes = 0
+            bucket.factor = min(1.0, bucket.factor * 1.1)
+
+    def scale(self, share: float) -> None:
+        """Give this limiter a share of the configured rates, e.g. one of N processes"""
+        with self._lock:
+            self.google_rate_per_min *= share
+            self.site_rate_per_min *= share
+            for key, bucket in self._buckets.items():
+                bucket.rate_per_min *= share
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                key: {
+                    'rate_per_min': round(bucket.rate_per_min * bucket.factor, 2),
+                    'paused_for': round(max(0.0, bucket.blocked_until - now), 1),
+                    'strikes': bucket.strikes
+                }
+                for key, bucket in self._buckets.items()
+            }
+
+    @staticmethod
+    def domain_key(target: str) -> str:
+        """Bucket key for a URL or host name"""
+        host = urlparse(target).netloc if '://' in target else target
+        host = host.lower().split(':')[0]
+        if host.startswith('www.'):
+            host = host[4:]
+        if host == GOOGLE or host.startswith('google.') or '.google.' in host:
+            return GOOGLE
+        return host
+
+    def _bucket(self, key: str) -> _Bucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            rate = self.google_rate_per_min if key == GOOGLE else self.site_rate_per_min
+            bucket = _Bucket(rate_per_min=rate, burst=self.burst, tokens=self.burst)
+            self._buckets[key] = bucket
+        return bucket
+
+    @staticmethod
+    def _refill(bucket: _Bucket, now: float) -> None:
+        rate_per_sec = bucket.rate_per_min * bucket.factor / 60
+        bucket.tokens = min(bucket.burst, bucket.tokens + (now - bucket.updated) * rate_per_sec)
+        bucket.updated = now
+
+
+_shared_limiter = None
+_shared_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Process-wide limiter configured from Config, shared by all workers"""
+    global _shared_limiter
+    with _shared_limiter_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter(
+                google_rate_per_min=Config.GOOGLE_RATE_PER_MIN,
+                site_rate_per_min=Config.SITE_RATE_PER_MIN,
+                burst=Config.RATE_LIMIT_BURST,
+                block_backoff=Config.BLOCK_BACKOFF,
+                max_block_backoff=Config.MAX_BLOCK_BACKOFF,
+                error_backoff=Config.ERROR_BACKOFF
+            )
+        return _shared_limiter
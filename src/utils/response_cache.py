@@ -0,0 +1,242 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Dict, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from src.config import Config
+from src.utils.logger import setup_logger
+
+logger = setup_logger("response_cache")
+
+# Query parameters that never change page content
+TRACKING_PARAMS = ('utm_', 'gclid', 'fbclid', 'mc_cid', 'mc_eid')
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a URL used as the cache key"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or 'http'
+    host = (parts.hostname or '').lower()
+    port = parts.port
+    if port and not ((scheme == 'http' and port == 80) or (scheme == 'https' and port == 443)):
+        host = f"{host}:{port}"
+
+    path = parts.path or '/'
+    if len(path) > 1 and path.endswith('/'):
+        path = path.rstrip('/')
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PARAMS)
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    final_url: str
+    body: str
+    fetched_at: float
+    status_code: int = 200
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+class ResponseCache:
+    """Disk-backed page cache with TTL expiry and size-bounded LRU eviction
+
+    Each entry is a gzipped JSON file named after the hash of the normalized URL.
+    File mtimes record last access, so LRU order survives restarts.
+    """
+
+    def __init__(self, cache_dir: str = 'data/cache', ttl: int = 86400, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # key -> size on disk, oldest first
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    def get(self, url: str, max_age: Optional[int] = None, namespace: str = '') -> Optional[CachedResponse]:
+        """Return a fresh cached response for url, or None
+
+        namespace keeps variants of the same URL apart, e.g. raw HTTP bodies
+        versus browser-rendered page sources.
+        """
+        key = self._key(url, namespace)
+        max_age = self.ttl if max_age is None else max_age
+        path = self._path(key)
+
+        # Files are opened even when missing from the index, since worker
+        # processes sharing the directory may have written them
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                response = CachedResponse(**json.load(f))
+        except FileNotFoundError:
+            with self._lock:
+                self._total_bytes -= self._entries.pop(key, 0)
+                self.misses += 1
+            return None
+        except Exception:
+            # Partial or corrupt entry
+            self._drop(key)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        if response.age > max_age:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            else:
+                size = os.path.getsize(path) if os.path.exists(path) else 0
+                self._entries[key] = size
+                self._total_bytes += size
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return response
+
+    def put(self, url: str, body: str, final_url: Optional[str] = None, status_code: int = 200,
+            namespace: str = '', etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """Store a page body under the normalized url, with its validators when the server sent them"""
+        key = self._key(url, namespace)
+        response = CachedResponse(
+            url=url,
+            final_url=final_url or url,
+            body=body,
+            fetched_at=time.time(),
+            status_code=status_code,
+            etag=etag,
+            last_modified=last_modified
+        )
+
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                json.dump(asdict(response), f)
+            os.replace(tmp_path, path)
+            size = os.path.getsize(path)
+        except Exception as e:
+            logger.error(f"Error caching {url}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+
+        with self._lock:
+            self._total_bytes -= self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._total_bytes += size
+            evicted = self._evict_locked()
+
+        for old_key in evicted:
+            self._remove_file(old_key)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'evictions': self.evictions
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            keys = list(self._entries)
+            self._entries.clear()
+            self._total_bytes = 0
+        for key in keys:
+            self._remove_file(key)
+
+    def _load_index(self) -> None:
+        """Rebuild the LRU index from files on disk, least recently used first"""
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith('.json.gz'):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name[:-len('.json.gz')], stat.st_size))
+
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total_bytes += size
+
+        evicted = self._evict_locked()
+        for key in evicted:
+            self._remove_file(key)
+        logger.info(f"Loaded response cache with {len(self._entries)} entries ({self._total_bytes / 1024 / 1024:.1f} MB)")
+
+    def _evict_locked(self):
+        evicted = []
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+            evicted.append(key)
+        return evicted
+
+    def _drop(self, key: str) -> None:
+        with self._lock:
+            self._total_bytes -= self._entries.pop(key, 0)
+        self._remove_file(key)
+
+    def _remove_file(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json.gz")
+
+    @staticmethod
+    def _key(url: str, namespace: str = '') -> str:
+        return hashlib.sha1(f"{namespace}|{normalize_url(url)}".encode('utf-8')).hexdigest()
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Process-wide cache configured from Config, or None when disabled"""
+    global _shared_cache
+    if not Config.USE_RESPONSE_CACHE:
+        return None
+
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ResponseCache(
+                cache_dir=Config.RESPONSE_CACHE_DIR,
+                ttl=Config.RESPONSE_CACHE_TTL,
+                max_bytes=Config.RESPONSE_CACHE_MAX_MB * 1024 * 1024
+            )
+        return _shared_cache
@@ -0,0 +1,237 @@
+import csv
+import io
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Iterable, List, Optional
+import pandas as pd
+from src.utils.logger import setup_logger
+
+logger = setup_logger("run_journal")
+
+MANIFEST_FILE = 'manifest.json'
+
+# Bumped when the journal layout changes; runs written in another format are not resumed
+JOURNAL_FORMAT = 2
+
+# Journal records, one tab-separated line each: "A <index> <company>" when a company joins
+# the run, "S <index>" when it starts and "D <index> <outcome>" when it is done
+ADMITTED = 'A'
+STARTED = 'S'
+DONE = 'D'
+
+# Outcome for companies passed over without a search; other outcomes come from scrape_history
+OUTCOME_SKIPPED = 'skipped'
+
+STATUS_RUNNING = 'running'
+STATUS_COMPLETE = 'complete'
+
+
+class ScrapeRun:
+    """One cycle's companies and the append-only journal of what happened to each
+
+    Companies are admitted as they stream in, so the run is journaled before its
+    full company list is known; input_complete records that the stream ran dry.
+    """
+
+    def __init__(self, run_dir: str, manifest: Dict, fsync: bool = False):
+        self.run_dir = run_dir
+        self.manifest = manifest
+        self.fsync = fsync
+        self.companies: List[str] = []
+        self._index: Dict[str, int] = {}  # Company to position
+        self.done: Dict[int, str] = {}
+        self.in_flight = set()
+        self._lock = threading.Lock()
+        self._file = None
+
+    @property
+    def run_id(self) -> str:
+        return self.manifest['run_id']
+
+    @property
+    def input_complete(self) -> bool:
+        return self.manifest.get('input_complete', False)
+
+    @property
+    def journal_path(self) -> str:
+        return os.path.join(self.run_dir, f"journal-{self.run_id}.log")
+
+    def replay(self) -> None:
+        """Rebuild the company list and the done and in-flight sets from the journal"""
+        if not os.path.exists(self.journal_path):
+            return
+
+        with open(self.journal_path, 'rb') as f:
+            data = f.read()
+        # A crash can leave the last record half written; drop it so new records start on a clean line
+        intact = data.rfind(b'\n') + 1
+        if intact < len(data):
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(intact)
+            data = data[:intact]
+        if not data:
+            return
+
+        # The C CSV parser replays millions of records in well under a second
+        records = pd.read_csv(
+            io.BytesIO(data), sep='\t', header=None, names=['tag', 'idx', 'value'],
+            dtype={'tag': 'category', 'idx': 'int64', 'value': 'object'},
+            keep_default_na=False, quoting=csv.QUOTE_NONE, on_bad_lines='skip'
+        )
+        # Positions are handed out in order, so admission records are already sorted by index
+        admitted = records[records['tag'] == ADMITTED]
+        self.companies = admitted['value'].tolist()
+        self._index = dict(zip(self.companies, admitted['idx'].tolist()))
+        done = records[records['tag'] == DONE].drop_duplicates('idx', keep='last')
+        self.done = dict(zip(done['idx'].tolist(), done['value'].tolist()))
+        started = records.loc[records['tag'] == STARTED, 'idx']
+        self.in_flight = set(started.tolist()) - self.done.keys()
+
+    def pending(self, retry: Optional[Callable[[str, str], bool]] = None) -> List[str]:
+        """Companies not yet done, in admission order; in-flight ones are retried
+
+        retry(company, outcome) can send a done company back, e.g. a lead that was
+        journaled but never reached the lead store before the crash.
+        """
+        return [
+            company for idx, company in enumerate(self.companies)
+            if idx not in self.done or (retry and retry(company, self.done[idx]))
+        ]
+
+    def admit(self, company: str) -> str:
+        """Add a company to the run, returning the name as journaled"""
+        # Tabs and newlines would split the record
+        company = ' '.join(company.split())
+        with self._lock:
+            if company not in self._index:
+                idx = self._index[company] = len(self.companies)
+                self.companies.append(company)
+                self._append(f"{ADMITTED}\t{idx}\t{company}\n")
+        return company
+
+    def mark_input_complete(self) -> None:
+        """Every company for this run has been admitted"""
+        with self._lock:
+            self.manifest['input_complete'] = True
+        write_manifest(self.run_dir, self.manifest)
+
+    def started(self, company: str) -> None:
+        idx = self._index.get(company)
+        if idx is None:
+            return
+        with self._lock:
+            self.in_flight.add(idx)
+            self._append(f"{STARTED}\t{idx}\n")
+
+    def finished(self, company: str, outcome: str) -> None:
+        idx = self._index.get(company)
+        if idx is None:
+            return
+        with self._lock:
+            self.in_flight.discard(idx)
+            self.done[idx] = outcome
+            self._append(f"{DONE}\t{idx}\t{outcome}\n")
+
+    def complete(self) -> None:
+        with self._lock:
+            self._close_file()
+            self.manifest['status'] = STATUS_COMPLETE
+            self.manifest['completed_at'] = time.time()
+        write_manifest(self.run_dir, self.manifest)
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_file()
+
+    def _append(self, record: str) -> None:
+        if self._file is None:
+            self._file = open(self.journal_path, 'a')
+        self._file.write(record)
+        # Flushing reaches the OS, which survives a process crash; fsync also survives power loss
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class RunJournal:
+    """Starts scrape runs and resumes the last one if the process died before it completed"""
+
+    def __init__(self, run_dir: str = 'data/run', fsync: bool = False):
+        self.run_dir = run_dir
+        self.fsync = fsync
+
+    def resume(self) -> Optional[ScrapeRun]:
+        """The unfinished run left by a previous process, with its journal replayed"""
+        manifest = self._read_manifest()
+        if not manifest or manifest.get('status') != STATUS_RUNNING:
+            return None
+        if manifest.get('format') != JOURNAL_FORMAT:
+            logger.warning(f"Not resuming run {manifest.get('run_id')}: written in an older journal format")
+            return None
+
+        start = time.time()
+        run = ScrapeRun(self.run_dir, manifest, self.fsync)
+        run.replay()
+        logger.info(
+            f"Resuming run {run.run_id}: {len(run.done)}/{len(run.companies)} done"
+            f"{'' if run.input_complete else ' so far'}, "
+            f"{len(run.in_flight)} in flight retried, journal replayed in {time.time() - start:.2f}s"
+        )
+        return run
+
+    def start(self, companies: Optional[Iterable[str]] = None) -> ScrapeRun:
+        """Record a new run; companies are admitted now if known, or later as they stream in"""
+        manifest = {
+            'run_id': f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}",
+            'format': JOURNAL_FORMAT,
+            'created_at': time.time(),
+            'status': STATUS_RUNNING,
+            'input_complete': False
+        }
+        os.makedirs(self.run_dir, exist_ok=True)
+        # The manifest switch is atomic, so a crash leaves either the old run or the new one
+        write_manifest(self.run_dir, manifest)
+        self._remove_stale_journals(manifest['run_id'])
+        run = ScrapeRun(self.run_dir, manifest, self.fsync)
+        if companies is not None:
+            for company in companies:
+                run.admit(company)
+            run.mark_input_complete()
+        return run
+
+    def _read_manifest(self) -> Optional[Dict]:
+        path = os.path.join(self.run_dir, MANIFEST_FILE)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Error reading run manifest: {e}")
+            return None
+
+    def _remove_stale_journals(self, run_id: str) -> None:
+        for entry in os.listdir(self.run_dir):
+            if entry.startswith('journal-') and entry != f"journal-{run_id}.log":
+                try:
+                    os.remove(os.path.join(self.run_dir, entry))
+                except OSError:
+                    pass
+
+
+def write_manifest(run_dir: str, manifest: Dict) -> None:
+    path = os.path.join(run_dir, MANIFEST_FILE)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
@@ -0,0 +1,257 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict, field
+from typing import Dict, Iterable, Iterator, List, Optional
+import pandas as pd
+from src.config import Config
+from src.utils.http_fetcher import HttpFetcher
+from src.utils.logger import setup_logger
+from src.utils.rate_limiter import get_rate_limiter
+from src.utils.response_cache import get_response_cache
+
+logger = setup_logger("scrape_history")
+
+# Outcomes recorded per attempt
+OUTCOME_LEAD = 'lead'
+OUTCOME_NO_EMAIL = 'no_email'
+OUTCOME_FAILED = 'failed'
+OUTCOME_UNCHANGED = 'unchanged'
+
+
+@dataclass
+class CompanyRecord:
+    name: str
+    last_attempt: float = 0
+    last_success: float = 0
+    outcome: Optional[str] = None
+    email: Optional[str] = None
+    website: Optional[str] = None
+    misses: int = 0  # Consecutive attempts without an email
+    source_url: Optional[str] = None  # Page the email was found on; etag and last_modified are its validators
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class ScrapeHistory:
+    """Per-company record of past scrape attempts, persisted as JSON"""
+
+    def __init__(self, path: str = 'data/scrape_history.json', leads_file: str = 'data/google_leads.csv',
+                 save_every: int = 20):
+        self.path = path
+        self.leads_file = leads_file
+        self.save_every = save_every
+        self.records: Dict[str, CompanyRecord] = {}
+        self._unsaved = 0
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+                self.records = {key: CompanyRecord(**record) for key, record in data.items()}
+                logger.info(f"Loaded scrape history for {len(self.records)} companies")
+                return
+            except Exception as e:
+                logger.error(f"Error loading scrape history: {e}")
+
+        self._seed_from_leads()
+
+    def get(self, company: str) -> Optional[CompanyRecord]:
+        with self._lock:
+            return self.records.get(self._key(company))
+
+    def record(self, company: str, outcome: str, email: Optional[str] = None, website: Optional[str] = None,
+               etag: Optional[str] = None, last_modified: Optional[str] = None,
+               source_url: Optional[str] = None) -> None:
+        """Record the outcome of an attempt for a company
+
+        source_url is the page the email was found on; its validators replace
+        any kept for an earlier page, even when the new page sent none.
+        """
+        now = time.time()
+        with self._lock:
+            key = self._key(company)
+            record = self.records.get(key) or CompanyRecord(name=company)
+            record.last_attempt = now
+            record.outcome = outcome
+
+            if outcome in (OUTCOME_LEAD, OUTCOME_UNCHANGED):
+                record.last_success = now
+                record.misses = 0
+                record.email = email or record.email
+                record.website = website or record.website
+            else:
+                record.misses += 1
+                record.website = website or record.website
+
+            if source_url:
+                record.source_url = source_url
+                record.etag = etag
+                record.last_modified = last_modified
+            elif etag or last_modified:
+                record.etag = etag
+                record.last_modified = last_modified
+
+            self.records[key] = record
+            self._unsaved += 1
+            should_save = self._unsaved >= self.save_every
+
+        if should_save:
+            self.save()
+
+    def save(self) -> None:
+        """Write the history atomically"""
+        with self._lock:
+            data = {key: asdict(record) for key, record in self.records.items()}
+            self._unsaved = 0
+
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Error saving scrape history: {e}")
+
+    def _seed_from_leads(self) -> None:
+        """Treat leads already on disk as successful scrapes"""
+        if not os.path.exists(self.leads_file):
+            return
+
+        try:
+            df = pd.read_csv(self.leads_file, usecols=['name', 'email', 'website', 'timestamp'])
+            df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce', format='mixed')
+            df = df.dropna(subset=['name', 'timestamp']).sort_values('timestamp')
+            for row in df.itertuples(index=False):
+                seen = row.timestamp.timestamp()
+                self.records[self._key(row.name)] = CompanyRecord(
+                    name=row.name,
+                    last_attempt=seen,
+                    last_success=seen,
+                    outcome=OUTCOME_LEAD,
+                    email=row.email if isinstance(row.email, str) else None,
+                    website=row.website if isinstance(row.website, str) else None
+                )
+            logger.info(f"Seeded scrape history with {len(self.records)} companies from {self.leads_file}")
+        except Exception as e:
+            logger.error(f"Error seeding scrape history: {e}")
+
+    @staticmethod
+    def _key(company: str) -> str:
+        return ' '.join(company.lower().split())
+
+
+@dataclass
+class SchedulePlan:
+    to_scrape: List[str] = field(default_factory=list)
+    to_revalidate: List[CompanyRecord] = field(default_factory=list)
+    skipped: int = 0
+
+
+class FreshnessScheduler:
+    """Decides which companies need work this cycle based on their scrape history"""
+
+    def __init__(self, history: ScrapeHistory, fetcher: Optional[HttpFetcher] = None,
+                 fresh_ttl: int = 7 * 86400, miss_backoff: int = 86400, max_backoff: int = 30 * 86400):
+        self.history = history
+        # Revalidations are paced with the scraper's own requests, and pages that changed refresh the cache
+        self.fetcher = fetcher or HttpFetcher(
+            timeout=Config.HTTP_FETCH_TIMEOUT, cache=get_response_cache(), rate_limiter=get_rate_limiter()
+        )
+        self.fresh_ttl = fresh_ttl  # Leads younger than this are skipped
+        self.miss_backoff = miss_backoff  # Wait after the first miss, doubled for each further miss
+        self.max_backoff = max_backoff
+
+    def plan(self, companies: List[str]) -> SchedulePlan:
+        """Split companies into full scrapes, cheap revalidations and skips"""
+        plan = SchedulePlan()
+        now = time.time()
+
+        for company in companies:
+            record = self.history.get(company)
+            if record is None:
+                plan.to_scrape.append(company)
+            elif record.misses and now - record.last_attempt < self._backoff(record.misses):
+                plan.skipped += 1
+            elif record.email and now - record.last_success < self.fresh_ttl:
+                plan.skipped += 1
+            elif record.email and (record.source_url or record.website) and not record.misses:
+                plan.to_revalidate.append(record)
+            else:
+                plan.to_scrape.append(company)
+
+        return plan
+
+    def select(self, companies: List[str]) -> List[str]:
+        """Companies that need a full scrape this cycle, after revalidating stale leads"""
+        plan = self.plan(companies)
+        changed = self.revalidate(plan.to_revalidate)
+
+        logger.info(
+            f"Schedule: {len(plan.to_scrape)} new or due, {len(plan.to_revalidate)} revalidated "
+            f"({len(changed)} changed), {plan.skipped} skipped as fresh or backing off"
+        )
+        self.history.save()
+        return plan.to_scrape + changed
+
+    def select_iter(self, companies: Iterable[str], batch_size: int = 50) -> Iterator[str]:
+        """Like select(), for a stream: new or due companies pass straight through and
+        stale leads are revalidated batch_size at a time"""
+        stale = []
+        scraped = skipped = 0
+        for company in companies:
+            plan = self.plan([company])
+            skipped += plan.skipped
+            if plan.to_scrape:
+                scraped += 1
+                yield company
+            stale.extend(plan.to_revalidate)
+            if len(stale) >= batch_size:
+                yield from self.revalidate(stale)
+                stale = []
+        if stale:
+            yield from self.revalidate(stale)
+
+        logger.info(f"Schedule: {scraped} new or due, {skipped} skipped as fresh or backing off")
+        self.history.save()
+
+    def set_proxy(self, proxy: Optional[Dict[str, str]]) -> None:
+        """Send revalidations through the same proxy as the scraper"""
+        self.fetcher.set_proxy(proxy)
+
+    def revalidate(self, records: List[CompanyRecord], max_workers: int = 10) -> List[str]:
+        """Check stale leads with conditional GETs, returns companies whose lead may have changed"""
+        if not records:
+            return []
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pages = list(executor.map(
+                lambda record: self.fetcher.revalidate(
+                    record.source_url or record.website, record.etag, record.last_modified
+                ),
+                records
+            ))
+
+        changed = []
+        for record, page in zip(records, pages):
+            if page and page.status_code == 304:
+                self.history.record(record.name, OUTCOME_UNCHANGED)
+            elif page and page.status_code == 200 and record.email and record.email.lower() in page.html.lower():
+                # Server ignored the validators, but the known email is still on the page
+                self.history.record(record.name, OUTCOME_UNCHANGED,
+                                    etag=page.etag, last_modified=page.last_modified)
+            else:
+                changed.append(record.name)
+
+        return changed
+
+    def _backoff(self, misses: int) -> float:
+        if misses <= 0:
+            return 0
+        return min(self.miss_backoff * 2 ** (misses - 1), self.max_backoff)
@@ -1,19 +1,40 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
-import pandas as pd
-import os
-from pathlib import Path
-from src.utils.logger import setup_logger
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, StreamingResponse
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Dict, Optional
+import asyncio
+import base64
 import json
+from src.utils.logger import setup_logger
+from src.utils.activity_counters import HOUR, read_activity_counters
+from src.utils.http_cache import (
+    SelectiveGZipMiddleware, cache_headers, etag_matches, file_version, make_etag, not_modified
+)
+from src.utils.lead_export import EXPORT_FORMATS, encode_leads
+from src.utils.lead_index import get_lead_index
+from src.utils.lead_store import LEAD_COLUMNS, SORTABLE_COLUMNS, get_lead_store
+from src.utils.metrics import (
+    CONTENT_TYPE, HTTP_REQUEST_SECONDS, HTTP_REQUESTS_TOTAL, export_metrics, render_metrics
+)
+from src.utils.progress_broadcaster import format_event, get_progress_broadcaster
+from src.config import Config
 import time
 
 # Create logger
 logger = setup_logger("webapp")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Other dashboard workers merge this worker's request metrics, as it merges theirs
+    export_metrics()
+    yield
+
 # Create FastAPI app
-app = FastAPI(title="Lead Generation Dashboard")
+app = FastAPI(title="Lead Generation Dashboard", lifespan=lifespan)
 
 # Setup templates and static files
 templates = Jinja2Templates(directory="src/web/templates")
@@ -21,37 +42,116 @@ templates = Jinja2Templates(directory="src/web/templates")
 # Mount static files
 app.mount("/static", StaticFiles(directory="src/web/static"), name="static")
 
+# Large pages and JSON go out gzipped; the progress stream must flush per event and the
+# export compresses itself when asked. Added before the metrics middleware so it sits
+# inside it and sees each response as one body
+app.add_middleware(SelectiveGZipMiddleware, exclude=("/progress/stream", "/api/leads/export"))
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template, not raw path, so ids and query strings cannot explode the series
+        route = request.scope.get('route')
+        route = route.path if route else 'unmatched'
+        HTTP_REQUESTS_TOTAL.inc(method=request.method, route=route, status=status)
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, route=route)
+
+# Seconds between keepalive comments on an idle progress stream
+SSE_KEEPALIVE = 15
+
+# Fields /api/leads can project
+API_FIELDS = LEAD_COLUMNS + ['domain']
+
+
+def encode_cursor(sort: str, order: str, key: tuple) -> str:
+    value, last_id = key
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([sort, order, value, last_id]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, sort: str, order: str) -> tuple:
+    """Keyset from a cursor issued for the same sort and order"""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        cursor_sort, cursor_order, value, last_id = json.loads(payload)
+    except Exception:
+        raise ValueError("Malformed cursor")
+    if (cursor_sort, cursor_order) != (sort, order):
+        raise ValueError("Cursor was issued for a different sort order")
+    if sort in ('timestamp', 'updated_at'):
+        value = datetime.fromisoformat(value)
+    return value, int(last_id)
+
+
+def read_dashboard_counts() -> tuple:
+    """Index version, lead total and per-platform counts from the in-memory index"""
+    lead_index = get_lead_index()
+    return lead_index.version, lead_index.total, lead_index.platform_counts()
+
+
+def status_etag() -> str:
+    """Validator for /status without building it
+
+    The minute is part of it because the 24h and hourly windows slide even
+    when no new lead or counter snapshot arrives.
+    """
+    return make_etag(
+        'status', get_lead_index().version, file_version(Config.ACTIVITY_COUNTERS_FILE), int(time.time() // 60)
+    )
+
+
+def read_status() -> Dict:
+    """Status page fields from the shared store and the scraper's rolling counters"""
+    lead_store = get_lead_store()
+    last_scrape = lead_store.last_timestamp()
+    # Windows and rates come from the scraper's rolling counters, not from scanning leads
+    activity = read_activity_counters(Config.ACTIVITY_COUNTERS_FILE)
+    last_day = activity.totals(24 * HOUR)
+    return {
+        "total_leads": get_lead_index().total,
+        "leads_last_24h": last_day['leads'],
+        "attempts_last_24h": last_day['attempts'],
+        "failures_last_24h": last_day['failures'],
+        "blocks_last_24h": last_day['blocks'],
+        "hourly_rates": activity.rates(HOUR),
+        "last_scrape": last_scrape.strftime("%Y-%m-%d %H:%M:%S") if last_scrape else None,
+        "recent_companies": lead_store.recent_companies(hours=24, limit=10)
+    }
+
+# Store, index and file reads block, so handlers run them on the threadpool and the
+# event loop stays free for other requests and the progress streams
+
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
     """Render home page with leads data"""
-    leads_data = []
-    
     try:
-        # Read Google leads
-        google_leads_file = Path("data/google_leads.csv")
-        if google_leads_file.exists():
-            logger.info(f"Reading Google leads from {google_leads_file}")
-            df = pd.read_csv(google_leads_file)
-            leads_data.extend(df.to_dict('records'))
-            logger.info(f"Found {len(df)} Google leads")
-        
-        # Sort leads by timestamp (newest first)
-        if leads_data:
-            leads_data.sort(key=lambda x: str(x.get('timestamp', '')), reverse=True)
+        # Counters come from the in-memory index; the table fetches its pages from /api/leads
+        version, total_leads, platforms = await run_in_threadpool(read_dashboard_counts)
+        etag = make_etag('home', version, Config.DASHBOARD_PAGE_SIZE)
+        if etag_matches(request, etag):
+            return not_modified(etag)
         
-        logger.info(f"Total leads to display: {len(leads_data)}")
-        
-        return templates.TemplateResponse(
+        response = templates.TemplateResponse(
             "index.html",
             {
                 "request": request,
-                "leads": leads_data,
-                "total_leads": len(leads_data),
+                "total_leads": total_leads,
+                "platforms": sorted(platform for platform in platforms if platform),
+                "page_size": Config.DASHBOARD_PAGE_SIZE,
                 "sources": {
-                    "google": len([l for l in leads_data if l.get('platform') == 'google'])
+                    "google": platforms.get('google', 0)
                 }
             }
         )
+        return cache_headers(response, etag)
     except Exception as e:
         logger.error(f"Error processing leads: {e}")
         return templates.TemplateResponse(
@@ -63,58 +163,157 @@ async def home(request: Request):
             status_code=500
         )
 
+@app.get("/api/leads")
+async def api_leads(
+    platform: Optional[str] = None,
+    category: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    domain: Optional[str] = None,
+    has_website: Optional[bool] = None,
+    sort: str = 'timestamp',
+    order: str = 'desc',
+    fields: Optional[str] = Query(None, description="Comma separated fields to return"),
+    cursor: Optional[str] = None,
+    limit: int = Query(Config.DASHBOARD_PAGE_SIZE, ge=1, le=1000)
+):
+    """A page of leads; pass next_cursor back with the same filters for the following page"""
+    try:
+        if sort not in SORTABLE_COLUMNS:
+            raise ValueError(f"sort must be one of {', '.join(SORTABLE_COLUMNS)}")
+        if order not in ('asc', 'desc'):
+            raise ValueError("order must be asc or desc")
+        columns = None
+        if fields:
+            columns = [field.strip() for field in fields.split(',') if field.strip()]
+            unknown = [field for field in columns if field not in API_FIELDS]
+            if unknown:
+                raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        after = decode_cursor(cursor, sort, order) if cursor else None
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+
+    try:
+        leads, next_key = await run_in_threadpool(
+            lambda: get_lead_store().query(
+                columns=columns, platform=platform, category=category, since=since, until=until,
+                domain=domain, has_website=has_website, sort=sort, descending=order == 'desc',
+                after=after, limit=limit
+            )
+        )
+        return {
+            "leads": leads,
+            "count": len(leads),
+            "next_cursor": encode_cursor(sort, order, next_key) if next_key else None
+        }
+    except Exception as e:
+        logger.error(f"Error querying leads: {e}")
+        return JSONResponse({"error": str(e)}, status_code=500)
+
+@app.get("/api/leads/export")
+async def export_leads(
+    format: str = 'ndjson',
+    gzip: bool = False,
+    platform: Optional[str] = None,
+    category: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    domain: Optional[str] = None,
+    has_website: Optional[bool] = None,
+    fields: Optional[str] = Query(None, description="Comma separated fields to export")
+):
+    """Every matching lead as NDJSON or CSV, streamed in chunks with optional gzip"""
+    if format not in EXPORT_FORMATS:
+        return JSONResponse({"error": f"format must be one of {', '.join(EXPORT_FORMATS)}"}, status_code=400)
+    columns = LEAD_COLUMNS
+    if fields:
+        columns = [field.strip() for field in fields.split(',') if field.strip()]
+        unknown = [field for field in columns if field not in API_FIELDS]
+        if unknown:
+            return JSONResponse({"error": f"Unknown fields: {', '.join(unknown)}"}, status_code=400)
+
+    lead_store = await run_in_threadpool(get_lead_store)
+    rows = lead_store.stream(
+        columns=columns, platform=platform, category=category, since=since, until=until,
+        domain=domain, has_website=has_website
+    )
+    filename = f"leads-{datetime.now():%Y%m%d-%H%M%S}.{format}{'.gz' if gzip else ''}"
+    # A plain iterator is consumed on the threadpool, so reading the store never blocks the event loop
+    return StreamingResponse(
+        encode_leads(rows, columns, format, compress=gzip),
+        media_type='application/gzip' if gzip else EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 @app.get("/status")
 async def scraping_status(request: Request):
     """Show scraping status and recent leads"""
     try:
-        # Read latest leads
-        df = pd.read_csv('data/google_leads.csv')
+        etag = await run_in_threadpool(status_etag)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        status = await run_in_threadpool(read_status)
         
-        # Get last 24 hours of leads
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        last_24h = df[df['timestamp'] > (pd.Timestamp.now() - pd.Timedelta(days=1))]
-        
-        status = {
-            "total_leads": len(df),
-            "leads_last_24h": len(last_24h),
-            "last_scrape": df['timestamp'].max().strftime("%Y-%m-%d %H:%M:%S") if not df.empty else None,
-            "recent_companies": last_24h['name'].tolist()[-10:] if not last_24h.empty else []
-        }
-        
-        return templates.TemplateResponse(
+        response = templates.TemplateResponse(
             "status.html",
             {
                 "request": request,
                 "status": status
             }
         )
+        return cache_headers(response, etag)
     except Exception as e:
         logger.error(f"Error getting status: {e}")
         return {"error": str(e)}
 
 @app.get("/progress")
-async def scraping_progress():
+async def scraping_progress(request: Request):
     """Get real-time scraping progress"""
     try:
-        with open('data/scraping_progress.json', 'r') as f:
-            progress = json.load(f)
-            
-        # Calculate additional stats
-        elapsed = time.time() - progress['start_time']
-        rate = progress['completed'] / (elapsed / 3600) if elapsed > 0 else 0
-        
-        return {
-            "status": "active" if time.time() - progress['last_update'] < 300 else "idle",
-            "progress": f"{(progress['completed'] / progress['total']) * 100:.1f}%",
-            "completed": progress['completed'],
-            "total": progress['total'],
-            "current_company": progress['current_company'],
-            "rate": f"{rate:.1f} companies/hour",
-            "elapsed_time": f"{elapsed/3600:.1f} hours"
-        }
+        # Served from the tracker in this process, or the snapshot file only when it has changed
+        progress = await run_in_threadpool(get_progress_broadcaster().current)
+        elapsed = time.time() - progress['start_time'] if progress['start_time'] else 0
+        progress = {**progress, "elapsed_time": f"{elapsed/3600:.1f} hours"}
+        # The payload is small, so the validator is simply its content
+        etag = make_etag('progress', json.dumps(progress, sort_keys=True))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        return cache_headers(JSONResponse(progress), etag)
     except Exception as e:
         return {"error": str(e)}
 
+@app.get("/progress/stream")
+async def scraping_progress_stream():
+    """Server-sent events: one 'snapshot', then 'progress' events with the fields that changed"""
+    broadcaster = get_progress_broadcaster()
+    
+    async def events():
+        queue = broadcaster.subscribe()
+        try:
+            yield format_event('snapshot', broadcaster.latest)
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(queue.get(), SSE_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle stream
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_event(event, data)
+        finally:
+            broadcaster.unsubscribe(queue)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/metrics")
+async def metrics():
+    """Metrics of every process, scraper and dashboard workers, in the Prometheus text exposition format"""
+    text = await run_in_threadpool(render_metrics)
+    return PlainTextResponse(text, media_type=CONTENT_TYPE)
+
 # Add error handlers
 @app.exception_handler(500)
 async def internal_error(request: Request, exc: Exception):
@@ -5,49 +5,136 @@ function showDetails(name, description) {
     modal.show();
 }
 
-// Add DataTable functionality
+// Leads are fetched page by page from /api/leads, following its cursor
+let nextCursor = null;
+
+function leadFilters() {
+    const params = new URLSearchParams();
+    for (const [key, value] of new FormData(document.getElementById('leadFilters'))) {
+        if (value) {
+            params.set(key, value);
+        }
+    }
+    params.set('limit', document.getElementById('leadsTable').dataset.pageSize);
+    return params;
+}
+
+function leadRow(lead) {
+    const row = document.createElement('tr');
+    const cell = (content) => {
+        const td = document.createElement('td');
+        if (content instanceof Node) {
+            td.appendChild(content);
+        } else {
+            td.textContent = content;
+        }
+        row.appendChild(td);
+        return td;
+    };
+
+    cell(lead.name);
+
+    const email = document.createElement('a');
+    email.href = `mailto:${lead.email}`;
+    email.className = 'text-decoration-none';
+    email.textContent = lead.email;
+    cell(email);
+
+    const platform = document.createElement('span');
+    platform.className = `badge bg-${lead.platform === 'google' ? 'primary' : 'secondary'}`;
+    platform.textContent = lead.platform;
+    cell(platform);
+
+    cell(lead.category || '');
+    cell(lead.location || 'N/A');
+
+    const actions = cell('');
+    if (lead.website) {
+        const website = document.createElement('a');
+        website.href = lead.website;
+        website.target = '_blank';
+        website.className = 'btn btn-sm btn-outline-primary';
+        website.textContent = 'Website';
+        actions.appendChild(website);
+    }
+    if (lead.description) {
+        const details = document.createElement('button');
+        details.className = 'btn btn-sm btn-outline-info';
+        details.textContent = 'Details';
+        details.addEventListener('click', () => showDetails(lead.name, lead.description));
+        actions.appendChild(details);
+    }
+    return row;
+}
+
+async function loadLeads(reset) {
+    const body = document.querySelector('#leadsTable tbody');
+    const loadMore = document.getElementById('loadMore');
+    const params = leadFilters();
+    if (reset) {
+        nextCursor = null;
+    } else if (nextCursor) {
+        params.set('cursor', nextCursor);
+    }
+
+    const response = await fetch(`/api/leads?${params}`);
+    const page = await response.json();
+    if (reset) {
+        body.replaceChildren();
+    }
+    if (!response.ok) {
+        console.error(page.error);
+        return;
+    }
+
+    for (const lead of page.leads) {
+        body.appendChild(leadRow(lead));
+    }
+    nextCursor = page.next_cursor;
+    loadMore.classList.toggle('d-none', !nextCursor);
+}
+
+// Live progress pushed by /progress/stream: a full snapshot, then only the fields that changed
+function watchProgress() {
+    const card = document.getElementById('scrapeProgress');
+    if (!card || !window.EventSource) {
+        return;
+    }
+    const render = (event) => {
+        const data = JSON.parse(event.data);
+        for (const [field, value] of Object.entries(data)) {
+            const element = card.querySelector(`[data-field="${field}"]`);
+            if (element) {
+                element.textContent = value;
+            }
+        }
+        if ('status' in data) {
+            const badge = card.querySelector('[data-field="status"]');
+            badge.className = `badge bg-${data.status === 'active' ? 'success' : 'secondary'}`;
+        }
+    };
+    const source = new EventSource('/progress/stream');
+    source.addEventListener('snapshot', render);
+    source.addEventListener('progress', render);
+}
+
 document.addEventListener('DOMContentLoaded', function() {
+    watchProgress();
     const table = document.getElementById('leadsTable');
     if (table) {
-        new DataTable(table, {
-            pageLength: 10,
-            order: [[0, 'asc']],
-            responsive: true
+        document.getElementById('leadFilters').addEventListener('submit', (event) => {
+            event.preventDefault();
+            loadLeads(true);
         });
+        document.getElementById('loadMore').addEventListener('click', () => loadLeads(false));
+        loadLeads(true);
     }
 });
 
-// Export table to CSV
+// Export every lead matching the current filters, streamed by the server
 function exportTableToCSV() {
-    const table = document.getElementById('leadsTable');
-    const rows = table.getElementsByTagName('tr');
-    const csvContent = [];
-    
-    // Get headers
-    const headers = [];
-    for (const cell of rows[0].getElementsByTagName('th')) {
-        headers.push(cell.textContent);
-    }
-    csvContent.push(headers.join(','));
-    
-    // Get data
-    for (let i = 1; i < rows.length; i++) {
-        const row = rows[i];
-        const data = [];
-        for (const cell of row.getElementsByTagName('td')) {
-            data.push(`"${cell.textContent.trim()}"`);
-        }
-        csvContent.push(data.join(','));
-    }
-    
-    // Download CSV
-    const blob = new Blob([csvContent.join('\n')], { type: 'text/csv' });
-    const url = window.URL.createObjectURL(blob);
-    const a = document.createElement('a');
-    a.setAttribute('hidden', '');
-    a.setAttribute('href', url);
-    a.setAttribute('download', 'leads_export.csv');
-    document.body.appendChild(a);
-    a.click();
-    document.body.removeChild(a);
-} 
\ No newline at end of file
+    const params = leadFilters();
+    params.delete('limit');
+    params.set('format', 'csv');
+    window.location.href = `/api/leads/export?${params}`;
+}